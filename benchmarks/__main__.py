@@ -0,0 +1,105 @@
+"""
+Запуск бенчмарков.
+
+Пример::
+
+    python -m benchmarks --latency 0.005 --save baseline.json
+    python -m benchmarks --latency 0.005 --compare baseline.json
+"""
+import argparse
+import fnmatch
+import platform
+import sys
+
+from .cases import CASES, Options
+from .runner import compare_results, format_results, save_results
+from .server import FakeServer, ServerConfig
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Бенчмарки клиентов fs-pochta-api на локальном сервере',
+    )
+    parser.add_argument('names', nargs='*', metavar='NAME',
+                        help='Сценарии для запуска (поддерживаются шаблоны, например "tracking.*")')
+    parser.add_argument('--list', action='store_true', help='Вывести список сценариев')
+    parser.add_argument('-n', '--operations', type=int, default=200,
+                        help='Количество операций в сценарии')
+    parser.add_argument('-c', '--concurrency', type=int, default=8,
+                        help='Количество одновременных операций')
+    parser.add_argument('--retries', type=int, default=0,
+                        help='Количество повторов запросов API Доставки при ошибках')
+    parser.add_argument('--barcodes', type=int, default=100,
+                        help='Количество отправлений в билете пакетной обработки')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Задержка ответов сервера (секунды)')
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help='Случайная добавка к задержке (секунды)')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='Доля ответов сервера с ошибкой')
+    parser.add_argument('--items', type=int, default=10,
+                        help='Количество записей в ответах сервера')
+    parser.add_argument('--document-size', type=int, default=64 * 1024,
+                        help='Размер печатных форм (байты)')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Начальное значение генератора случайных чисел сервера')
+    parser.add_argument('--save', metavar='PATH', help='Сохранить результаты в JSON')
+    parser.add_argument('--compare', metavar='PATH',
+                        help='Сравнить с результатами, сохраненными через --save')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Допустимое относительное ухудшение при сравнении')
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    names = [
+        name for name in CASES
+        if not args.names or any(fnmatch.fnmatchcase(name, pattern) for pattern in args.names)
+    ]
+    if args.list:
+        print('\n'.join(names))
+        return 0
+    if not names:
+        print('No benchmarks matched', file=sys.stderr)
+        return 2
+
+    config = ServerConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        items=args.items,
+        document_size=args.document_size,
+        seed=args.seed,
+    )
+    results = []
+    with FakeServer(config) as server:
+        options = Options(server.url, args.operations, args.concurrency, args.retries,
+                          args.barcodes)
+        for name in names:
+            print(f'Running {name}...', file=sys.stderr)
+            results.append(CASES[name](options))
+
+    print(format_results(results))
+
+    if args.save:
+        meta = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            **{key: value for key, value in vars(args).items()
+               if key not in ('names', 'list', 'save', 'compare')},
+        }
+        save_results(results, args.save, meta)
+
+    if args.compare:
+        regressions = compare_results(results, args.compare, args.tolerance)
+        if regressions:
+            print('\nRegressions:', *regressions, sep='\n', file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
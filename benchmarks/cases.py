@@ -0,0 +1,325 @@
+"""Сценарии замеров клиентов библиотеки."""
+import io
+from typing import Callable, Dict, List, Optional
+
+from pochta import (
+    AsyncDelivery, AsyncSingleTracker, BatchTracker, Delivery, ParallelSingleTracker, SingleTracker,
+)
+from pochta.enums import AddressType, MailCategory, MailType
+from pochta.helpers import Item, Order
+from pochta.metrics import HistogramSink
+from pochta.models import Shipment
+from pochta.retry import RetryPolicy
+
+from .runner import BenchmarkResult, run_async, run_sync
+
+
+class Options:
+    """Параметры запуска сценариев."""
+
+    def __init__(self, url: str, operations: int = 200, concurrency: int = 8,
+                 retries: int = 0, barcodes: int = 100) -> None:
+        """
+        Инициализация параметров.
+
+        :param url: Адрес локального сервера
+        :param operations: Количество операций в каждом сценарии
+        :param concurrency: Количество одновременных операций в многопоточных
+            и асинхронных сценариях
+        :param retries: Количество повторов запросов API Доставки при ошибках
+        :param barcodes: Количество отправлений в одном билете пакетной обработки
+        """
+        self.url = url
+        self.operations = operations
+        self.concurrency = concurrency
+        self.retries = retries
+        self.barcodes = barcodes
+
+    @property
+    def retry(self) -> Optional[RetryPolicy]:
+        """Политика повторов для клиентов API Доставки."""
+        if not self.retries:
+            return None
+        return RetryPolicy(total=self.retries, backoff_factor=0.01, backoff_max=0.1)
+
+
+Case = Callable[[Options], BenchmarkResult]
+CASES: Dict[str, Case] = {}
+
+
+def case(name: str) -> Callable[[Case], Case]:
+    """
+    Регистрация сценария.
+
+    :param name: Имя сценария в отчете
+    :return: Декоратор функции сценария
+    """
+    def register(func: Case) -> Case:
+        CASES[name] = func
+        return func
+    return register
+
+
+def make_order(number: int, items: int = 3) -> Order:
+    """
+    Создание типичного заказа.
+
+    :param number: Порядковый номер заказа
+    :param items: Количество товарных вложений
+    :return: Заказ
+    """
+    order = Order(1000 + number, f'order-{number}', False,
+                  mail_category=MailCategory.ORDINARY, mail_type=MailType.POSTAL_PARCEL)
+    order.set_recipient('Иван', 'Иванов', 'Иванович', tel_address=79990000000 + number)
+    order.set_address(str(number), 643, 'Москва', 'Москва', 'Тверская',
+                      address_type_to=AddressType.DEFAULT, index_to=101000)
+    order.set_dimensions(10, 20, 30)
+    order.add_items([
+        Item(f'Товар {i}', 1, value=10000, vat_rate=20) for i in range(items)
+    ])
+    return order
+
+
+def _delivery(options: Options, **kwargs) -> Delivery:
+    client = Delivery('login', 'password', 'token', retry=options.retry,
+                      pool_maxsize=options.concurrency, **kwargs)
+    client.API_URL = options.url
+    return client
+
+
+def _tracker(cls, wsdl: str, **kwargs):
+    # Клиенты отслеживания берут адрес WSDL из атрибута класса
+    tracker_class = type(cls.__name__, (cls,), {'WSDL': wsdl})
+    return tracker_class('login', 'password', caching=False, **kwargs)
+
+
+# region Delivery
+
+@case('delivery.request_json')
+def delivery_request_json(options: Options) -> BenchmarkResult:
+    with _delivery(options) as client:
+        return run_sync(
+            'delivery.request_json',
+            lambda number: client.request_json('GET', '/1.0/batch/1000'),
+            options.operations,
+        )
+
+
+@case('delivery.request_json[metrics]')
+def delivery_request_json_metrics(options: Options) -> BenchmarkResult:
+    with _delivery(options, metrics=HistogramSink()) as client:
+        return run_sync(
+            'delivery.request_json[metrics]',
+            lambda number: client.request_json('GET', '/1.0/batch/1000'),
+            options.operations,
+        )
+
+
+@case('delivery.request_json[threads]')
+def delivery_request_json_threads(options: Options) -> BenchmarkResult:
+    with _delivery(options) as client:
+        return run_sync(
+            'delivery.request_json[threads]',
+            lambda number: client.request_json('GET', '/1.0/batch/1000'),
+            options.operations,
+            options.concurrency,
+        )
+
+
+@case('async_delivery.request_json')
+def async_delivery_request_json(options: Options) -> BenchmarkResult:
+    clients: List[AsyncDelivery] = []
+
+    async def setup() -> None:
+        client = AsyncDelivery('login', 'password', 'token', retry=options.retry)
+        client.API_URL = options.url
+        clients.append(client)
+
+    async def teardown() -> None:
+        await clients[0].close()
+
+    return run_async(
+        'async_delivery.request_json',
+        lambda number: clients[0].request_json('GET', '/1.0/batch/1000'),
+        options.operations,
+        options.concurrency,
+        setup=setup,
+        teardown=teardown,
+    )
+
+# endregion
+
+
+# region API
+
+@case('orders.create_order')
+def orders_create_order(options: Options) -> BenchmarkResult:
+    orders = [make_order(number) for number in range(10)]
+    with _delivery(options) as client:
+        return run_sync(
+            'orders.create_order',
+            lambda number: client.orders.create_order(orders),
+            options.operations,
+        )
+
+
+@case('orders.create_orders_bulk')
+def orders_create_orders_bulk(options: Options) -> BenchmarkResult:
+    orders = [make_order(number) for number in range(500)]
+    with _delivery(options) as client:
+        return run_sync(
+            'orders.create_orders_bulk',
+            lambda number: client.orders.create_orders_bulk(
+                orders, chunk_size=50, workers=options.concurrency,
+            ),
+            max(options.operations // 20, 1),
+        )
+
+
+@case('batches.iter_batch_orders')
+def batches_iter_batch_orders(options: Options) -> BenchmarkResult:
+    with _delivery(options) as client:
+        return run_sync(
+            'batches.iter_batch_orders',
+            lambda number: sum(1 for _ in client.batches.iter_batch_orders('1000')),
+            max(options.operations // 10, 1),
+        )
+
+
+@case('batches.iter_batch_orders[model]')
+def batches_iter_batch_orders_model(options: Options) -> BenchmarkResult:
+    with _delivery(options) as client:
+        return run_sync(
+            'batches.iter_batch_orders[model]',
+            lambda number: sum(
+                1 for _ in client.batches.iter_batch_orders('1000', model=Shipment)
+            ),
+            max(options.operations // 10, 1),
+        )
+
+
+@case('batches.iter_all_batches')
+def batches_iter_all_batches(options: Options) -> BenchmarkResult:
+    with _delivery(options) as client:
+        return run_sync(
+            'batches.iter_all_batches',
+            lambda number: sum(1 for _ in client.batches.iter_all_batches()),
+            max(options.operations // 10, 1),
+        )
+
+
+@case('nogroup.calc_delivery_rate')
+def nogroup_calc_delivery_rate(options: Options) -> BenchmarkResult:
+    with _delivery(options) as client:
+        return run_sync(
+            'nogroup.calc_delivery_rate',
+            lambda number: client.nogroup.calc_delivery_rate(
+                index_from='101000', index_to=str(101000 + number % 1000), mass=1000,
+            ),
+            options.operations,
+        )
+
+
+@case('services.get_postoffice')
+def services_get_postoffice(options: Options) -> BenchmarkResult:
+    with _delivery(options) as client:
+        return run_sync(
+            'services.get_postoffice',
+            lambda number: client.services.get_postoffice(101000 + number % 1000),
+            options.operations,
+        )
+
+
+@case('services.get_nearby_postoffices')
+def services_get_nearby_postoffices(options: Options) -> BenchmarkResult:
+    with _delivery(options) as client:
+        return run_sync(
+            'services.get_nearby_postoffices',
+            lambda number: client.services.get_nearby_postoffices(55.76, 37.63),
+            options.operations,
+        )
+
+
+@case('documents.download_f103')
+def documents_download_f103(options: Options) -> BenchmarkResult:
+    with _delivery(options) as client:
+        return run_sync(
+            'documents.download_f103',
+            lambda number: client.documents.download_f103('1000', io.BytesIO()),
+            options.operations,
+        )
+
+# endregion
+
+
+# region Tracking
+
+@case('tracking.get_history')
+def tracking_get_history(options: Options) -> BenchmarkResult:
+    tracker = _tracker(SingleTracker, f'{options.url}/rtm34?wsdl')
+    return run_sync(
+        'tracking.get_history',
+        lambda number: tracker.get_history(f'8008001{number:07d}'),
+        options.operations,
+    )
+
+
+@case('tracking.get_history[metrics]')
+def tracking_get_history_metrics(options: Options) -> BenchmarkResult:
+    tracker = _tracker(SingleTracker, f'{options.url}/rtm34?wsdl', metrics=HistogramSink())
+    return run_sync(
+        'tracking.get_history[metrics]',
+        lambda number: tracker.get_history(f'8008001{number:07d}'),
+        options.operations,
+    )
+
+
+@case('tracking.get_history[threads]')
+def tracking_get_history_threads(options: Options) -> BenchmarkResult:
+    tracker = _tracker(
+        ParallelSingleTracker, f'{options.url}/rtm34?wsdl', workers=options.concurrency,
+    )
+    return run_sync(
+        'tracking.get_history[threads]',
+        lambda number: tracker.get_history(f'8008001{number:07d}'),
+        options.operations,
+        options.concurrency,
+    )
+
+
+@case('tracking.async_get_history')
+def tracking_async_get_history(options: Options) -> BenchmarkResult:
+    trackers: List[AsyncSingleTracker] = []
+
+    async def setup() -> None:
+        trackers.append(_tracker(AsyncSingleTracker, f'{options.url}/rtm34?wsdl'))
+
+    async def teardown() -> None:
+        await trackers[0].close()
+
+    return run_async(
+        'tracking.async_get_history',
+        lambda number: trackers[0].get_history(f'8008001{number:07d}'),
+        options.operations,
+        options.concurrency,
+        setup=setup,
+        teardown=teardown,
+    )
+
+
+@case('tracking.batch_ticket')
+def tracking_batch_ticket(options: Options) -> BenchmarkResult:
+    tracker = _tracker(BatchTracker, f'{options.url}/fc?wsdl')
+    barcodes = [f'8008001{number:07d}' for number in range(options.barcodes)]
+
+    def roundtrip(number: int) -> None:
+        ticket = tracker.get_ticket(barcodes)
+        tracker.get_response_by_ticket(ticket)
+
+    return run_sync(
+        'tracking.batch_ticket',
+        roundtrip,
+        max(options.operations // 10, 1),
+    )
+
+# endregion
@@ -0,0 +1,474 @@
+"""
+Микробенчмарки построения тела запросов: :mod:`pochta.helpers` и :func:`pochta.utils.clean_data`.
+
+Пример::
+
+    python -m benchmarks.payload
+    python -m benchmarks.payload 'order.*' --profile order.prof
+    python -m benchmarks.payload order.build --flamegraph order.folded
+    python -m benchmarks.payload --memory
+"""
+import argparse
+import cProfile
+from collections import Counter
+import fnmatch
+import gc
+import io
+import json
+import os
+import pstats
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+from pochta.enums import AddressType, EntryType, MailCategory, MailType, PaymentType
+from pochta.helpers import Address, CustomsEntry, Item, Name, Order, Phone, Recipient
+from pochta.utils import clean_data
+
+
+class PayloadCase:
+    """Сценарий микробенчмарка."""
+
+    def __init__(self, name: str, run: Callable[[list], object],
+                 prepare: Callable[[int], list] = lambda count: [None] * count,
+                 retains: bool = False) -> None:
+        """
+        Инициализация сценария.
+
+        :param name: Имя сценария
+        :param run: Замеряемая функция, принимающая подготовленные данные
+        :param prepare: Подготовка данных для ``count`` объектов (не входит в замер)
+        :param retains: Результат ``run`` содержит созданные объекты, по нему
+            оценивается занимаемая объектами память
+        """
+        self.name = name
+        self.run = run
+        self.prepare = prepare
+        self.retains = retains
+
+
+CASES: Dict[str, PayloadCase] = {}
+
+
+def register(name: str, prepare: Optional[Callable[[int], list]] = None,
+             retains: bool = False) -> Callable:
+    """
+    Регистрация сценария.
+
+    :param name: Имя сценария
+    :param prepare: Подготовка данных
+    :param retains: Результат сценария содержит созданные объекты
+    :return: Декоратор замеряемой функции
+    """
+    def decorator(func: Callable[[list], object]) -> Callable[[list], object]:
+        options = {'prepare': prepare} if prepare is not None else {}
+        CASES[name] = PayloadCase(name, func, retains=retains, **options)
+        return func
+    return decorator
+
+
+# region Данные
+
+def build_order(number: int, items: int = 3, international: bool = False) -> Order:
+    """
+    Создание заказа так же, как это делают сервисы приема заказов.
+
+    :param number: Порядковый номер заказа
+    :param items: Количество товарных вложений
+    :param international: Международное отправление с таможенной декларацией
+    :return: Заказ
+    """
+    order = Order(
+        1000 + number, f'order-{number}', number % 2 == 0,
+        mail_category=MailCategory.WITH_DECLARED_VALUE,
+        mail_type=MailType.POSTAL_PARCEL,
+        payment_method=PaymentType.CASHLESS,
+    )
+    order.set_recipient('Иван', 'Иванов', 'Иванович', tel_address=79990000000 + number)
+    order.set_address(
+        str(number % 200 + 1), 112 if international else 643, 'Москва', 'Москва', 'Тверская',
+        address_type_to=AddressType.DEFAULT, index_to=101000 + number % 1000,
+        corpus_to='2', room_to=str(number % 300),
+    )
+    order.set_dimensions(10, 20, 30)
+    order.add_items([
+        Item(f'Товар {number}-{i}', i + 1, value=10000 * (i + 1), vat_rate=20,
+             insurance_value=10000)
+        for i in range(items)
+    ])
+    order.add_services(courier=False, insurance_value=30000, with_simple_notice=True)
+    if international:
+        order.add_customs_declaration('RUB', EntryType.SALE_OF_GOODS, [
+            CustomsEntry(i + 1, 643, f'Товар {number}-{i}', '6109100000', 200, 10000)
+            for i in range(items)
+        ], with_invoice=True)
+    return order
+
+
+def prepare_orders(count: int) -> List[Order]:
+    return [build_order(number) for number in range(count)]
+
+
+def prepare_international_orders(count: int) -> List[Order]:
+    return [build_order(number, international=True) for number in range(count)]
+
+
+def prepare_raw_orders(count: int) -> List[dict]:
+    return [order.raw for order in prepare_international_orders(count)]
+
+# endregion
+
+
+# region Сценарии
+
+@register('order.build', retains=True)
+def order_build(data: list) -> list:
+    return [build_order(number) for number in range(len(data))]
+
+
+@register('order.build[international]', retains=True)
+def order_build_international(data: list) -> list:
+    return [build_order(number, international=True) for number in range(len(data))]
+
+
+@register('order.raw', prepare=prepare_international_orders)
+def order_raw(orders: List[Order]) -> list:
+    return [order.raw for order in orders]
+
+
+@register('order.payload', prepare=prepare_international_orders)
+def order_payload(orders: List[Order]) -> list:
+    return [order.payload for order in orders]
+
+
+@register('order.clean_data(raw)', prepare=prepare_international_orders)
+def order_clean_data_raw(orders: List[Order]) -> list:
+    return clean_data([order.raw for order in orders])
+
+
+@register('order.json', prepare=prepare_international_orders)
+def order_json(orders: List[Order]) -> bytes:
+    return json.dumps([order.payload for order in orders]).encode('utf-8')
+
+
+@register('utils.clean_data', prepare=prepare_raw_orders)
+def utils_clean_data(raw_orders: List[dict]) -> list:
+    return clean_data(raw_orders)
+
+
+@register('item.build', retains=True)
+def item_build(data: list) -> list:
+    return [Item(f'Товар {i}', 1, 10000, 20, 10000) for i in range(len(data))]
+
+
+@register('item.raw', prepare=lambda count: [Item(f'Товар {i}', 1, 100) for i in range(count)])
+def item_raw(items: List[Item]) -> list:
+    return [item.raw for item in items]
+
+
+@register('customs_entry.build', retains=True)
+def customs_entry_build(data: list) -> list:
+    return [CustomsEntry(1, 643, f'Товар {i}', '6109100000', 200, 100) for i in range(len(data))]
+
+
+@register('customs_entry.raw', prepare=lambda count: [
+    CustomsEntry(1, 643, f'Товар {i}', '6109100000', 200, 100) for i in range(count)
+])
+def customs_entry_raw(entries: List[CustomsEntry]) -> list:
+    return [entry.raw for entry in entries]
+
+
+@register('recipient.build+raw', retains=True)
+def recipient_build_raw(data: list) -> list:
+    return [
+        Recipient(f'Москва, Тверская, {i}', 'Иванов Иван Иванович', '+79990000000').raw
+        for i in range(len(data))
+    ]
+
+
+@register('address.build+raw', retains=True)
+def address_build_raw(data: list) -> list:
+    return [Address(f'Москва, Тверская, {i}').raw for i in range(len(data))]
+
+
+@register('name.build+raw', retains=True)
+def name_build_raw(data: list) -> list:
+    return [Name('Иванов Иван Иванович').raw for _ in range(len(data))]
+
+
+@register('phone.build+raw', retains=True)
+def phone_build_raw(data: list) -> list:
+    return [Phone('+79990000000', place='Москва').raw for _ in range(len(data))]
+
+# endregion
+
+
+# region Замеры
+
+def measure(case: PayloadCase, count: int, repeat: int) -> dict:
+    """
+    Замер времени сценария.
+
+    :param case: Сценарий
+    :param count: Количество объектов в одном прогоне
+    :param repeat: Количество прогонов
+    :return: Время на объект (лучшее и медиана, секунды) и количество объектов в секунду
+    """
+    data = case.prepare(count)
+    case.run(data[:min(count, 100)])
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        case.run(data)
+        timings.append((time.perf_counter() - started) / count)
+    median = statistics.median(timings)
+    return {
+        'name': case.name,
+        'count': count,
+        'repeat': repeat,
+        'best': min(timings),
+        'median': median,
+        'ops': 1 / median if median else 0.0,
+    }
+
+
+def measure_memory(case: PayloadCase, count: int, top: int = 5) -> dict:
+    """
+    Замер выделений памяти сценария через tracemalloc.
+
+    :param case: Сценарий
+    :param count: Количество объектов
+    :param top: Количество мест выделения памяти в отчете
+    :return: Пиковый объем выделенной памяти, объем удерживаемых результатом
+        объектов в расчете на объект и основные места выделения памяти
+    """
+    data = case.prepare(count)
+    gc.collect()
+    tracemalloc.start(25)
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        result = case.run(data)
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    stats = after.filter_traces([tracemalloc.Filter(True, f'{package_dir}{os.sep}*')]) \
+        .compare_to(before.filter_traces([tracemalloc.Filter(True, f'{package_dir}{os.sep}*')]),
+                    'lineno')
+    del result
+    return {
+        'name': case.name,
+        'count': count,
+        'peak_per_object': (peak - base) / count,
+        'retained_per_object': (current - base) / count if case.retains else None,
+        'top': [
+            (f'{os.path.relpath(stat.traceback[0].filename, package_dir)}:'
+             f'{stat.traceback[0].lineno}', stat.size_diff)
+            for stat in stats[:top]
+        ],
+    }
+
+
+def profile(cases: List[PayloadCase], count: int, path: Optional[str], limit: int = 25) -> str:
+    """
+    Профилирование сценариев через cProfile.
+
+    :param cases: Сценарии
+    :param count: Количество объектов
+    :param path: Файл для сохранения статистики (открывается в snakeviz, tuna и т.п.)
+    :param limit: Количество функций в текстовом отчете
+    :return: Текстовый отчет, отсортированный по собственному времени функций
+    """
+    prepared = [(case, case.prepare(count)) for case in cases]
+    profiler = cProfile.Profile()
+    profiler.enable()
+    for case, data in prepared:
+        case.run(data)
+    profiler.disable()
+    if path:
+        profiler.dump_stats(path)
+    output = io.StringIO()
+    pstats.Stats(profiler, stream=output).sort_stats('tottime').print_stats(limit)
+    return output.getvalue()
+
+
+class StackSampler:
+    """
+    Сэмплирующий профилировщик текущего потока.
+
+    Результат записывается в формате collapsed stacks, который принимают
+    flamegraph.pl, inferno-flamegraph и speedscope.
+    """
+
+    def __init__(self, interval: float = 0.0005) -> None:
+        """
+        Инициализация профилировщика.
+
+        :param interval: Интервал между снимками стека (секунды)
+        """
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._switch_interval = sys.getswitchinterval()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)  # pylint: disable=protected-access
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:'
+                             f'{frame.f_lineno})')
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+
+    def __enter__(self) -> 'StackSampler':
+        """Запуск сбора снимков стека."""
+        # Поток профилировщика должен получать GIL не реже интервала сэмплирования
+        sys.setswitchinterval(self.interval / 2)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Остановка сбора снимков стека."""
+        self._stop.set()
+        self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+
+    def write(self, path: str) -> None:
+        """
+        Сохранение снимков в формате collapsed stacks.
+
+        :param path: Путь к файлу
+        """
+        with open(path, 'w', encoding='utf-8') as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f'{stack} {count}\n')
+
+# endregion
+
+
+def _format_ns(value: Optional[float]) -> str:
+    return '-' if value is None else f'{value * 1e9:,.0f}'
+
+
+def _format_table(rows: List[tuple]) -> str:
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+    return '\n'.join(
+        '  '.join([row[0].ljust(widths[0])] + [
+            cell.rjust(width) for cell, width in zip(row[1:], widths[1:])
+        ])
+        for row in rows
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.payload',
+        description='Микробенчмарки построения тела запросов fs-pochta-api',
+    )
+    parser.add_argument('names', nargs='*', metavar='NAME',
+                        help='Сценарии для запуска (поддерживаются шаблоны, например "order.*")')
+    parser.add_argument('--list', action='store_true', help='Вывести список сценариев')
+    parser.add_argument('-n', '--count', type=int, default=10000,
+                        help='Количество объектов в одном прогоне')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='Количество прогонов')
+    parser.add_argument('--profile', metavar='PATH', nargs='?', const='',
+                        help='Профилировать через cProfile, сохранить статистику в файл')
+    parser.add_argument('--flamegraph', metavar='PATH',
+                        help='Сохранить снимки стека в формате collapsed stacks')
+    parser.add_argument('--memory', action='store_true',
+                        help='Замерить выделения памяти через tracemalloc')
+    parser.add_argument('--save', metavar='PATH', help='Сохранить результаты в JSON')
+    parser.add_argument('--compare', metavar='PATH',
+                        help='Сравнить с результатами, сохраненными через --save')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Допустимое относительное ухудшение при сравнении')
+    args = parser.parse_args(argv)
+
+    cases = [
+        case for name, case in CASES.items()
+        if not args.names or any(fnmatch.fnmatchcase(name, pattern) for pattern in args.names)
+    ]
+    if args.list:
+        print('\n'.join(case.name for case in cases))
+        return 0
+    if not cases:
+        print('No benchmarks matched', file=sys.stderr)
+        return 2
+
+    if args.profile is not None:
+        print(profile(cases, args.count, args.profile or None))
+        return 0
+
+    if args.flamegraph:
+        prepared = [(case, case.prepare(args.count)) for case in cases]
+        with StackSampler() as sampler:
+            for _ in range(args.repeat):
+                for case, data in prepared:
+                    case.run(data)
+        sampler.write(args.flamegraph)
+        print(f'{sum(sampler.stacks.values())} samples written to {args.flamegraph}')
+        return 0
+
+    if args.memory:
+        rows = [('benchmark', 'peak B/obj', 'retained B/obj', 'top allocations')]
+        for case in cases:
+            result = measure_memory(case, args.count)
+            rows.append((
+                case.name,
+                f'{result["peak_per_object"]:,.0f}',
+                '-' if result['retained_per_object'] is None
+                else f'{result["retained_per_object"]:,.0f}',
+                ', '.join(
+                    f'{place} ({size / args.count:,.0f})' for place, size in result['top'][:3]
+                ),
+            ))
+        print(_format_table(rows))
+        return 0
+
+    results = [measure(case, args.count, args.repeat) for case in cases]
+    rows = [('benchmark', 'best ns/obj', 'median ns/obj', 'obj/s')]
+    for result in results:
+        rows.append((
+            result['name'],
+            _format_ns(result['best']),
+            _format_ns(result['median']),
+            f'{result["ops"]:,.0f}',
+        ))
+    print(_format_table(rows))
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as file:
+            json.dump({'python': sys.version, 'results': results}, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = {item['name']: item for item in json.load(file)['results']}
+        regressions = []
+        for result in results:
+            previous = baseline.get(result['name'])
+            if previous is None or result['median'] <= previous['median'] * (1 + args.tolerance):
+                continue
+            regressions.append(
+                f'{result["name"]}: {_format_ns(result["median"])} ns/obj '
+                f'(baseline {_format_ns(previous["median"])})'
+            )
+        if regressions:
+            print('\nRegressions:', *regressions, sep='\n', file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
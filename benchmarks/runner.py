@@ -0,0 +1,246 @@
+"""Выполнение замеров и сравнение результатов с сохраненными ранее."""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import json
+import math
+from threading import Lock
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+
+class BenchmarkResult:
+    """Результат замера одного сценария."""
+
+    def __init__(self, name: str, latencies: List[float], errors: int, elapsed: float,
+                 concurrency: int) -> None:
+        """
+        Инициализация результата.
+
+        :param name: Имя сценария
+        :param latencies: Время выполнения каждой успешной операции (секунды)
+        :param errors: Количество операций, завершившихся исключением
+        :param elapsed: Общее время выполнения сценария (секунды)
+        :param concurrency: Количество одновременно выполнявшихся операций
+        """
+        self.name = name
+        self.latencies = sorted(latencies)
+        self.errors = errors
+        self.elapsed = elapsed
+        self.concurrency = concurrency
+
+    @property
+    def count(self) -> int:
+        """Количество выполненных операций, включая ошибочные."""
+        return len(self.latencies) + self.errors
+
+    @property
+    def throughput(self) -> float:
+        """Количество операций в секунду."""
+        return self.count / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Перцентиль времени успешных операций.
+
+        :param q: Перцентиль от 0 до 100
+        :return: Время (секунды), либо None без успешных операций
+        """
+        if not self.latencies:
+            return None
+        index = min(math.ceil(q / 100 * len(self.latencies)) - 1, len(self.latencies) - 1)
+        return self.latencies[max(index, 0)]
+
+    @property
+    def raw(self) -> dict:
+        """Представление результата для сохранения в JSON."""
+        return {
+            'name': self.name,
+            'count': self.count,
+            'errors': self.errors,
+            'concurrency': self.concurrency,
+            'elapsed': self.elapsed,
+            'throughput': self.throughput,
+            'p50': self.percentile(50),
+            'p99': self.percentile(99),
+        }
+
+
+def run_sync(name: str, operation: Callable[[int], object], operations: int,
+             concurrency: int = 1, warmup: int = 1) -> BenchmarkResult:
+    """
+    Замер синхронной операции.
+
+    :param name: Имя сценария
+    :param operation: Функция, принимающая порядковый номер операции
+    :param operations: Количество операций
+    :param concurrency: Количество потоков, одновременно выполняющих операции
+    :param warmup: Количество операций до начала замера
+    :return: Результат замера
+    """
+    for number in range(warmup):
+        try:
+            operation(-1 - number)
+        except Exception:  # pylint: disable=broad-except
+            pass
+
+    latencies: List[float] = []
+    errors = 0
+    lock = Lock()
+
+    def timed(number: int) -> None:
+        nonlocal errors
+        started = time.perf_counter()
+        try:
+            operation(number)
+        except Exception:  # pylint: disable=broad-except
+            with lock:
+                errors += 1
+        else:
+            latency = time.perf_counter() - started
+            with lock:
+                latencies.append(latency)
+
+    started = time.perf_counter()
+    if concurrency <= 1:
+        for number in range(operations):
+            timed(number)
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(timed, range(operations)))
+    elapsed = time.perf_counter() - started
+    return BenchmarkResult(name, latencies, errors, elapsed, concurrency)
+
+
+def run_async(name: str, operation: Callable[[int], Awaitable[object]], operations: int,
+              concurrency: int = 1, warmup: int = 1,
+              setup: Optional[Callable[[], Awaitable[object]]] = None,
+              teardown: Optional[Callable[[], Awaitable[object]]] = None) -> BenchmarkResult:
+    """
+    Замер асинхронной операции в собственном цикле событий.
+
+    :param name: Имя сценария
+    :param operation: Функция, возвращающая корутину операции по ее порядковому номеру
+    :param operations: Количество операций
+    :param concurrency: Количество одновременно выполняемых операций
+    :param warmup: Количество операций до начала замера
+    :param setup: Корутина, выполняемая перед замером (например создание клиента)
+    :param teardown: Корутина, выполняемая после замера (например закрытие клиента)
+    :return: Результат замера
+    """
+    async def main() -> BenchmarkResult:
+        if setup is not None:
+            await setup()
+        try:
+            for number in range(warmup):
+                try:
+                    await operation(-1 - number)
+                except Exception:  # pylint: disable=broad-except
+                    pass
+
+            latencies: List[float] = []
+            errors = 0
+            queue = iter(range(operations))
+
+            async def worker() -> None:
+                nonlocal errors
+                for number in queue:
+                    started = time.perf_counter()
+                    try:
+                        await operation(number)
+                    except Exception:  # pylint: disable=broad-except
+                        errors += 1
+                    else:
+                        latencies.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(max(concurrency, 1))))
+            elapsed = time.perf_counter() - started
+            return BenchmarkResult(name, latencies, errors, elapsed, concurrency)
+        finally:
+            if teardown is not None:
+                await teardown()
+
+    return asyncio.run(main())
+
+
+def _format_time(value: Optional[float]) -> str:
+    return '-' if value is None else f'{value * 1000:.2f}'
+
+
+def format_results(results: Iterable[BenchmarkResult]) -> str:
+    """
+    Таблица результатов для вывода в консоль.
+
+    :param results: Результаты замеров
+    :return: Текст таблицы
+    """
+    rows = [('benchmark', 'ops', 'errors', 'conc', 'ops/s', 'p50 ms', 'p99 ms')]
+    for result in results:
+        rows.append((
+            result.name,
+            str(result.count),
+            str(result.errors),
+            str(result.concurrency),
+            f'{result.throughput:.1f}',
+            _format_time(result.percentile(50)),
+            _format_time(result.percentile(99)),
+        ))
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+    lines = []
+    for row in rows:
+        cells = [row[0].ljust(widths[0])]
+        cells.extend(cell.rjust(width) for cell, width in zip(row[1:], widths[1:]))
+        lines.append('  '.join(cells))
+    return '\n'.join(lines)
+
+
+def save_results(results: Iterable[BenchmarkResult], path: str,
+                 meta: Optional[dict] = None) -> None:
+    """
+    Сохранение результатов в JSON файл.
+
+    :param results: Результаты замеров
+    :param path: Путь к файлу
+    :param meta: Параметры запуска
+    """
+    data = {'meta': meta or {}, 'results': [result.raw for result in results]}
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, indent=2, ensure_ascii=False)
+
+
+def compare_results(results: Iterable[BenchmarkResult], baseline_path: str,
+                    tolerance: float = 0.2) -> List[str]:
+    """
+    Сравнение результатов с сохраненными ранее.
+
+    Регрессией считается снижение пропускной способности или рост p50/p99
+    больше чем на ``tolerance``.
+
+    :param results: Результаты замеров
+    :param baseline_path: Путь к файлу, сохраненному через :func:`save_results`
+    :param tolerance: Допустимое относительное ухудшение
+    :return: Описания найденных регрессий
+    """
+    with open(baseline_path, encoding='utf-8') as file:
+        baseline: Dict[str, dict] = {
+            item['name']: item for item in json.load(file)['results']
+        }
+
+    regressions = []
+    for result in results:
+        base = baseline.get(result.name)
+        if base is None:
+            continue
+        current = result.raw
+        if base['throughput'] and current['throughput'] < base['throughput'] * (1 - tolerance):
+            regressions.append(
+                f'{result.name}: throughput {current["throughput"]:.1f} ops/s '
+                f'(baseline {base["throughput"]:.1f})'
+            )
+        for key in ('p50', 'p99'):
+            if base[key] and current[key] and current[key] > base[key] * (1 + tolerance):
+                regressions.append(
+                    f'{result.name}: {key} {_format_time(current[key])} ms '
+                    f'(baseline {_format_time(base[key])})'
+                )
+    return regressions
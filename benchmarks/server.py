@@ -0,0 +1,428 @@
+"""
+Локальная замена API Доставки и сервиса отслеживания для бенчмарков.
+
+Сервер запускается в отдельном процессе, чтобы его работа не влияла
+на замеры клиента (в том числе через GIL).
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import io
+import json
+import multiprocessing
+import os
+import random
+import re
+import threading
+import time
+from typing import Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from uuid import uuid4
+from xml.sax.saxutils import escape
+import zipfile
+
+
+WSDL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'wsdl')
+
+SOAP_ENVELOPE = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/"><s:Body>{body}</s:Body>'
+    '</s:Envelope>'
+)
+SOAP_FAULT = (
+    '<s:Fault><faultcode>s:Server</faultcode><faultstring>{message}</faultstring></s:Fault>'
+)
+HISTORY_RECORD = (
+    '<historyRecord>'
+    '<AddressParameters><OperationAddress><Index>{index}</Index>'
+    '<Description>Москва {index}</Description></OperationAddress></AddressParameters>'
+    '<ItemParameters><Barcode>{barcode}</Barcode><Mass>{mass}</Mass></ItemParameters>'
+    '<OperationParameters><OperType><Id>{oper_type}</Id><Name>Операция {oper_type}</Name>'
+    '</OperType><OperAttr><Id>1</Id><Name>Атрибут 1</Name></OperAttr>'
+    '<OperDate>2024-01-{day:02d}T10:00:00.000+03:00</OperDate></OperationParameters>'
+    '</historyRecord>'
+)
+TICKET_ITEM = (
+    '<Item Barcode="{barcode}">{operations}</Item>'
+)
+TICKET_OPERATION = (
+    '<Operation OperTypeID="{oper_type}" OperCtgID="1" OperName="Операция {oper_type}" '
+    'DateOper="{day:02d}.01.2024 10:00:00" IndexOper="{index}"/>'
+)
+
+
+class ServerConfig:
+    """Параметры поведения сервера."""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 items: int = 10, document_size: int = 64 * 1024,
+                 seed: Optional[int] = None) -> None:
+        """
+        Инициализация параметров.
+
+        :param latency: Задержка ответа (секунды)
+        :param jitter: Случайная добавка к задержке от 0 до указанного значения (секунды)
+        :param error_rate: Доля ответов с ошибкой (503 для REST, SOAP Fault для отслеживания)
+        :param items: Количество записей в ответах: заказов и партий при постраничном обходе,
+            ОПС в поиске, операций в истории отправления
+        :param document_size: Размер печатных форм (байты)
+        :param seed: Начальное значение генератора случайных чисел
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.items = items
+        self.document_size = document_size
+        self.seed = seed
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Заголовки и тело отправляются отдельно, без TCP_NODELAY ответ задерживается на ~40 мс
+    disable_nagle_algorithm = True
+    server: '_Server'
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, data) -> None:
+        self._send(status, json.dumps(data).encode(), 'application/json;charset=UTF-8')
+
+    def _send_soap(self, status: int, body: str) -> None:
+        self._send(status, SOAP_ENVELOPE.format(body=body).encode(), 'text/xml; charset=utf-8')
+
+    def _read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+    def _delay(self) -> bool:
+        """Задержка ответа, возвращает True если нужно ответить ошибкой."""
+        config = self.server.config
+        delay = config.latency
+        if config.jitter:
+            delay += random.uniform(0, config.jitter)
+        if delay:
+            time.sleep(delay)
+        return config.error_rate > 0 and random.random() < config.error_rate
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.query == 'wsdl' and url.path in self.server.wsdl:
+            self._send(200, self.server.wsdl[url.path], 'text/xml; charset=utf-8')
+            return
+        self._handle_rest('GET', url.path, parse_qs(url.query), self._read_body())
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        body = self._read_body()
+        if url.path in self.server.wsdl:
+            self._handle_soap(url.path, body.decode('utf-8'))
+            return
+        self._handle_rest('POST', url.path, parse_qs(url.query), body)
+
+    def do_PUT(self) -> None:
+        url = urlsplit(self.path)
+        self._handle_rest('PUT', url.path, parse_qs(url.query), self._read_body())
+
+    def do_DELETE(self) -> None:
+        url = urlsplit(self.path)
+        self._handle_rest('DELETE', url.path, parse_qs(url.query), self._read_body())
+
+    # region REST
+
+    def _handle_rest(self, method: str, path: str, query: dict, body: bytes) -> None:
+        if self._delay():
+            self._send_json(503, {'code': 'SERVICE_UNAVAILABLE', 'desc': 'Injected error'})
+            return
+
+        config = self.server.config
+        if method == 'PUT' and path == '/1.0/user/backlog':
+            orders = json.loads(body)
+            self._send_json(200, {'result-ids': list(range(len(orders))), 'errors': []})
+        elif method == 'GET' and path == '/1.0/batch':
+            self._send_json(200, self._page(query, self._batch))
+        elif method == 'GET' and re.fullmatch(r'/1\.0/batch/[^/]+/shipment', path):
+            self._send_json(200, self._page(query, self._shipment))
+        elif method == 'GET' and re.fullmatch(r'/1\.0/batch/[^/]+', path):
+            self._send_json(200, self._batch(0))
+        elif method == 'POST' and path == '/1.0/tariff':
+            self._send_json(200, {
+                'total-rate': 25000,
+                'total-vat': 5000,
+                'delivery-time': {'min-days': 2, 'max-days': 5},
+                'ground-rate': {'rate': 25000, 'vat': 5000},
+            })
+        elif method == 'GET' and path == '/postoffice/1.0/nearby':
+            self._send_json(200, [self._postoffice(i) for i in range(config.items)])
+        elif method == 'GET' and path.startswith('/postoffice/1.0/'):
+            self._send_json(200, self._postoffice(0))
+        elif method == 'GET' and path.endswith('/zip-all'):
+            self._send(200, self.server.archive, 'application/zip')
+        elif method == 'GET' and path.startswith('/1.0/forms/'):
+            self._send(200, self.server.document, 'application/pdf')
+        else:
+            self._send_json(404, {'code': 'NOT_FOUND', 'desc': path})
+
+    def _page(self, query: dict, build) -> list:
+        total = self.server.config.items
+        size = int(query.get('size', ['50'])[0])
+        page = int(query.get('page', ['0'])[0])
+        return [build(i) for i in range(page * size, min((page + 1) * size, total))]
+
+    @staticmethod
+    def _batch(number: int) -> dict:
+        return {
+            'batch-name': str(1000 + number),
+            'batch-status': 'CREATED',
+            'batch-status-date': '2024-01-01T10:00:00.000Z',
+            'list-number': number,
+            'list-number-date': '2024-01-01',
+            'mail-type': 'POSTAL_PARCEL',
+            'mail-category': 'ORDINARY',
+            'payment-method': 'CASHLESS',
+            'postoffice-code': '101000',
+            'shipment-count': 10,
+            'shipment-mass': 10000,
+            'shipment-mass-rate': 25000,
+        }
+
+    @staticmethod
+    def _shipment(number: int) -> dict:
+        return {
+            'id': number,
+            'barcode': f'8008001{number:07d}',
+            'order-num': f'order-{number}',
+            'batch-name': '1000',
+            'mail-type': 'POSTAL_PARCEL',
+            'mail-category': 'ORDINARY',
+            'mass': 1000,
+            'payment': None,
+            'insr-value': 0,
+            'total-rate-wo-vat': 25000,
+            'total-vat': 5000,
+            'index-to': 101000,
+            'region-to': 'Москва',
+            'place-to': 'Москва',
+            'street-to': 'Тверская',
+            'house-to': str(number),
+            'recipient-name': 'Иванов Иван Иванович',
+            'tel-address': 79990000000 + number,
+            'postoffice-code': '101000',
+            'human-operation-name': 'Создано',
+            'last-oper-date': '2024-01-01T10:00:00.000Z',
+            'version': 1,
+        }
+
+    @staticmethod
+    def _postoffice(number: int) -> dict:
+        return {
+            'postal-code': str(101000 + number),
+            'type-code': 'ГОПС',
+            'region': 'Москва',
+            'district': '',
+            'settlement': 'Москва',
+            'address-source': f'ул. Мясницкая, {number + 1}',
+            'latitude': 55.76 + number / 1000,
+            'longitude': 37.63 + number / 1000,
+            'is-closed': False,
+            'is-temporary-closed': False,
+            'working-hours': [
+                {'weekday-id': day, 'begin-worktime': '08:00:00', 'end-worktime': '20:00:00'}
+                for day in range(1, 8)
+            ],
+        }
+
+    # endregion
+
+    # region SOAP
+
+    def _handle_soap(self, path: str, body: str) -> None:
+        if self._delay():
+            self._send_soap(500, SOAP_FAULT.format(message='Injected error'))
+            return
+
+        operation = self.headers.get('SOAPAction', '').strip('"')
+        if operation == 'getOperationHistory':
+            barcode = re.search(r'Barcode>([^<]*)<', body).group(1)
+            records = ''.join(
+                self._history_record(barcode, i) for i in range(self.server.config.items)
+            )
+            self._send_soap(200, (
+                '<getOperationHistoryResponse xmlns="http://russianpost.org/operationhistory">'
+                f'<OperationHistoryData>{records}</OperationHistoryData>'
+                '</getOperationHistoryResponse>'
+            ))
+        elif operation == 'getTicket':
+            barcodes = re.findall(r'Barcode="([^"]*)"', body)
+            ticket = self.server.add_ticket(barcodes)
+            self._send_soap(200, (
+                '<ticketResponse xmlns="http://fclient.russianpost.org">'
+                f'<value>{ticket}</value></ticketResponse>'
+            ))
+        elif operation == 'getResponseByTicket':
+            ticket = re.search(r'ticket>([^<]*)<', body).group(1)
+            barcodes = self.server.get_ticket(ticket)
+            if barcodes is None:
+                self._send_soap(200, (
+                    '<answerByTicketResponse xmlns="http://fclient.russianpost.org">'
+                    '<error ErrorTypeID="6" ErrorName="Ответ для билета еще не готов"/>'
+                    '</answerByTicketResponse>'
+                ))
+                return
+            items = ''.join(self._ticket_item(barcode) for barcode in barcodes)
+            self._send_soap(200, (
+                '<answerByTicketResponse xmlns="http://fclient.russianpost.org">'
+                f'<value>{items}</value></answerByTicketResponse>'
+            ))
+        else:
+            self._send_soap(500, SOAP_FAULT.format(message=f'Unknown operation {operation}'))
+
+    @staticmethod
+    def _history_record(barcode: str, number: int) -> str:
+        return HISTORY_RECORD.format(
+            barcode=escape(barcode), index=101000 + number, mass=1000,
+            oper_type=number % 20 + 1, day=number % 28 + 1,
+        )
+
+    def _ticket_item(self, barcode: str) -> str:
+        operations = ''.join(
+            TICKET_OPERATION.format(oper_type=i % 20 + 1, day=i % 28 + 1, index=101000 + i)
+            for i in range(self.server.config.items)
+        )
+        return TICKET_ITEM.format(barcode=escape(barcode), operations=operations)
+
+    # endregion
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, address: Tuple[str, int], config: ServerConfig) -> None:
+        super().__init__(address, _Handler)
+        self.config = config
+        self.url = f'http://{address[0]}:{self.server_port}'
+        self.wsdl = {}
+        for name in ('rtm34', 'fc'):
+            with open(os.path.join(WSDL_DIR, f'{name}.wsdl'), encoding='utf-8') as file:
+                self.wsdl[f'/{name}'] = file.read().replace('{address}', self.url).encode('utf-8')
+
+        self.document = os.urandom(config.document_size)
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w') as zip_file:
+            zip_file.writestr('f103.pdf', self.document)
+        self.archive = archive.getvalue()
+
+        self._tickets = {}
+        self._tickets_lock = threading.Lock()
+
+    def add_ticket(self, barcodes: list) -> str:
+        ticket = f'{time.strftime("%Y%m%d%H%M%S")}{uuid4().hex[:10]}'
+        with self._tickets_lock:
+            self._tickets[ticket] = barcodes
+        return ticket
+
+    def get_ticket(self, ticket: str) -> Optional[list]:
+        with self._tickets_lock:
+            return self._tickets.get(ticket)
+
+
+def _serve(config: ServerConfig, host: str, port: int, ready) -> None:
+    if config.seed is not None:
+        random.seed(config.seed)
+    server = _Server((host, port), config)
+    ready.send(server.url)
+    ready.close()
+    server.serve_forever()
+
+
+class FakeServer:
+    """
+    Локальная замена otpravka-api.pochta.ru и tracking.russianpost.ru.
+
+    Поддерживает основные эндпоинты API Доставки (создание заказов, партии, тарификатор,
+    поиск ОПС, печатные формы) и методы getOperationHistory, getTicket, getResponseByTicket
+    сервиса отслеживания. Описания WSDL отдаются по адресам ``/rtm34?wsdl`` и ``/fc?wsdl``.
+    """
+
+    def __init__(self, config: Optional[ServerConfig] = None, host: str = '127.0.0.1',
+                 port: int = 0) -> None:
+        """
+        Инициализация сервера.
+
+        :param config: Параметры поведения сервера
+        :param host: Адрес для прослушивания
+        :param port: Порт (по умолчанию свободный)
+        """
+        self.config = config or ServerConfig()
+        self.host = host
+        self.port = port
+        self.url = None
+        self._process = None
+
+    @property
+    def rtm34_wsdl(self) -> str:
+        """Адрес WSDL сервиса единичной обработки."""
+        return f'{self.url}/rtm34?wsdl'
+
+    @property
+    def fc_wsdl(self) -> str:
+        """Адрес WSDL сервиса пакетной обработки."""
+        return f'{self.url}/fc?wsdl'
+
+    def start(self) -> str:
+        """
+        Запуск сервера в дочернем процессе.
+
+        :return: Базовый адрес сервера
+        """
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        self._process = multiprocessing.Process(
+            target=_serve, args=(self.config, self.host, self.port, sender), daemon=True,
+        )
+        self._process.start()
+        sender.close()
+        self.url = receiver.recv()
+        receiver.close()
+        return self.url
+
+    def stop(self) -> None:
+        """Остановка сервера."""
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+
+    def __enter__(self) -> 'FakeServer':
+        """Запуск сервера при входе в контекстный менеджер."""
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Остановка сервера при выходе из контекстного менеджера."""
+        self.stop()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Локальная замена API Почты России')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--items', type=int, default=10)
+    parser.add_argument('--document-size', type=int, default=64 * 1024)
+    args = parser.parse_args()
+
+    server_config = ServerConfig(
+        args.latency, args.jitter, args.error_rate, args.items, args.document_size,
+    )
+    http_server = _Server((args.host, args.port), server_config)
+    print(f'Serving on {http_server.url}')
+    http_server.serve_forever()
@@ -1,4 +1,7 @@
 from . import api, helpers  # noqa: F401
 from .__version__ import __version__  # noqa: F401
-from .delivery import Delivery  # noqa: F401
-from .tracking import BatchTracker, SingleTracker  # noqa: F401
+from .delivery import AsyncDelivery, Delivery  # noqa: F401
+from .tracking import (  # noqa: F401
+    AsyncBatchTracker, AsyncSingleTracker, BatchTracker,
+    IncrementalTracker, ParallelSingleTracker, SingleTracker,
+)
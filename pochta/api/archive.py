@@ -13,7 +13,8 @@ class Archive:
     """
     Методы API Архива.
 
-    Используется через объект :class:`Delivery <pochta.delivery.Delivery>` или вручную.
+    Используется через объект :class:`Delivery <pochta.delivery.Delivery>`,
+    :class:`AsyncDelivery <pochta.delivery.AsyncDelivery>` или вручную.
     """
 
     def __init__(self, client: Delivery) -> None:
@@ -34,8 +35,7 @@ class Archive:
         """
         url = '/1.0/archive'
 
-        res = self._client.request(HTTPMethod.GET, url)
-        return res.json()
+        return self._client.request_json(HTTPMethod.GET, url)
 
     def batch_to_archive(self, batch_names: List[str]) -> List[dict]:
         """
@@ -48,8 +48,7 @@ class Archive:
         """
         url = '/1.0/archive'
 
-        res = self._client.request(HTTPMethod.PUT, url, data=batch_names)
-        return res.json()
+        return self._client.request_json(HTTPMethod.PUT, url, data=batch_names)
 
     def revert_batch(self, batch_names: List[str]) -> List[dict]:
         """
@@ -62,5 +61,4 @@ class Archive:
         """
         url = '/1.0/archive/revert'
 
-        res = self._client.request(HTTPMethod.POST, url, data=batch_names)
-        return res.json()
+        return self._client.request_json(HTTPMethod.POST, url, data=batch_names)
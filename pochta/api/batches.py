@@ -1,24 +1,29 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, AsyncIterator, Iterator, List, Optional, Type, Union
 
 from pochta.enums import MailCategory, MailType
 from pochta.helpers import Order
-from pochta.utils import HTTPMethod
+from pochta.utils import Endpoint, HTTPMethod, is_async_client, paginate, paginate_async
 
 
 if TYPE_CHECKING:
     from pochta import Delivery
+    from pochta.models import Model
 
 
 class Batches:
     """
     Методы API Партий.
 
-    Используется через объект :class:`Delivery <pochta.delivery.Delivery>` или вручную.
+    Используется через объект :class:`Delivery <pochta.delivery.Delivery>`,
+    :class:`AsyncDelivery <pochta.delivery.AsyncDelivery>` или вручную.
     """
 
+    PAGE_SIZE = 100
+    PAGE_CONCURRENCY = 2
+
     def __init__(self, client: Delivery) -> None:
         """
         Инициализация API Партий.
@@ -49,8 +54,7 @@ class Batches:
 
         params = {'sending-date': sending_date}
 
-        res = self._client.request(HTTPMethod.POST, url, data=shipment_ids, params=params)
-        return res.json()
+        return self._client.request_json(HTTPMethod.POST, url, data=shipment_ids, params=params)
 
     def change_sending_date(self, batch_name: int, year: int, month: int, day: int) -> dict:
         """
@@ -66,10 +70,12 @@ class Batches:
         :param day: Дата сдачи в почтовое отделение: день
         :return: Результат операции
         """
-        url = f'/1.0/batch/{batch_name}/sending/{year}/{month}/{day}'
+        url = Endpoint(
+            '/1.0/batch/{batch_name}/sending/{year}/{month}/{day}',
+            batch_name=batch_name, year=year, month=month, day=day,
+        )
 
-        res = self._client.request(HTTPMethod.POST, url)
-        return res.json()
+        return self._client.request_json(HTTPMethod.POST, url)
 
     def move_orders_to_batch(self, batch_name: str, shipment_ids: List[str]) -> dict:
         """
@@ -87,10 +93,9 @@ class Batches:
         :param shipment_ids: Список внутренних идентификаторов заказов
         :return: Результат операции
         """
-        url = f'/1.0/batch/{batch_name}/shipment'
+        url = Endpoint('/1.0/batch/{batch_name}/shipment', batch_name=batch_name)
 
-        res = self._client.request(HTTPMethod.POST, url, data=shipment_ids)
-        return res.json()
+        return self._client.request_json(HTTPMethod.POST, url, data=shipment_ids)
 
     def find_batch(self, batch_name: str) -> dict:
         """
@@ -102,10 +107,9 @@ class Batches:
         :param batch_name: Наименование партии
         :return: Результат операции
         """
-        url = f'/1.0/batch/{batch_name}'
+        url = Endpoint('/1.0/batch/{batch_name}', batch_name=batch_name)
 
-        res = self._client.request(HTTPMethod.GET, url)
-        return res.json()
+        return self._client.request_json(HTTPMethod.GET, url)
 
     def find_orders_with_barcode(self, query: str) -> List[dict]:
         """
@@ -120,8 +124,7 @@ class Batches:
 
         params = {'query': query}
 
-        res = self._client.request(HTTPMethod.GET, url, params=params)
-        return res.json()
+        return self._client.request_json(HTTPMethod.GET, url, params=params)
 
     def add_orders_to_batch(self, batch_name: str, orders: List[Order]) -> dict:
         """
@@ -136,12 +139,12 @@ class Batches:
         :param orders: Список заказов
         :return: Результат операции
         """
-        url = f'/1.0/batch/{batch_name}/shipment'
+        url = Endpoint('/1.0/batch/{batch_name}/shipment', batch_name=batch_name)
 
-        orders = [order.raw for order in orders]
+        orders = [order.payload for order in orders]
 
-        res = self._client.request(HTTPMethod.GET, url, data=orders)
-        return res.json()
+        # Повтор после 502/503/504 или сетевой ошибки может создать заказы повторно
+        return self._client.request_json(HTTPMethod.GET, url, json=orders, idempotent=False)
 
     def delete_order_from_batch(self, shipment_ids: List[str]) -> dict:
         """
@@ -154,8 +157,7 @@ class Batches:
         """
         url = '/1.0/shipment'
 
-        res = self._client.request(HTTPMethod.GET, url, data=shipment_ids)
-        return res.json()
+        return self._client.request_json(HTTPMethod.GET, url, data=shipment_ids)
 
     def get_batch_orders_info(self, batch_name: str,
                               sort: str = 'asc',
@@ -173,7 +175,7 @@ class Batches:
         :param page: Номер страницы (0..N)
         :return: Результат операции
         """
-        url = f'/1.0/batch/{batch_name}/shipment'
+        url = Endpoint('/1.0/batch/{batch_name}/shipment', batch_name=batch_name)
 
         params = {
             'sort': sort,
@@ -181,8 +183,36 @@ class Batches:
             'page': page,
         }
 
-        res = self._client.request(HTTPMethod.GET, url, params=params)
-        return res.json()
+        return self._client.request_json(HTTPMethod.GET, url, params=params)
+
+    def iter_batch_orders(self, batch_name: str,
+                          sort: str = 'asc',
+                          page_size: int = PAGE_SIZE,
+                          concurrency: int = PAGE_CONCURRENCY,
+                          model: Optional[Type[Model]] = None,
+                          ) -> Union[Iterator[dict], AsyncIterator[dict]]:
+        """
+        Обход всех заказов в партии.
+
+        Постранично вызывает :meth:`get_batch_orders_info`, загружая следующие страницы
+        заранее. Для :class:`AsyncDelivery <pochta.delivery.AsyncDelivery>`
+        возвращает асинхронный итератор.
+
+        :param batch_name: Наименование партии
+        :param sort: Критерии сортировки в формате: asc(по возрастанию) или desc (по убыванию).
+        :param page_size: Количество записей на странице
+        :param concurrency: Количество одновременно загружаемых страниц
+        :param model: Модель, в которую преобразуются заказы
+            (например :class:`Shipment <pochta.models.Shipment>`). По умолчанию словари
+        :return: Итератор по заказам партии
+        """
+        def fetch_page(page: int):
+            return self.get_batch_orders_info(batch_name, sort, page_size, page)
+
+        convert = model.from_raw if model is not None else None
+        if is_async_client(self._client):
+            return paginate_async(fetch_page, page_size, concurrency, convert)
+        return paginate(fetch_page, page_size, concurrency, convert)
 
     def search_all_batches(self, mail_type: Optional[MailType] = None,
                            mail_category: Optional[MailCategory] = None,
@@ -212,8 +242,38 @@ class Batches:
             'page': page,
         }
 
-        res = self._client.request(HTTPMethod.GET, url, params=params)
-        return res.json()
+        return self._client.request_json(HTTPMethod.GET, url, params=params)
+
+    def iter_all_batches(self, mail_type: Optional[MailType] = None,
+                         mail_category: Optional[MailCategory] = None,
+                         sort: Optional[str] = 'asc',
+                         page_size: int = PAGE_SIZE,
+                         concurrency: int = PAGE_CONCURRENCY,
+                         model: Optional[Type[Model]] = None,
+                         ) -> Union[Iterator[dict], AsyncIterator[dict]]:
+        """
+        Обход всех партий.
+
+        Постранично вызывает :meth:`search_all_batches`, загружая следующие страницы
+        заранее. Для :class:`AsyncDelivery <pochta.delivery.AsyncDelivery>`
+        возвращает асинхронный итератор.
+
+        :param mail_type: Тип отправления (По умолчанию: ВСЕ)
+        :param mail_category: Категория отправления (По умолчанию: ВСЕ)
+        :param sort: Критерии сортировки в формате: asc(по возрастанию) или desc (по убыванию).
+        :param page_size: Количество записей на странице
+        :param concurrency: Количество одновременно загружаемых страниц
+        :param model: Модель, в которую преобразуются партии
+            (например :class:`Batch <pochta.models.Batch>`). По умолчанию словари
+        :return: Итератор по партиям
+        """
+        def fetch_page(page: int):
+            return self.search_all_batches(mail_type, mail_category, sort, page_size, page)
+
+        convert = model.from_raw if model is not None else None
+        if is_async_client(self._client):
+            return paginate_async(fetch_page, page_size, concurrency, convert)
+        return paginate(fetch_page, page_size, concurrency, convert)
 
     def find_order_by_id(self, shipment_id: str) -> dict:
         """
@@ -224,7 +284,6 @@ class Batches:
         :param shipment_id: Внутренний идентификатор отправления
         :return: Результат операции
         """
-        url = f'/1.0/shipment/{shipment_id}'
+        url = Endpoint('/1.0/shipment/{shipment_id}', shipment_id=shipment_id)
 
-        res = self._client.request(HTTPMethod.GET, url)
-        return res.json()
+        return self._client.request_json(HTTPMethod.GET, url)
@@ -5,8 +5,12 @@ from typing import TYPE_CHECKING, Optional
 
 from requests import Response
 
+from pochta.download import (
+    Destination, DocumentArchive, DownloadResult, open_archive,
+    open_archive_async, save_response, save_response_async,
+)
 from pochta.enums import PrintType
-from pochta.utils import HTTPMethod
+from pochta.utils import Endpoint, HTTPMethod, is_async_client
 
 
 if TYPE_CHECKING:
@@ -17,7 +21,12 @@ class Documents:
     """
     Методы API Документов.
 
-    Используется через объект :class:`Delivery <pochta.delivery.Delivery>` или вручную.
+    Используется через объект :class:`Delivery <pochta.delivery.Delivery>`,
+    :class:`AsyncDelivery <pochta.delivery.AsyncDelivery>` или вручную.
+
+    Методы ``create_*`` возвращают потоковый ответ API, методы ``download_*`` сохраняют
+    документ в файл по частям. Дополнительные параметры ``download_*`` (``chunk_size``,
+    ``progress``, ``checksum``) описаны в :func:`save_response <pochta.download.save_response>`.
     """
 
     def __init__(self, client: Delivery) -> None:
@@ -43,7 +52,7 @@ class Documents:
         :param batch_name: Наименование партии
         :return: Ответ API
         """
-        url = f'/1.0/forms/{batch_name}/zip-all'
+        url = Endpoint('/1.0/forms/{batch_name}/zip-all', batch_name=batch_name)
 
         res = self._client.request(HTTPMethod.GET, url, stream=True)
         return res
@@ -64,7 +73,7 @@ class Documents:
         :param print_type: Тип печати
         :return: Ответ API
         """
-        url = f'/1.0/forms/{shipment_id}/f7pdf'
+        url = Endpoint('/1.0/forms/{shipment_id}/f7pdf', shipment_id=shipment_id)
 
         if isinstance(sending_date, date):
             sending_date = sending_date.isoformat()
@@ -91,7 +100,7 @@ class Documents:
         :param sending_date: Дата отправки в почтовое отделение (yyyy-MM-dd)
         :return: Ответ API
         """
-        url = f'/1.0/forms/{shipment_id}/f112pdf'
+        url = Endpoint('/1.0/forms/{shipment_id}/f112pdf', shipment_id=shipment_id)
 
         if isinstance(sending_date, date):
             sending_date = sending_date.isoformat()
@@ -120,7 +129,7 @@ class Documents:
         :param sending_date: Дата отправки в почтовое отделение (yyyy-MM-dd)
         :return: Ответ API
         """
-        url = f'/1.0/forms/backlog/{shipment_id}/forms'
+        url = Endpoint('/1.0/forms/backlog/{shipment_id}/forms', shipment_id=shipment_id)
 
         if isinstance(sending_date, date):
             sending_date = sending_date.isoformat()
@@ -150,7 +159,7 @@ class Documents:
         :param print_type: Тип печати
         :return: Ответ API
         """
-        url = f'/1.0/forms/{shipment_id}/forms'
+        url = Endpoint('/1.0/forms/{shipment_id}/forms', shipment_id=shipment_id)
 
         if isinstance(sending_date, date):
             sending_date = sending_date.isoformat()
@@ -174,7 +183,7 @@ class Documents:
         :param batch_name: Наименование партии
         :return: Ответ API
         """
-        url = f'/1.0/forms/{batch_name}/f103pdf'
+        url = Endpoint('/1.0/forms/{batch_name}/f103pdf', batch_name=batch_name)
 
         res = self._client.request(HTTPMethod.GET, url, stream=True)
         return res
@@ -191,10 +200,9 @@ class Documents:
         :param batch_name: Наименование партии
         :return: Результат операции
         """
-        url = f'/1.0/batch/{batch_name}/checkin'
+        url = Endpoint('/1.0/batch/{batch_name}/checkin', batch_name=batch_name)
 
-        res = self._client.request(HTTPMethod.POST, url)
-        return res.json()
+        return self._client.request_json(HTTPMethod.POST, url)
 
     def create_comp_check_form(self, batch_name: str) -> Response:
         """
@@ -207,7 +215,143 @@ class Documents:
         :param batch_name: Наименование партии
         :return: Ответ API
         """
-        url = f'/1.0/forms/{batch_name}/completeness-checking-form'
+        url = Endpoint('/1.0/forms/{batch_name}/completeness-checking-form', batch_name=batch_name)
 
         res = self._client.request(HTTPMethod.GET, url, stream=True)
         return res
+
+    def download_all_docs(self, batch_name: str, destination: Destination,
+                          **options) -> DownloadResult:
+        """
+        Скачивание пакета документации (zip архив) в файл.
+
+        См. :meth:`create_all_docs`.
+
+        :param batch_name: Наименование партии
+        :param destination: Путь к файлу или бинарный файловый объект
+        :return: Результат скачивания
+        """
+        return self._download(self.create_all_docs(batch_name), destination, **options)
+
+    def open_all_docs(self, batch_name: str, **options) -> DocumentArchive:
+        """
+        Получение пакета документации в виде архива с ленивым доступом к файлам.
+
+        Архив скачивается по частям во временный файл (в памяти до ``spool_size`` байт),
+        а файлы внутри него распаковываются только при чтении.
+        Дополнительные параметры описаны в :func:`open_archive <pochta.download.open_archive>`.
+
+        .. code-block:: python
+
+            with delivery.documents.open_all_docs('batch_name') as archive:
+                for row in archive.iter_csv('Export.csv'):
+                    print(row)
+
+        См. :meth:`create_all_docs`.
+
+        :param batch_name: Наименование партии
+        :return: Архив с документами
+        """
+        response = self.create_all_docs(batch_name)
+        if is_async_client(self._client):
+            return open_archive_async(response, **options)
+        return open_archive(response, **options)
+
+    def download_f7_f22(self, shipment_id: str, destination: Destination,
+                        sending_date: Optional[date] = None,
+                        print_type: Optional[PrintType] = None,
+                        **options) -> DownloadResult:
+        """
+        Скачивание печатной формы Ф7п в файл.
+
+        См. :meth:`create_f7_f22`.
+
+        :param shipment_id: Уникальный идентификатор заказа
+        :param destination: Путь к файлу или бинарный файловый объект
+        :param sending_date: Дата отправки в почтовое отделение (yyyy-MM-dd)
+        :param print_type: Тип печати
+        :return: Результат скачивания
+        """
+        response = self.create_f7_f22(shipment_id, sending_date, print_type)
+        return self._download(response, destination, **options)
+
+    def download_f112(self, shipment_id: str, destination: Destination,
+                      sending_date: Optional[date] = None, **options) -> DownloadResult:
+        """
+        Скачивание печатной формы Ф112ЭК в файл.
+
+        См. :meth:`create_f112`.
+
+        :param shipment_id: Уникальный идентификатор заказа
+        :param destination: Путь к файлу или бинарный файловый объект
+        :param sending_date: Дата отправки в почтовое отделение (yyyy-MM-dd)
+        :return: Результат скачивания
+        """
+        response = self.create_f112(shipment_id, sending_date)
+        return self._download(response, destination, **options)
+
+    def download_forms_backlog(self, shipment_id: str, destination: Destination,
+                               sending_date: Optional[date] = None,
+                               **options) -> DownloadResult:
+        """
+        Скачивание печатных форм для заказа (до формирования партии) в файл.
+
+        См. :meth:`create_forms_backlog`.
+
+        :param shipment_id: Уникальный идентификатор заказа
+        :param destination: Путь к файлу или бинарный файловый объект
+        :param sending_date: Дата отправки в почтовое отделение (yyyy-MM-dd)
+        :return: Результат скачивания
+        """
+        response = self.create_forms_backlog(shipment_id, sending_date)
+        return self._download(response, destination, **options)
+
+    def download_forms(self, shipment_id: str, destination: Destination,
+                       sending_date: Optional[date] = None,
+                       print_type: Optional[PrintType] = None,
+                       **options) -> DownloadResult:
+        """
+        Скачивание печатных форм для заказа в файл.
+
+        См. :meth:`create_forms`.
+
+        :param shipment_id: Уникальный идентификатор заказа
+        :param destination: Путь к файлу или бинарный файловый объект
+        :param sending_date: Дата отправки в почтовое отделение (yyyy-MM-dd)
+        :param print_type: Тип печати
+        :return: Результат скачивания
+        """
+        response = self.create_forms(shipment_id, sending_date, print_type)
+        return self._download(response, destination, **options)
+
+    def download_f103(self, batch_name: str, destination: Destination,
+                      **options) -> DownloadResult:
+        """
+        Скачивание печатной формы Ф103 в файл.
+
+        См. :meth:`create_f103`.
+
+        :param batch_name: Наименование партии
+        :param destination: Путь к файлу или бинарный файловый объект
+        :return: Результат скачивания
+        """
+        return self._download(self.create_f103(batch_name), destination, **options)
+
+    def download_comp_check_form(self, batch_name: str, destination: Destination,
+                                 **options) -> DownloadResult:
+        """
+        Скачивание печатной формы акта осмотра содержимого в файл.
+
+        См. :meth:`create_comp_check_form`.
+
+        :param batch_name: Наименование партии
+        :param destination: Путь к файлу или бинарный файловый объект
+        :return: Результат скачивания
+        """
+        return self._download(self.create_comp_check_form(batch_name), destination, **options)
+
+    def _download(self, response: Response, destination: Destination,
+                  **options) -> DownloadResult:
+        if is_async_client(self._client):
+            return save_response_async(response, destination, **options)
+        return save_response(response, destination, **options)
@@ -13,7 +13,8 @@ class LTA:
     """
     Методы API Долгосрочного хранения.
 
-    Используется через объект :class:`Delivery <pochta.delivery.Delivery>` или вручную.
+    Используется через объект :class:`Delivery <pochta.delivery.Delivery>`,
+    :class:`AsyncDelivery <pochta.delivery.AsyncDelivery>` или вручную.
     """
 
     def __init__(self, client: Delivery) -> None:
@@ -37,5 +38,4 @@ class LTA:
 
         params = {'query': query}
 
-        res = self._client.request(HTTPMethod.GET, url, params=params)
-        return res.json()
+        return self._client.request_json(HTTPMethod.GET, url, params=params)
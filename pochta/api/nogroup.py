@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, List, Optional
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from boltons.iterutils import chunked
 
 from pochta.enums import EntryType, MailCategory, MailType, PaymentType, TransportType
 from pochta.helpers import Address, Name, Phone, Recipient
-from pochta.utils import HTTPMethod
+from pochta.utils import HTTPMethod, is_async_client
 
 
 if TYPE_CHECKING:
@@ -15,9 +19,13 @@ class NoGroup:
     """
     Методы API Данных.
 
-    Используется через объект :class:`Delivery <pochta.delivery.Delivery>` или вручную.
+    Используется через объект :class:`Delivery <pochta.delivery.Delivery>`,
+    :class:`AsyncDelivery <pochta.delivery.AsyncDelivery>` или вручную.
     """
 
+    ADDRESS_CHUNK_SIZE = 100
+    ADDRESS_WORKERS = 4
+
     def __init__(self, client: Delivery):
         """
         Инициализация API Данных.
@@ -47,8 +55,85 @@ class NoGroup:
 
         data = [address.raw for address in addresses]
 
-        res = self._client.request(HTTPMethod.POST, url, data=data)
-        return res.json()
+        return self._client.request_json(HTTPMethod.POST, url, data=data)
+
+    def normalize_addresses(self, addresses: List[Address],
+                            chunk_size: int = ADDRESS_CHUNK_SIZE,
+                            workers: int = ADDRESS_WORKERS) -> List[dict]:
+        """
+        Нормализация большого количества адресов.
+
+        Одинаковые адреса (без учета регистра и лишних пробелов) нормализуются один раз.
+        Если у клиента задан кэш ответов (:class:`ResponseCache <pochta.cache.ResponseCache>`),
+        то результаты нормализации берутся из него и сохраняются в него.
+        Оставшиеся адреса разбиваются на части по ``chunk_size`` штук и параллельно
+        (не более ``workers`` одновременных запросов) отправляются в
+        :meth:`address_normalization`.
+
+        :param addresses: Список адресов
+        :param chunk_size: Количество адресов в одном запросе
+        :param workers: Максимальное количество одновременных запросов
+        :return: Результаты нормализации в порядке переданных адресов,
+            поле id каждого результата совпадает с id исходного адреса
+        """
+        cache = self._client.cache
+        keys = [' '.join(address.address.split()).casefold() for address in addresses]
+
+        results: Dict[str, dict] = {}
+        requests: Dict[str, Address] = {}
+        for address, key in zip(addresses, keys):
+            if key in results or key in requests:
+                continue
+            if cache is not None:
+                hit, value = cache.get(f'address {key}')
+                if hit:
+                    results[key] = value
+                    continue
+            requests[key] = Address(address.address)
+
+        request_keys = {request.id: key for key, request in requests.items()}
+        chunks = chunked(list(requests.values()), chunk_size)
+
+        if is_async_client(self._client):
+            return self._normalize_addresses_async(
+                addresses, keys, results, request_keys, chunks, workers,
+            )
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            responses = list(executor.map(self.address_normalization, chunks))
+        return self._merge_normalized_addresses(
+            addresses, keys, results, request_keys, responses,
+        )
+
+    async def _normalize_addresses_async(self, addresses: List[Address], keys: List[str],
+                                         results: Dict[str, dict],
+                                         request_keys: Dict[str, str],
+                                         chunks: List[List[Address]],
+                                         workers: int) -> List[dict]:
+        semaphore = asyncio.Semaphore(workers)
+
+        async def normalize_chunk(chunk: List[Address]) -> List[dict]:
+            async with semaphore:
+                return await self.address_normalization(chunk)
+
+        responses = await asyncio.gather(*(normalize_chunk(chunk) for chunk in chunks))
+        return self._merge_normalized_addresses(
+            addresses, keys, results, request_keys, responses,
+        )
+
+    def _merge_normalized_addresses(self, addresses: List[Address], keys: List[str],
+                                    results: Dict[str, dict],
+                                    request_keys: Dict[str, str],
+                                    responses: List[List[dict]]) -> List[dict]:
+        cache = self._client.cache
+        for response in responses:
+            for item in response:
+                key = request_keys[item['id']]
+                results[key] = {field: value for field, value in item.items() if field != 'id'}
+                if cache is not None:
+                    cache.set(f'address {key}', results[key])
+
+        return [{**results.get(key, {}), 'id': address.id} for address, key in zip(addresses, keys)]
 
     def fio_normalization(self, names: List[Name]) -> dict:
         """
@@ -69,8 +154,7 @@ class NoGroup:
 
         data = [name.raw for name in names]
 
-        res = self._client.request(HTTPMethod.POST, url, data=data)
-        return res.json()
+        return self._client.request_json(HTTPMethod.POST, url, data=data)
 
     def phone_normalization(self, phone_numbers: List[Phone]) -> dict:
         """
@@ -97,8 +181,7 @@ class NoGroup:
 
         data = [phone.raw for phone in phone_numbers]
 
-        res = self._client.request(HTTPMethod.POST, url, data=data)
-        return res.json()
+        return self._client.request_json(HTTPMethod.POST, url, data=data)
 
     def check_reliability(self, recipients: List[Recipient]) -> List[dict]:
         """
@@ -116,8 +199,7 @@ class NoGroup:
 
         data = [recipient.raw for recipient in recipients]
 
-        res = self._client.request(HTTPMethod.POST, url, data=data)
-        return res.json()
+        return self._client.request_json(HTTPMethod.POST, url, data=data)
 
     @property
     def counterpart_balance(self) -> dict:
@@ -132,8 +214,7 @@ class NoGroup:
         """
         url = '/1.0/counterpart/balance'
 
-        res = self._client.request(HTTPMethod.GET, url)
-        return res.json()
+        return self._client.request_json(HTTPMethod.GET, url)
 
     def calc_delivery_rate(self, completeness_checking: Optional[bool] = None,
                            courier: Optional[bool] = None,
@@ -162,6 +243,9 @@ class NoGroup:
         входных данных. Индекс ОПС точки отправления берется из профиля
         клиента. Возвращаемые значения указываются в копейках.
 
+        Если у клиента задан :class:`TariffCache <pochta.cache.TariffCache>`,
+        масса и габариты округляются по его настройкам, а результат берется из кэша.
+
         https://otpravka.pochta.ru/specification#/nogroup-rate_calculate
 
         :param completeness_checking: Признак услуги проверки комплектности
@@ -213,5 +297,16 @@ class NoGroup:
             'with-simple-notice': with_simple_notice,
         }
 
-        res = self._client.request(HTTPMethod.POST, url, data=data)
-        return res.json()
+        tariff_cache = self._client.tariff_cache
+        if tariff_cache is None:
+            return self._client.request_json(HTTPMethod.POST, url, data=data)
+
+        data = tariff_cache.normalize(data)
+        key = tariff_cache.make_tariff_key(data)
+
+        def fetch():
+            return self._client.request_json(HTTPMethod.POST, url, data=data)
+
+        if is_async_client(self._client):
+            return tariff_cache.get_or_fetch_async(key, fetch)
+        return tariff_cache.get_or_fetch(key, fetch)
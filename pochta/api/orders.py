@@ -1,9 +1,13 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, List
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Union
+
+from boltons.iterutils import chunked
 
 from pochta.helpers import Order
-from pochta.utils import HTTPMethod
+from pochta.utils import Endpoint, HTTPMethod, is_async_client
 
 
 if TYPE_CHECKING:
@@ -14,9 +18,15 @@ class Orders:
     """
     Методы API Заказов.
 
-    Используется через объект :class:`Delivery <pochta.delivery.Delivery>` или вручную.
+    Используется через объект :class:`Delivery <pochta.delivery.Delivery>`,
+    :class:`AsyncDelivery <pochta.delivery.AsyncDelivery>` или вручную.
     """
 
+    BULK_CHUNK_SIZE = 500
+    #: Код ошибки заказов из части, запрос для которой завершился исключением
+    BULK_UNKNOWN_CODE = 'REQUEST_UNKNOWN'
+    BULK_WORKERS = 4
+
     def __init__(self, client: Delivery) -> None:
         """
         Инициализация API Заказов.
@@ -38,10 +48,91 @@ class Orders:
         """
         url = '/1.0/user/backlog'
 
-        orders = [order.raw for order in orders]
+        orders = [order.payload for order in orders]
 
-        res = self._client.request(HTTPMethod.PUT, url, data=orders)
-        return res.json()
+        # Повтор после 502/503/504 или сетевой ошибки может создать заказы повторно
+        return self._client.request_json(HTTPMethod.PUT, url, json=orders, idempotent=False)
+
+    def create_orders_bulk(self, orders: List[Order],
+                           chunk_size: int = BULK_CHUNK_SIZE,
+                           workers: int = BULK_WORKERS) -> dict:
+        """
+        Массовое создание заказов.
+
+        Разбивает список заказов на части по ``chunk_size`` штук и параллельно
+        (не более ``workers`` одновременных запросов) создает их через
+        :meth:`create_order`. Результаты объединяются в один ответ того же формата,
+        что и у :meth:`create_order`, при этом ``position`` в ошибках указывает на
+        индекс заказа в исходном списке ``orders``.
+
+        Если запрос для части заказов завершился исключением (таймаут, ответ 5xx,
+        разрыв соединения), то для каждого заказа этой части в ``errors`` добавляется
+        ошибка с кодом :attr:`BULK_UNKNOWN_CODE` (``REQUEST_UNKNOWN``), а само исключение
+        передается в ключе ``exception``. Остальные части обрабатываются как обычно.
+        Результат таких запросов неизвестен: сервер мог успеть создать заказы, поэтому
+        перед повторной отправкой их необходимо найти через :meth:`search_order`.
+        Заказы с остальными ошибками сервером не созданы.
+
+        :param orders: Список заказов
+        :param chunk_size: Количество заказов в одном запросе
+        :param workers: Максимальное количество одновременных запросов
+        :return: Объединенный результат операции
+        """
+        chunks = chunked(orders, chunk_size)
+
+        if is_async_client(self._client):
+            return self._create_orders_bulk_async(chunks, workers)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(self._create_orders_chunk, chunks))
+        return self._merge_bulk_results(chunks, results)
+
+    async def _create_orders_bulk_async(self, chunks: List[List[Order]], workers: int) -> dict:
+        semaphore = asyncio.Semaphore(workers)
+
+        async def create_chunk(chunk: List[Order]) -> Union[dict, Exception]:
+            async with semaphore:
+                try:
+                    return await self.create_order(chunk)
+                except Exception as exc:  # pylint: disable=broad-except
+                    return exc
+
+        results = await asyncio.gather(*(create_chunk(chunk) for chunk in chunks))
+        return self._merge_bulk_results(chunks, results)
+
+    def _create_orders_chunk(self, chunk: List[Order]) -> Union[dict, Exception]:
+        try:
+            return self.create_order(chunk)
+        except Exception as exc:  # pylint: disable=broad-except
+            return exc
+
+    @classmethod
+    def _merge_bulk_results(cls, chunks: List[List[Order]],
+                            results: List[Union[dict, Exception]]) -> dict:
+        merged = {'result-ids': [], 'errors': []}
+
+        offset = 0
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, Exception):
+                merged['errors'].extend(
+                    {
+                        'position': offset + position,
+                        'error-codes': [
+                            {'code': cls.BULK_UNKNOWN_CODE, 'description': str(result)},
+                        ],
+                        'exception': result,
+                    }
+                    for position in range(len(chunk))
+                )
+            else:
+                merged['result-ids'].extend(result.get('result-ids', []))
+                merged['errors'].extend(
+                    {**error, 'position': offset + error['position']}
+                    for error in result.get('errors', [])
+                )
+            offset += len(chunk)
+
+        return merged
 
     def edit_order(self, shipment_id: str, order: Order) -> dict:
         """
@@ -53,10 +144,9 @@ class Orders:
         :param order: Измененный заказ
         :return: Результат операции
         """
-        url = f'/1.0/backlog/{shipment_id}'
+        url = Endpoint('/1.0/backlog/{shipment_id}', shipment_id=shipment_id)
 
-        res = self._client.request(HTTPMethod.PUT, url, data=order.raw)
-        return res.json()
+        return self._client.request_json(HTTPMethod.PUT, url, json=order.payload)
 
     def search_order(self, query: str) -> List[dict]:
         """
@@ -73,8 +163,7 @@ class Orders:
 
         params = {'query': query}
 
-        res = self._client.request(HTTPMethod.GET, url, params=params)
-        return res.json()
+        return self._client.request_json(HTTPMethod.GET, url, params=params)
 
     def search_order_by_id(self, order_id: str) -> dict:
         """
@@ -85,10 +174,9 @@ class Orders:
         :param order_id: Внутренний идентификатор отправления
         :return: Результат операции
         """
-        url = f'/1.0/backlog/{order_id}'
+        url = Endpoint('/1.0/backlog/{order_id}', order_id=order_id)
 
-        res = self._client.request(HTTPMethod.GET, url)
-        return res.json()
+        return self._client.request_json(HTTPMethod.GET, url)
 
     def delete_order(self, backlog_ids: List[str]) -> dict:
         """
@@ -101,8 +189,7 @@ class Orders:
         """
         url = '/1.0/backlog'
 
-        res = self._client.request(HTTPMethod.DELETE, url, data=backlog_ids)
-        return res.json()
+        return self._client.request_json(HTTPMethod.DELETE, url, data=backlog_ids)
 
     def shipment_to_backlog(self, shipment_ids: List[str]) -> dict:
         """
@@ -117,5 +204,4 @@ class Orders:
         """
         url = '/1.0/user/backlog'
 
-        res = self._client.request(HTTPMethod.POST, url, data=shipment_ids)
-        return res.json()
+        return self._client.request_json(HTTPMethod.POST, url, data=shipment_ids)
@@ -5,7 +5,7 @@ import json
 from typing import TYPE_CHECKING, List, Optional, Union
 
 from pochta.enums import PostofficeWorkType
-from pochta.utils import HTTPMethod
+from pochta.utils import Endpoint, HTTPMethod
 
 
 if TYPE_CHECKING:
@@ -16,7 +16,12 @@ class Services:
     """
     Методы API Поиска ОПС.
 
-    Используется через объект :class:`Delivery <pochta.delivery.Delivery>` или вручную.
+    Используется через объект :class:`Delivery <pochta.delivery.Delivery>`,
+    :class:`AsyncDelivery <pochta.delivery.AsyncDelivery>` или вручную.
+
+    Справочные методы (поиск ОПС и его сервисов по индексу, поиск индексов населенного
+    пункта) используют кэш ответов клиента, если он задан
+    (см. :class:`ResponseCache <pochta.cache.ResponseCache>`).
     """
 
     def __init__(self, client: Delivery) -> None:
@@ -36,12 +41,11 @@ class Services:
         :param postal_code: Индекс почтового отделения
         :return: Результат операции
         """
-        url = f'/postoffice/1.0/{postal_code}'
+        url = Endpoint('/postoffice/1.0/{postal_code}', postal_code=postal_code)
 
         params = {'ufps-postal-code': True}
 
-        res = self._client.request(HTTPMethod.GET, url, params=params)
-        return res.json()
+        return self._client.cached_request_json(HTTPMethod.GET, url, params=params)
 
     def get_postoffice_by_address(self, address: str, top: Optional[int] = 3):
         """
@@ -62,8 +66,7 @@ class Services:
             'top': top,
         }
 
-        res = self._client.request(HTTPMethod.GET, url, params=params)
-        return res.json()
+        return self._client.request_json(HTTPMethod.GET, url, params=params)
 
     def get_postoffice_services(self, postal_code: Union[str, int]) -> List[dict]:
         """
@@ -77,10 +80,9 @@ class Services:
         :param postal_code: Индекс почтового отделения.
         :return: Почтовые сервисы в ОПС
         """
-        url = f'/postoffice/1.0/{postal_code}/services'
+        url = Endpoint('/postoffice/1.0/{postal_code}/services', postal_code=postal_code)
 
-        res = self._client.request(HTTPMethod.GET, url)
-        return res.json()
+        return self._client.cached_request_json(HTTPMethod.GET, url)
 
     def get_postoffice_service_group(self, postal_code: Union[str, int],
                                      group_id: str) -> List[dict]:
@@ -93,10 +95,12 @@ class Services:
         :param group_id: Идентификатор группы сервисов.
         :return: Почтовые сервисы в ОПС
         """
-        url = f'/postoffice/1.0/{postal_code}/services/{group_id}'
+        url = Endpoint(
+            '/postoffice/1.0/{postal_code}/services/{group_id}',
+            postal_code=postal_code, group_id=group_id,
+        )
 
-        res = self._client.request(HTTPMethod.GET, url)
-        return res.json()
+        return self._client.cached_request_json(HTTPMethod.GET, url)
 
     def get_nearby_postoffices(self, lan: float, lon: float,
                                top: Optional[int] = None,
@@ -160,8 +164,7 @@ class Services:
             'geo-object': geo_object,
         }
 
-        res = self._client.request(HTTPMethod.GET, url, params=params)
-        return res.json()
+        return self._client.request_json(HTTPMethod.GET, url, params=params)
 
     def get_settlement_postoffices(self, settlement: str,
                                    region: Optional[str] = None,
@@ -186,5 +189,4 @@ class Services:
             'district': district,
         }
 
-        res = self._client.request(HTTPMethod.GET, url, params=params)
-        return res.json()
+        return self._client.cached_request_json(HTTPMethod.GET, url, params=params)
@@ -13,7 +13,8 @@ class Settings:
     """
     Методы API Настроек.
 
-    Используется через объект :class:`Delivery <pochta.delivery.Delivery>` или вручную.
+    Используется через объект :class:`Delivery <pochta.delivery.Delivery>`,
+    :class:`AsyncDelivery <pochta.delivery.AsyncDelivery>` или вручную.
     """
 
     def __init__(self, client: Delivery) -> None:
@@ -32,8 +33,7 @@ class Settings:
         """
         url = '/1.0/user-shipping-points'
 
-        res = self._client.request(HTTPMethod.GET, url)
-        return res.json()
+        return self._client.request_json(HTTPMethod.GET, url)
 
     def user_settings(self) -> dict:
         """
@@ -43,5 +43,4 @@ class Settings:
         """
         url = '/1.0/settings'
 
-        res = self._client.request(HTTPMethod.GET, url)
-        return res.json()
+        return self._client.request_json(HTTPMethod.GET, url)
@@ -0,0 +1,402 @@
+from abc import ABC, abstractmethod
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import date, datetime, timedelta, timezone
+import json
+import math
+import sqlite3
+from threading import Lock
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from .utils import clean_data
+
+
+MSK = timezone(timedelta(hours=3), 'MSK')
+
+
+class CacheBackend(ABC):
+    """Хранилище кэша ответов API."""
+
+    @abstractmethod
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Получение значения из кэша.
+
+        :param key: Ключ
+        :return: Кортеж (найдено ли значение, значение)
+        """
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """
+        Сохранение значения в кэш.
+
+        :param key: Ключ
+        :param value: Значение, сериализуемое в JSON
+        :param ttl: Время жизни значения в секундах
+        """
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Очистка кэша."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Количество значений в кэше."""
+
+
+class MemoryCache(CacheBackend):
+    """
+    LRU кэш в памяти процесса.
+
+    Значения не копируются: изменение полученного из кэша объекта
+    изменит и закэшированное значение.
+    """
+
+    def __init__(self, maxsize: Optional[int] = 1024) -> None:
+        """
+        Инициализация кэша.
+
+        :param maxsize: Максимальное количество значений. None - без ограничения,
+            значения удаляются только по истечении времени хранения
+        """
+        self.maxsize = maxsize
+        self._data: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Получение значения из кэша."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return False, None
+            expires, value = item
+            if expires < time.time():
+                del self._data[key]
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Сохранение значения в кэш."""
+        with self._lock:
+            self._data[key] = (time.time() + ttl, value)
+            self._data.move_to_end(key)
+            while self.maxsize is not None and len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Очистка кэша."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        """Количество значений в кэше."""
+        return len(self._data)
+
+
+class SQLiteCache(CacheBackend):
+    """
+    LRU кэш в базе SQLite.
+
+    Данные сохраняются между перезапусками процесса. Значения хранятся в JSON.
+    """
+
+    def __init__(self, path: str, maxsize: Optional[int] = 100000) -> None:
+        """
+        Инициализация кэша.
+
+        :param path: Путь к файлу базы данных
+        :param maxsize: Максимальное количество значений. None - без ограничения,
+            значения удаляются только по истечении времени хранения
+        """
+        self.maxsize = maxsize
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL, used REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS cache_used ON cache (used)')
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Получение значения из кэша."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, expires FROM cache WHERE key = ?', (key,),
+            ).fetchone()
+            if row is None:
+                return False, None
+            value, expires = row
+            if expires < now:
+                self._conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+                return False, None
+            self._conn.execute('UPDATE cache SET used = ? WHERE key = ?', (now, key))
+        return True, json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Сохранение значения в кэш."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO cache (key, value, expires, used) VALUES (?, ?, ?, ?)',
+                (key, json.dumps(value), now + ttl, now),
+            )
+            if self.maxsize is None:
+                return
+            self._conn.execute(
+                'DELETE FROM cache WHERE key IN ('
+                'SELECT key FROM cache ORDER BY used DESC LIMIT -1 OFFSET ?)',
+                (self.maxsize,),
+            )
+
+    def clear(self) -> None:
+        """Очистка кэша."""
+        with self._lock:
+            self._conn.execute('DELETE FROM cache')
+
+    def __len__(self) -> int:
+        """Количество значений в кэше."""
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+
+
+class CacheStats:
+    """Статистика использования кэша."""
+
+    def __init__(self) -> None:
+        """Инициализация статистики."""
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Доля попаданий в кэш."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __repr__(self) -> str:
+        """Строковое представление."""
+        return f'CacheStats(hits={self.hits}, misses={self.misses})'
+
+
+class ResponseCache:
+    """
+    Кэш ответов API.
+
+    Используется клиентом Доставки для методов, данные которых меняются редко
+    (например поиск ОПС в :class:`Services <pochta.api.services.Services>`).
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None, ttl: float = 24 * 60 * 60) -> None:
+        """
+        Инициализация кэша ответов.
+
+        :param backend: Хранилище (по умолчанию :class:`MemoryCache`)
+        :param ttl: Время жизни ответа в секундах
+        """
+        self.backend = backend if backend is not None else MemoryCache()
+        self.ttl = ttl
+        self.stats = CacheStats()
+
+    @staticmethod
+    def make_key(method: str, endpoint: str, params: Optional[dict] = None) -> str:
+        """
+        Формирование ключа кэша для запроса.
+
+        :param method: HTTP метод
+        :param endpoint: Эндпоинт API
+        :param params: Параметры запроса
+        :return: Ключ кэша
+        """
+        params = {key: value for key, value in (params or {}).items() if value is not None}
+        return f'{method.upper()} {endpoint} {json.dumps(params, sort_keys=True, default=str)}'
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Получение ответа из кэша с учетом статистики.
+
+        :param key: Ключ
+        :return: Кортеж (найден ли ответ, ответ)
+        """
+        hit, value = self.backend.get(key)
+        if hit:
+            self.stats.hits += 1
+        else:
+            self.stats.misses += 1
+        return hit, value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Сохранение ответа в кэш.
+
+        :param key: Ключ
+        :param value: Ответ
+        :param ttl: Время жизни ответа в секундах (по умолчанию ``self.ttl``)
+        """
+        self.backend.set(key, value, self.ttl if ttl is None else ttl)
+
+    def clear(self) -> None:
+        """Очистка кэша."""
+        self.backend.clear()
+
+
+class TariffCache(ResponseCache):
+    """
+    Кэш расчетов стоимости доставки.
+
+    Используется методом :meth:`NoGroup.calc_delivery_rate
+    <pochta.api.nogroup.NoGroup.calc_delivery_rate>`. Параметры запроса приводятся
+    к каноническому виду: масса и габариты округляются вверх до заданного шага,
+    поэтому близкие запросы попадают в одну запись кэша. В API отправляются уже
+    округленные значения, так что закэшированный тариф соответствует верхней
+    границе диапазона.
+
+    Одновременные одинаковые запросы объединяются: к API выполняется
+    один запрос, остальные вызовы ожидают его результат.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None,
+                 ttl: float = 24 * 60 * 60,
+                 mass_step: int = 1,
+                 dimension_step: int = 1,
+                 change_dates: Iterable[date] = ()) -> None:
+        """
+        Инициализация кэша тарифов.
+
+        :param backend: Хранилище (по умолчанию :class:`MemoryCache`)
+        :param ttl: Время жизни расчета в секундах
+        :param mass_step: Шаг округления массы (граммы)
+        :param dimension_step: Шаг округления габаритов (сантиметры)
+        :param change_dates: Даты изменения тарифов. Расчеты не хранятся
+            дольше начала ближайшей из них (по московскому времени)
+        """
+        super().__init__(backend, ttl)
+        self.mass_step = mass_step
+        self.dimension_step = dimension_step
+        self.change_dates = sorted(change_dates)
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_async: Dict[str, asyncio.Future] = {}
+        self._lock = Lock()
+
+    @staticmethod
+    def _round_up(value: Optional[int], step: int) -> Optional[int]:
+        if value is None or step <= 1:
+            return value
+        return int(math.ceil(value / step) * step)
+
+    def normalize(self, data: dict) -> dict:
+        """
+        Приведение параметров расчета к каноническому виду.
+
+        :param data: Тело запроса к API тарификации
+        :return: Тело запроса с округленными массой и габаритами
+        """
+        data = clean_data(data)
+        if 'mass' in data:
+            data['mass'] = self._round_up(data['mass'], self.mass_step)
+        if data.get('dimension'):
+            data['dimension'] = {
+                key: self._round_up(value, self.dimension_step)
+                for key, value in data['dimension'].items()
+            }
+        return data
+
+    @staticmethod
+    def make_tariff_key(data: dict) -> str:
+        """
+        Формирование ключа кэша для нормализованного запроса.
+
+        :param data: Нормализованное тело запроса
+        :return: Ключ кэша
+        """
+        return f'tariff {json.dumps(data, sort_keys=True, default=str)}'
+
+    def get_ttl(self) -> float:
+        """Время жизни расчета с учетом ближайшей даты изменения тарифов."""
+        now = datetime.now(MSK)
+        for change_date in self.change_dates:
+            change_at = datetime(change_date.year, change_date.month, change_date.day, tzinfo=MSK)
+            if change_at > now:
+                return min(self.ttl, (change_at - now).total_seconds())
+        return self.ttl
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Сохранение расчета в кэш."""
+        super().set(key, value, self.get_ttl() if ttl is None else ttl)
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """
+        Получение расчета из кэша или из API с объединением одинаковых запросов.
+
+        :param key: Ключ кэша
+        :param fetch: Функция запроса к API
+        :return: Результат расчета
+        """
+        hit, value = self.get(key)
+        if hit:
+            return value
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                # Лидер мог сохранить расчет и завершиться после первой проверки кэша.
+                # Повторная проверка не учитывается в статистике
+                hit, value = self.backend.get(key)
+                if hit:
+                    return value
+                future = self._inflight[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            value = fetch()
+            self.set(key, value)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(value)
+        finally:
+            with self._lock:
+                del self._inflight[key]
+        return value
+
+    async def get_or_fetch_async(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Асинхронное получение расчета из кэша или из API с объединением одинаковых запросов.
+
+        :param key: Ключ кэша
+        :param fetch: Функция, возвращающая корутину запроса к API
+        :return: Результат расчета
+        """
+        hit, value = self.get(key)
+        if hit:
+            return value
+
+        future = self._inflight_async.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+        hit, value = self.backend.get(key)
+        if hit:
+            return value
+
+        future = self._inflight_async[key] = asyncio.get_running_loop().create_future()
+        try:
+            value = await fetch()
+            self.set(key, value)
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Исключение получат ожидающие вызовы, в самой задаче оно пробрасывается дальше
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+        finally:
+            del self._inflight_async[key]
+        return value
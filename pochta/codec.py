@@ -0,0 +1,153 @@
+from abc import ABC, abstractmethod
+from enum import Enum
+import json
+from typing import Any, Optional
+
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None
+
+try:
+    import rapidjson
+except ImportError:  # pragma: no cover
+    rapidjson = None
+
+
+class JSONCodec(ABC):
+    """
+    Кодирование тела запросов и разбор ответов API в формате JSON.
+
+    Используется клиентами :class:`Delivery <pochta.delivery.Delivery>`
+    и :class:`AsyncDelivery <pochta.delivery.AsyncDelivery>`.
+    """
+
+    #: Имя кодека для :func:`get_codec`
+    name = ''
+
+    @abstractmethod
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Кодирование тела запроса.
+
+        :param obj: Тело запроса
+        :return: JSON в кодировке UTF-8
+        """
+
+    @abstractmethod
+    def loads(self, data: bytes) -> Any:
+        """
+        Разбор тела ответа.
+
+        :param data: Тело ответа без преобразования в строку
+        :return: Разобранный JSON
+        """
+
+    def __repr__(self) -> str:
+        """Строковое представление."""
+        return f'{type(self).__name__}()'
+
+
+def _default(obj: Any) -> Any:
+    # Перечисления библиотеки наследуются от str, но не все кодеки кодируют их как строки
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+class StdlibCodec(JSONCodec):
+    """Кодек на основе стандартного модуля json (используется по умолчанию)."""
+
+    name = 'json'
+
+    def dumps(self, obj: Any) -> bytes:
+        """Кодирование тела запроса."""
+        return json.dumps(obj, allow_nan=False).encode('utf-8')
+
+    def loads(self, data: bytes) -> Any:
+        """Разбор тела ответа."""
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """Кодек на основе пакета ``orjson``."""
+
+    name = 'orjson'
+
+    def __init__(self) -> None:
+        """Инициализация кодека."""
+        if orjson is None:
+            raise ImportError('Для OrjsonCodec требуется установить пакет orjson')
+
+    def dumps(self, obj: Any) -> bytes:
+        """Кодирование тела запроса."""
+        return orjson.dumps(obj, default=_default)
+
+    def loads(self, data: bytes) -> Any:
+        """Разбор тела ответа."""
+        return orjson.loads(data)
+
+
+class UjsonCodec(JSONCodec):
+    """Кодек на основе пакета ``ujson``."""
+
+    name = 'ujson'
+
+    def __init__(self) -> None:
+        """Инициализация кодека."""
+        if ujson is None:
+            raise ImportError('Для UjsonCodec требуется установить пакет ujson')
+
+    def dumps(self, obj: Any) -> bytes:
+        """Кодирование тела запроса."""
+        return ujson.dumps(obj, ensure_ascii=False, default=_default).encode('utf-8')
+
+    def loads(self, data: bytes) -> Any:
+        """Разбор тела ответа."""
+        return ujson.loads(data)
+
+
+class RapidjsonCodec(JSONCodec):
+    """Кодек на основе пакета ``python-rapidjson``."""
+
+    name = 'rapidjson'
+
+    def __init__(self) -> None:
+        """Инициализация кодека."""
+        if rapidjson is None:
+            raise ImportError('Для RapidjsonCodec требуется установить пакет python-rapidjson')
+
+    def dumps(self, obj: Any) -> bytes:
+        """Кодирование тела запроса."""
+        return rapidjson.dumps(obj, ensure_ascii=False, default=_default).encode('utf-8')
+
+    def loads(self, data: bytes) -> Any:
+        """Разбор тела ответа."""
+        return rapidjson.loads(data)
+
+
+CODECS = (OrjsonCodec, UjsonCodec, RapidjsonCodec, StdlibCodec)
+
+
+def get_codec(name: Optional[str] = None) -> JSONCodec:
+    """
+    Получение кодека по имени.
+
+    :param name: ``json``, ``orjson``, ``ujson``, ``rapidjson``, либо None
+        для выбора самого быстрого из установленных
+    :return: Кодек
+    """
+    for codec in CODECS:
+        if name is None or codec.name == name:
+            try:
+                return codec()
+            except ImportError:
+                if name is not None:
+                    raise
+    raise ValueError(f'Unknown JSON codec: {name}')
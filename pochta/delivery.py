@@ -1,58 +1,115 @@
+import asyncio
 from base64 import b64encode
+import time
+from typing import Any, Optional, Tuple, Union
 
-from requests import Request, Response, Session
+from requests import PreparedRequest, Request, Response, Session
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as HTTPConnectionError
+from requests.exceptions import Timeout as HTTPTimeout
 
 from .api import LTA, Archive, Batches, Documents, NoGroup, Orders, Services, Settings
-from .utils import clean_data
+from .cache import ResponseCache, TariffCache
+from .codec import JSONCodec, StdlibCodec
+from .metrics import MetricsSink, RequestEvent
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .utils import clean_data, clean_params
 
 
-class Delivery:
-    """
-    API клиент сервиса Доставки.
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
 
-    https://otpravka.pochta.ru/specification
-    """
+Timeout = Union[None, float, Tuple[float, float]]
+
+
+class _HTTPXTrace:
+    """Замер времени соединения и получения заголовков по событиям трассировки httpcore."""
+
+    def __init__(self, event: RequestEvent) -> None:
+        self.event = event
+        self._attempt_started = 0.0
+        self._connect_started = 0.0
+
+    def start_attempt(self, attempt: int) -> None:
+        self.event.retries = attempt
+        self.event.connect_time = None
+        self.event.ttfb = None
+        self._attempt_started = time.perf_counter()
+
+    async def __call__(self, name: str, info: dict) -> None:
+        # Разрешение имени выполняется внутри connect_tcp и отдельно не отслеживается
+        if name == 'connection.connect_tcp.started':
+            self._connect_started = time.perf_counter()
+        elif name in ('connection.connect_tcp.complete', 'connection.start_tls.complete'):
+            self.event.connect_time = time.perf_counter() - self._connect_started
+        elif name.endswith('.receive_response_headers.complete'):
+            self.event.ttfb = time.perf_counter() - self._attempt_started
+
+
+class _BaseDelivery:
+    """Общая часть API клиентов сервиса Доставки."""
 
     API_URL = 'https://otpravka-api.pochta.ru'
 
-    def __init__(self, login: str, password: str, access_token: str) -> None:
+    def __init__(self, login: str, password: str, access_token: str,
+                 retry: Optional[RetryPolicy] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 cache: Optional[ResponseCache] = None,
+                 tariff_cache: Optional[TariffCache] = None,
+                 codec: Optional[JSONCodec] = None,
+                 metrics: Optional[MetricsSink] = None) -> None:
         """
         Инициализация API клиента Доставки.
 
         :param login: Логин от сервиса доставки
         :param password: Пароль от сервиса доставки
         :param access_token: Токен авторизации приложения
+        :param retry: Политика повторных запросов
+        :param rate_limiter: Ограничитель частоты запросов
+        :param cache: Кэш ответов справочных методов
+        :param tariff_cache: Кэш расчетов стоимости доставки
+        :param codec: Кодек JSON для тела запросов и ответов
+        :param metrics: Получатель метрик запросов
         """
+        self.codec = codec if codec is not None else StdlibCodec()
+        self.metrics = metrics
+        self._retry = retry
+        self._rate_limiter = rate_limiter
+        self.cache = cache
+        self.tariff_cache = tariff_cache
         self._access_token = access_token
         self._auth_key = b64encode(f'{login}:{password}'.encode()).decode()
-        self._session = Session()
         self._headers = {
             'Authorization': f'AccessToken {self._access_token}',
             'X-User-Authorization': f'Basic {self._auth_key}',
             'Content-Type': 'application/json',
             'Accept': 'application/json;charset=UTF-8',
         }
-        self._session.headers.update(self._headers)
 
-    def request(self, method: str, endpoint: str, data=None, **kwargs) -> Response:
-        """
-        Функция для обращения к API методам через протокол HTTP.
+    @staticmethod
+    def _start_event(method: str, endpoint: str, request_size: Optional[str]) -> RequestEvent:
+        event = RequestEvent(method, getattr(endpoint, 'template', endpoint), endpoint)
+        event.request_size = int(request_size or 0)
+        return event
 
-        :param method: HTTP метод
-        :param endpoint: Эндпоинт API
-        :param data: Тело запроса
-        :param kwargs: Дополнительные аргументы
-        :return: Ответ API
-        """
-        url = f'{self.API_URL}{endpoint}'
-        stream = kwargs.pop('stream', False)
+    @staticmethod
+    def _get_response_size(res: Any, stream: bool) -> Optional[int]:
+        # Потоковый ответ не вычитывается, размер известен только из заголовка
+        if not stream:
+            return len(res.content)
+        length = res.headers.get('Content-Length')
+        return int(length) if length is not None else None
+
+    def _encode_body(self, data: Any, kwargs: dict) -> Optional[bytes]:
+        # Тело, переданное в json, уже очищено от пустых значений (например Order.payload)
+        if 'json' in kwargs:
+            return self.codec.dumps(kwargs.pop('json'))
         if data:
-            kwargs['json'] = clean_data(data)
-        req = Request(method, url, **kwargs)
-        prepared = self._session.prepare_request(req)
-        res = self._session.send(prepared, stream=stream)
-        res.raise_for_status()
-        return res
+            return self.codec.dumps(clean_data(data))
+        return None
 
     @property
     def archive(self) -> Archive:
@@ -93,3 +150,444 @@ class Delivery:
     def orders(self) -> Orders:
         """Заказы."""
         return Orders(self)
+
+
+class Delivery(_BaseDelivery):
+    """
+    API клиент сервиса Доставки.
+
+    https://otpravka.pochta.ru/specification
+    """
+
+    def __init__(self, login: str, password: str, access_token: str,
+                 session: Optional[Session] = None,
+                 timeout: Timeout = None,
+                 pool_connections: int = 10,
+                 pool_maxsize: int = 10,
+                 pool_block: bool = False,
+                 keep_alive: bool = True,
+                 retry: Optional[RetryPolicy] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 cache: Optional[ResponseCache] = None,
+                 tariff_cache: Optional[TariffCache] = None,
+                 codec: Optional[JSONCodec] = None,
+                 metrics: Optional[MetricsSink] = None) -> None:
+        """
+        Инициализация API клиента Доставки.
+
+        Параметры пула соединений применяются только к создаваемой клиентом сессии.
+        Для использования одного пула несколькими клиентами создайте сессию через
+        :meth:`build_session` и передайте ее в параметре ``session``.
+
+        :param login: Логин от сервиса доставки
+        :param password: Пароль от сервиса доставки
+        :param access_token: Токен авторизации приложения
+        :param session: Готовая сессия requests, которую будет использовать клиент
+        :param timeout: Таймаут запроса в секундах,
+            либо кортеж (таймаут соединения, таймаут чтения)
+        :param pool_connections: Количество кэшируемых пулов соединений (по одному на хост)
+        :param pool_maxsize: Максимальное количество соединений в пуле одного хоста
+        :param pool_block: Ожидать освобождения соединения при исчерпании пула
+        :param keep_alive: Использовать постоянные HTTP соединения
+        :param retry: Политика повторных запросов при временных ошибках.
+            По умолчанию запросы не повторяются
+        :param rate_limiter: Ограничитель частоты запросов, может разделяться
+            несколькими клиентами
+        :param cache: Кэш ответов справочных методов (поиск ОПС).
+            По умолчанию ответы не кэшируются
+        :param tariff_cache: Кэш расчетов стоимости доставки.
+            По умолчанию расчеты не кэшируются
+        :param codec: Кодек JSON для тела запросов и ответов
+            (см. :mod:`pochta.codec`). По умолчанию стандартный модуль json
+        :param metrics: Получатель метрик запросов (см. :mod:`pochta.metrics`).
+            По умолчанию метрики не собираются
+        """
+        super().__init__(
+            login, password, access_token, retry, rate_limiter, cache, tariff_cache, codec,
+            metrics,
+        )
+        self._timeout = timeout
+        self._own_session = session is None
+        if session is None:
+            session = self.build_session(pool_connections, pool_maxsize, pool_block)
+        self._session = session
+        if not keep_alive:
+            self._headers['Connection'] = 'close'
+
+    @staticmethod
+    def build_session(pool_connections: int = 10,
+                      pool_maxsize: int = 10,
+                      pool_block: bool = False) -> Session:
+        """
+        Создание сессии requests с настроенным пулом соединений.
+
+        Сессия не содержит данных авторизации и может использоваться
+        несколькими клиентами одновременно.
+
+        :param pool_connections: Количество кэшируемых пулов соединений (по одному на хост)
+        :param pool_maxsize: Максимальное количество соединений в пуле одного хоста
+        :param pool_block: Ожидать освобождения соединения при исчерпании пула
+        :return: Сессия requests
+        """
+        session = Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def request(self, method: str, endpoint: str, data=None, **kwargs) -> Response:
+        """
+        Функция для обращения к API методам через протокол HTTP.
+
+        :param method: HTTP метод
+        :param endpoint: Эндпоинт API
+        :param data: Тело запроса
+        :param kwargs: Дополнительные аргументы. ``idempotent=False`` запрещает
+            повтор запроса при ошибках, после которых он мог быть обработан сервером
+        :return: Ответ API
+        """
+        url = f'{self.API_URL}{endpoint}'
+        stream = kwargs.pop('stream', False)
+        timeout = kwargs.pop('timeout', self._timeout)
+        idempotent = kwargs.pop('idempotent', None)
+        body = self._encode_body(data, kwargs)
+        if body is not None:
+            kwargs['data'] = body
+        req = Request(method, url, headers=self._headers, **kwargs)
+        prepared = self._session.prepare_request(req)
+        if self._retry is not None:
+            self._retry.on_request()
+
+        if self.metrics is None:
+            res = self._send(prepared, method, endpoint, stream, timeout, idempotent)
+            res.raise_for_status()
+            return res
+
+        event = self._start_event(method, endpoint, prepared.headers.get('Content-Length'))
+        started = time.perf_counter()
+        try:
+            res = self._send(prepared, method, endpoint, stream, timeout, idempotent, event)
+            event.status = res.status_code
+            event.ttfb = res.elapsed.total_seconds()
+            event.response_size = self._get_response_size(res, stream)
+            res.raise_for_status()
+            return res
+        except Exception as exc:
+            event.error = exc
+            raise
+        finally:
+            event.total_time = time.perf_counter() - started
+            self.metrics.on_request(event)
+
+    def _send(self, prepared: PreparedRequest, method: str, endpoint: str, stream: bool,
+              timeout: Timeout, idempotent: Optional[bool] = None,
+              event: Optional[RequestEvent] = None) -> Response:
+        attempt = 0
+        while True:
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire(endpoint)
+            if event is not None:
+                event.retries = attempt
+            try:
+                res = self._session.send(prepared, stream=stream, timeout=timeout)
+            except (HTTPConnectionError, HTTPTimeout):
+                if self._retry is None or not self._retry.can_retry(
+                        method, attempt, idempotent=idempotent):
+                    raise
+                delay = self._retry.get_delay(attempt)
+            else:
+                if self._retry is None or not self._retry.can_retry(
+                        method, attempt, res.status_code, idempotent):
+                    break
+                delay = self._retry.get_delay(attempt, res.headers.get('Retry-After'))
+                if delay is None:
+                    break
+                res.close()
+            time.sleep(delay)
+            attempt += 1
+        return res
+
+    def request_json(self, method: str, endpoint: str, data=None, **kwargs) -> Any:
+        """
+        Обращение к API методу с разбором JSON ответа.
+
+        :param method: HTTP метод
+        :param endpoint: Эндпоинт API
+        :param data: Тело запроса
+        :param kwargs: Дополнительные аргументы
+        :return: Тело ответа API
+        """
+        return self.codec.loads(self.request(method, endpoint, data, **kwargs).content)
+
+    def cached_request_json(self, method: str, endpoint: str, **kwargs) -> Any:
+        """
+        Обращение к API методу с использованием кэша ответов.
+
+        :param method: HTTP метод
+        :param endpoint: Эндпоинт API
+        :param kwargs: Дополнительные аргументы
+        :return: Тело ответа API
+        """
+        if self.cache is None:
+            return self.request_json(method, endpoint, **kwargs)
+
+        key = self.cache.make_key(method, endpoint, kwargs.get('params'))
+        hit, value = self.cache.get(key)
+        if not hit:
+            value = self.request_json(method, endpoint, **kwargs)
+            self.cache.set(key, value)
+        return value
+
+    def close(self) -> None:
+        """Закрытие HTTP соединений клиента, если сессия была создана им самим."""
+        if self._own_session:
+            self._session.close()
+
+    def __enter__(self) -> 'Delivery':
+        """Использование клиента в качестве контекстного менеджера."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Закрытие клиента при выходе из контекстного менеджера."""
+        self.close()
+
+
+class AsyncDelivery(_BaseDelivery):
+    """
+    Асинхронный API клиент сервиса Доставки.
+
+    Предоставляет те же разделы API, что и :class:`Delivery`, но все методы
+    возвращают корутины. Для работы требуется пакет ``httpx``
+    (``pip install fs-pochta-api[async]``).
+
+    https://otpravka.pochta.ru/specification
+    """
+
+    def __init__(self, login: str, password: str, access_token: str,
+                 session: Optional['httpx.AsyncClient'] = None,
+                 timeout: Timeout = None,
+                 max_connections: Optional[int] = 100,
+                 max_keepalive_connections: Optional[int] = 20,
+                 keep_alive: bool = True,
+                 keepalive_expiry: Optional[float] = 5.0,
+                 retry: Optional[RetryPolicy] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 cache: Optional[ResponseCache] = None,
+                 tariff_cache: Optional[TariffCache] = None,
+                 codec: Optional[JSONCodec] = None,
+                 metrics: Optional[MetricsSink] = None) -> None:
+        """
+        Инициализация асинхронного API клиента Доставки.
+
+        Параметры пула соединений применяются только к создаваемому клиентом
+        ``httpx.AsyncClient``. Для использования одного пула несколькими клиентами
+        создайте его через :meth:`build_session` и передайте в параметре ``session``.
+
+        :param login: Логин от сервиса доставки
+        :param password: Пароль от сервиса доставки
+        :param access_token: Токен авторизации приложения
+        :param session: Готовый ``httpx.AsyncClient``, который будет использовать клиент
+        :param timeout: Таймаут запроса в секундах,
+            либо кортеж (таймаут соединения, таймаут чтения). По умолчанию
+            используется таймаут ``httpx.AsyncClient`` (у создаваемого клиента - без таймаута)
+        :param max_connections: Максимальное количество одновременных соединений
+        :param max_keepalive_connections: Максимальное количество простаивающих соединений
+        :param keep_alive: Использовать постоянные HTTP соединения
+        :param keepalive_expiry: Время жизни простаивающего соединения в секундах
+        :param retry: Политика повторных запросов при временных ошибках.
+            По умолчанию запросы не повторяются
+        :param rate_limiter: Ограничитель частоты запросов, может разделяться
+            несколькими клиентами
+        :param cache: Кэш ответов справочных методов (поиск ОПС).
+            По умолчанию ответы не кэшируются
+        :param tariff_cache: Кэш расчетов стоимости доставки.
+            По умолчанию расчеты не кэшируются
+        :param codec: Кодек JSON для тела запросов и ответов
+            (см. :mod:`pochta.codec`). По умолчанию стандартный модуль json
+        :param metrics: Получатель метрик запросов (см. :mod:`pochta.metrics`).
+            По умолчанию метрики не собираются
+        """
+        if httpx is None:
+            raise ImportError('Для AsyncDelivery требуется установить пакет httpx')
+
+        super().__init__(
+            login, password, access_token, retry, rate_limiter, cache, tariff_cache, codec,
+            metrics,
+        )
+        self._timeout = timeout
+        self._own_session = session is None
+        if session is None:
+            session = self.build_session(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections if keep_alive else 0,
+                keepalive_expiry=keepalive_expiry,
+            )
+        self._session = session
+        if not keep_alive:
+            self._headers['Connection'] = 'close'
+
+    @staticmethod
+    def build_session(max_connections: Optional[int] = 100,
+                      max_keepalive_connections: Optional[int] = 20,
+                      keepalive_expiry: Optional[float] = 5.0) -> 'httpx.AsyncClient':
+        """
+        Создание ``httpx.AsyncClient`` с настроенным пулом соединений.
+
+        Клиент не содержит данных авторизации и может использоваться
+        несколькими объектами :class:`AsyncDelivery` одновременно.
+
+        :param max_connections: Максимальное количество одновременных соединений
+        :param max_keepalive_connections: Максимальное количество простаивающих соединений
+        :param keepalive_expiry: Время жизни простаивающего соединения в секундах
+        :return: Асинхронный HTTP клиент
+        """
+        if httpx is None:
+            raise ImportError('Для AsyncDelivery требуется установить пакет httpx')
+
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        return httpx.AsyncClient(limits=limits, timeout=None)
+
+    async def request(self, method: str, endpoint: str, data=None, **kwargs) -> 'httpx.Response':
+        """
+        Функция для асинхронного обращения к API методам через протокол HTTP.
+
+        При ``stream=True`` тело ответа не вычитывается, ответ необходимо закрыть
+        вызовом ``await res.aclose()``.
+
+        :param method: HTTP метод
+        :param endpoint: Эндпоинт API
+        :param data: Тело запроса
+        :param kwargs: Дополнительные аргументы. ``idempotent=False`` запрещает
+            повтор запроса при ошибках, после которых он мог быть обработан сервером
+        :return: Ответ API
+        """
+        url = f'{self.API_URL}{endpoint}'
+        stream = kwargs.pop('stream', False)
+        if 'timeout' in kwargs:
+            timeout = kwargs.pop('timeout')
+        elif self._timeout is not None:
+            timeout = self._timeout
+        else:
+            # Таймаут не задан: используются настройки переданного httpx.AsyncClient
+            timeout = httpx.USE_CLIENT_DEFAULT
+        idempotent = kwargs.pop('idempotent', None)
+        body = self._encode_body(data, kwargs)
+        if body is not None:
+            kwargs['content'] = body
+        if 'params' in kwargs:
+            kwargs['params'] = clean_params(kwargs['params'])
+        if isinstance(timeout, tuple):
+            connect_timeout, read_timeout = timeout
+            timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        req = self._session.build_request(
+            method, url, headers=self._headers, timeout=timeout, **kwargs,
+        )
+        if self._retry is not None:
+            self._retry.on_request()
+
+        if self.metrics is None:
+            res = await self._send(req, method, endpoint, stream, idempotent)
+            if res.is_error and stream:
+                await res.aclose()
+            res.raise_for_status()
+            return res
+
+        event = self._start_event(method, endpoint, req.headers.get('Content-Length'))
+        trace = _HTTPXTrace(event)
+        req.extensions['trace'] = trace
+        started = time.perf_counter()
+        try:
+            res = await self._send(req, method, endpoint, stream, idempotent, trace)
+            event.status = res.status_code
+            event.response_size = self._get_response_size(res, stream)
+            if res.is_error and stream:
+                await res.aclose()
+            res.raise_for_status()
+            return res
+        except Exception as exc:
+            event.error = exc
+            raise
+        finally:
+            event.total_time = time.perf_counter() - started
+            self.metrics.on_request(event)
+
+    async def _send(self, req: 'httpx.Request', method: str, endpoint: str, stream: bool,
+                    idempotent: Optional[bool] = None,
+                    trace: Optional['_HTTPXTrace'] = None) -> 'httpx.Response':
+        attempt = 0
+        while True:
+            if self._rate_limiter is not None:
+                await self._rate_limiter.acquire_async(endpoint)
+            if trace is not None:
+                trace.start_attempt(attempt)
+            try:
+                res = await self._session.send(req, stream=stream)
+            except httpx.TransportError:
+                if self._retry is None or not self._retry.can_retry(
+                        method, attempt, idempotent=idempotent):
+                    raise
+                delay = self._retry.get_delay(attempt)
+            else:
+                if self._retry is None or not self._retry.can_retry(
+                        method, attempt, res.status_code, idempotent):
+                    break
+                delay = self._retry.get_delay(attempt, res.headers.get('Retry-After'))
+                if delay is None:
+                    break
+                await res.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
+        return res
+
+    async def request_json(self, method: str, endpoint: str, data=None, **kwargs) -> Any:
+        """
+        Асинхронное обращение к API методу с разбором JSON ответа.
+
+        :param method: HTTP метод
+        :param endpoint: Эндпоинт API
+        :param data: Тело запроса
+        :param kwargs: Дополнительные аргументы
+        :return: Тело ответа API
+        """
+        res = await self.request(method, endpoint, data, **kwargs)
+        return self.codec.loads(res.content)
+
+    async def cached_request_json(self, method: str, endpoint: str, **kwargs) -> Any:
+        """
+        Асинхронное обращение к API методу с использованием кэша ответов.
+
+        :param method: HTTP метод
+        :param endpoint: Эндпоинт API
+        :param kwargs: Дополнительные аргументы
+        :return: Тело ответа API
+        """
+        if self.cache is None:
+            return await self.request_json(method, endpoint, **kwargs)
+
+        key = self.cache.make_key(method, endpoint, kwargs.get('params'))
+        hit, value = self.cache.get(key)
+        if not hit:
+            value = await self.request_json(method, endpoint, **kwargs)
+            self.cache.set(key, value)
+        return value
+
+    async def close(self) -> None:
+        """Закрытие HTTP соединений клиента, если они были созданы им самим."""
+        if self._own_session:
+            await self._session.aclose()
+
+    async def __aenter__(self) -> 'AsyncDelivery':
+        """Использование клиента в качестве асинхронного контекстного менеджера."""
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        """Закрытие клиента при выходе из контекстного менеджера."""
+        await self.close()
@@ -0,0 +1,291 @@
+import csv
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+from typing import IO, Awaitable, Callable, Dict, Iterator, List, Optional, Union
+import zipfile
+
+from requests import Response
+
+
+Destination = Union[str, 'os.PathLike', IO[bytes]]
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+CHUNK_SIZE = 64 * 1024
+SPOOL_SIZE = 16 * 1024 * 1024
+
+_TEMP_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+
+
+class DownloadResult:
+    """Результат скачивания документа."""
+
+    def __init__(self, path: Optional[str], size: int, checksum: Optional[str]) -> None:
+        """
+        Инициализация результата.
+
+        :param path: Путь к сохраненному файлу (None при записи в файловый объект)
+        :param size: Количество записанных байт
+        :param checksum: Контрольная сумма содержимого в шестнадцатеричном виде
+        """
+        self.path = path
+        self.size = size
+        self.checksum = checksum
+
+    def __repr__(self) -> str:
+        """Строковое представление."""
+        return f'DownloadResult(path={self.path!r}, size={self.size}, checksum={self.checksum!r})'
+
+
+class _Writer:
+    """Запись потока в файл или файловый объект с подсчетом размера и контрольной суммы."""
+
+    def __init__(self, destination: Destination, total: Optional[int],
+                 progress: Optional[ProgressCallback], checksum: Optional[str]) -> None:
+        self._total = total
+        self._progress = progress
+        self._hash = hashlib.new(checksum) if checksum else None
+        self._size = 0
+        self._path = None
+        self._tmp_path = None
+
+        if hasattr(destination, 'write'):
+            self._file = destination
+        else:
+            # Запись во временный файл в той же директории и атомарное переименование,
+            # чтобы по пути назначения никогда не оказался недокачанный документ
+            self._path = os.fspath(destination)
+            directory, name = os.path.split(os.path.abspath(self._path))
+            fd, self._tmp_path = self._create_temp(directory, name)
+            self._file = os.fdopen(fd, 'wb')
+
+    @staticmethod
+    def _create_temp(directory: str, name: str):
+        # В отличие от tempfile.mkstemp (права 0600) права файла определяются umask,
+        # как при open(path, 'wb')
+        while True:
+            path = os.path.join(directory, f'.{name}.{os.urandom(6).hex()}.part')
+            try:
+                return os.open(path, _TEMP_FLAGS, 0o666), path
+            except FileExistsError:
+                continue
+
+    def write(self, chunk: bytes) -> None:
+        if not chunk:
+            return
+        self._file.write(chunk)
+        self._size += len(chunk)
+        if self._hash is not None:
+            self._hash.update(chunk)
+        if self._progress is not None:
+            self._progress(self._size, self._total)
+
+    def commit(self) -> DownloadResult:
+        if self._tmp_path is not None:
+            try:
+                self._file.close()
+                os.replace(self._tmp_path, self._path)
+            except BaseException:
+                self.abort()
+                raise
+        else:
+            self._file.flush()
+        checksum = self._hash.hexdigest() if self._hash is not None else None
+        return DownloadResult(self._path, self._size, checksum)
+
+    def abort(self) -> None:
+        if self._tmp_path is not None:
+            try:
+                self._file.close()
+            finally:
+                try:
+                    os.unlink(self._tmp_path)
+                except FileNotFoundError:
+                    pass
+
+
+def _content_length(response) -> Optional[int]:
+    length = response.headers.get('Content-Length')
+    return int(length) if length and length.isdigit() else None
+
+
+def save_response(response: Response, destination: Destination,
+                  chunk_size: int = CHUNK_SIZE,
+                  progress: Optional[ProgressCallback] = None,
+                  checksum: Optional[str] = 'sha256') -> DownloadResult:
+    """
+    Сохранение потокового ответа API в файл.
+
+    Ответ читается частями по ``chunk_size`` байт, поэтому расход памяти не зависит
+    от размера документа. При сохранении по пути запись идет во временный файл,
+    который переименовывается в целевой только после успешного скачивания.
+
+    :param response: Ответ API, полученный с ``stream=True``
+    :param destination: Путь к файлу или открытый на запись бинарный файловый объект
+    :param chunk_size: Размер части в байтах
+    :param progress: Функция, вызываемая после записи каждой части
+        с аргументами (записано байт, размер ответа или None)
+    :param checksum: Алгоритм hashlib для подсчета контрольной суммы, либо None
+    :return: Результат скачивания
+    """
+    try:
+        writer = _Writer(destination, _content_length(response), progress, checksum)
+        try:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                writer.write(chunk)
+        except BaseException:
+            writer.abort()
+            raise
+        return writer.commit()
+    finally:
+        response.close()
+
+
+async def save_response_async(response: Awaitable, destination: Destination,
+                              chunk_size: int = CHUNK_SIZE,
+                              progress: Optional[ProgressCallback] = None,
+                              checksum: Optional[str] = 'sha256') -> DownloadResult:
+    """
+    Асинхронное сохранение потокового ответа API в файл.
+
+    Аналог :func:`save_response` для :class:`AsyncDelivery <pochta.delivery.AsyncDelivery>`.
+
+    :param response: Корутина, возвращающая ответ API, полученный с ``stream=True``
+    :param destination: Путь к файлу или открытый на запись бинарный файловый объект
+    :param chunk_size: Размер части в байтах
+    :param progress: Функция, вызываемая после записи каждой части
+        с аргументами (записано байт, размер ответа или None)
+    :param checksum: Алгоритм hashlib для подсчета контрольной суммы, либо None
+    :return: Результат скачивания
+    """
+    response = await response
+    try:
+        writer = _Writer(destination, _content_length(response), progress, checksum)
+        try:
+            async for chunk in response.aiter_bytes(chunk_size=chunk_size):
+                writer.write(chunk)
+        except BaseException:
+            writer.abort()
+            raise
+        return writer.commit()
+    finally:
+        await response.aclose()
+
+
+class DocumentArchive:
+    """
+    Zip архив с документами партии.
+
+    Архив хранится во временном файле, который находится в памяти, пока его размер
+    не превысит заданный порог. Файлы архива распаковываются по мере чтения,
+    поэтому получение одного файла не требует распаковки остальных.
+    """
+
+    def __init__(self, file: IO[bytes]) -> None:
+        """
+        Инициализация архива.
+
+        :param file: Бинарный файловый объект с содержимым архива, поддерживающий seek
+        """
+        self._file = file
+        self._zip = zipfile.ZipFile(file)
+
+    @property
+    def names(self) -> List[str]:
+        """Список файлов в архиве."""
+        return self._zip.namelist()
+
+    def open(self, name: str) -> IO[bytes]:
+        """
+        Открытие файла архива на чтение.
+
+        :param name: Имя файла в архиве (например ``Export.csv``)
+        :return: Бинарный поток с распаковываемым содержимым файла
+        """
+        return self._zip.open(name)
+
+    def iter_csv(self, name: str = 'Export.csv',
+                 encoding: str = 'cp1251',
+                 delimiter: str = ';') -> Iterator[Dict[str, str]]:
+        """
+        Построчное чтение CSV файла архива.
+
+        :param name: Имя файла в архиве
+        :param encoding: Кодировка файла
+        :param delimiter: Разделитель полей
+        :return: Итератор по строкам файла в виде словарей с ключами из заголовка
+        """
+        with self.open(name) as raw:
+            text = io.TextIOWrapper(raw, encoding=encoding, newline='')
+            yield from csv.DictReader(text, delimiter=delimiter)
+
+    def extract(self, name: str, destination: Destination,
+                chunk_size: int = CHUNK_SIZE) -> None:
+        """
+        Распаковка одного файла архива.
+
+        :param name: Имя файла в архиве
+        :param destination: Путь к файлу или бинарный файловый объект
+        :param chunk_size: Размер части в байтах
+        """
+        with self.open(name) as source:
+            if hasattr(destination, 'write'):
+                shutil.copyfileobj(source, destination, chunk_size)
+            else:
+                with open(destination, 'wb') as target:
+                    shutil.copyfileobj(source, target, chunk_size)
+
+    def close(self) -> None:
+        """Закрытие архива и удаление временного файла."""
+        self._zip.close()
+        self._file.close()
+
+    def __enter__(self) -> 'DocumentArchive':
+        """Использование архива в качестве контекстного менеджера."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Закрытие архива при выходе из контекстного менеджера."""
+        self.close()
+
+
+def open_archive(response: Response, spool_size: int = SPOOL_SIZE,
+                 chunk_size: int = CHUNK_SIZE) -> DocumentArchive:
+    """
+    Получение zip архива из потокового ответа API.
+
+    :param response: Ответ API, полученный с ``stream=True``
+    :param spool_size: Размер архива в байтах, до которого он хранится в памяти
+    :param chunk_size: Размер части в байтах
+    :return: Архив с документами
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=spool_size)
+    try:
+        save_response(response, spool, chunk_size=chunk_size, checksum=None)
+        spool.seek(0)
+        return DocumentArchive(spool)
+    except BaseException:
+        spool.close()
+        raise
+
+
+async def open_archive_async(response: Awaitable, spool_size: int = SPOOL_SIZE,
+                             chunk_size: int = CHUNK_SIZE) -> DocumentArchive:
+    """
+    Асинхронное получение zip архива из потокового ответа API.
+
+    :param response: Корутина, возвращающая ответ API, полученный с ``stream=True``
+    :param spool_size: Размер архива в байтах, до которого он хранится в памяти
+    :param chunk_size: Размер части в байтах
+    :return: Архив с документами
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=spool_size)
+    try:
+        await save_response_async(response, spool, chunk_size=chunk_size, checksum=None)
+        spool.seek(0)
+        return DocumentArchive(spool)
+    except BaseException:
+        spool.close()
+        raise
@@ -1,12 +1,15 @@
+from operator import attrgetter
 from typing import List, Optional, Union
 
 from .enums import (
     AddressType, EntryType, EnvelopeType, MailCategory, MailType, PaymentType, TransportType,
 )
-from .utils import _UniqId
+from .utils import _clean_value, _UniqId
 
 
 class Address(_UniqId):
+    __slots__ = ('address',)
+
     def __init__(self, address: str):
         """
         Адрес для нормализации.
@@ -27,6 +30,8 @@ class Address(_UniqId):
 
 
 class Name(_UniqId):
+    __slots__ = ('name',)
+
     def __init__(self, name: str):
         """
         ФИО для нормализации.
@@ -47,6 +52,8 @@ class Name(_UniqId):
 
 
 class Phone(_UniqId):
+    __slots__ = ('phone', 'area', 'place', 'region')
+
     def __init__(self, phone: str,
                  area: Optional[str] = None,
                  place: Optional[str] = None,
@@ -82,6 +89,8 @@ class Phone(_UniqId):
 
 
 class Recipient(_UniqId):
+    __slots__ = ('address', 'full_name', 'phone')
+
     def __init__(self, address: str, full_name: str, phone: str):
         """
         Получатель для проверки благонадежности.
@@ -112,6 +121,8 @@ class Recipient(_UniqId):
 class Item:
     """Вложение."""
 
+    __slots__ = ('description', 'quantity', 'value', 'vat_rate', 'insurance_value')
+
     def __init__(self, description: str,
                  quantity: int,
                  value: Optional[int] = None,
@@ -155,6 +166,8 @@ class Item:
 class CustomsEntry:
     """Вложение."""
 
+    __slots__ = ('amount', 'country_code', 'description', 'tnved_code', 'weight', 'value')
+
     def __init__(self, amount: int, country_code: int,
                  description: str, tnved_code: str,
                  weight: int, value: Optional[int] = None) -> None:
@@ -200,6 +213,27 @@ class CustomsEntry:
 class Order:
     """Класс помошник создания РПО."""
 
+    # Все атрибуты РПО перечислены в слотах, чтобы экземпляры не хранили __dict__
+    __slots__ = (
+        'mass', 'order_num', 'fragile', 'mail_category', 'mail_type', 'payment', 'payment_method',
+        # Получатель
+        'recipient_name', 'given_name', 'surname', 'middle_name', 'tel_address',
+        # Адрес
+        'house_to', 'mail_direct', 'region_to', 'place_to', 'street_to', 'address_type_to',
+        'index_to', 'postoffice_code', 'area_to', 'building_to', 'hotel_to', 'corpus_to',
+        'slash_to', 'letter_to', 'location_to', 'office_to', 'room_to', 'num_address_type_to',
+        'raw_address', 'str_index_to', 'vladenie_to', 'transport_type',
+        # Таможенная декларация
+        'customs', 'customs_currency', 'customs_entries', 'customs_entries_type',
+        'customs_with_certificate', 'customs_with_invoice', 'customs_with_license',
+        # Габариты и вложения
+        'dimensions', 'items',
+        # Дополнительные параметры РПО
+        'completeness_checking', 'courier', 'envelope_type', 'delivery_with_cod',
+        'insurance_value', 'inventory', 'no_return', 'with_order_of_notice',
+        'with_simple_notice', 'sms_notice_recipient', 'notice_payment_method', 'wo_mail_rank',
+    )
+
     def __init__(self, mass: int, order_num: str, fragile: bool,
                  mail_category: MailCategory = MailCategory.SIMPLE,
                  mail_type: MailType = MailType.POSTAL_PARCEL,
@@ -472,6 +506,80 @@ class Order:
         self.notice_payment_method = notice_payment_method
         self.wo_mail_rank = wo_mail_rank
 
+    @property
+    def _customs_declaration(self) -> Optional[dict]:
+        if not self.customs:
+            return None
+        return {
+            'currency': self.customs_currency,
+            'customs-entries': [entry.raw for entry in self.customs_entries],
+            'entries-type': self.customs_entries_type,
+            'with-certificate': self.customs_with_certificate,
+            'with-invoice': self.customs_with_invoice,
+            'with-license': self.customs_with_license,
+        }
+
+    @property
+    def _goods(self) -> Optional[dict]:
+        if not self.items:
+            return None
+        return {'items': [item.raw for item in self.items]}
+
+    # Пары (ключ API, атрибут) в порядке следования в теле запроса
+    RAW_FIELDS = (
+        ('address-type-to', 'address_type_to'),
+        ('area-to', 'area_to'),
+        ('building-to', 'building_to'),
+        ('corpus-to', 'corpus_to'),
+        ('completeness-checking', 'completeness_checking'),
+        ('courier', 'courier'),
+        ('customs-declaration', '_customs_declaration'),
+        ('delivery-with-cod', 'delivery_with_cod'),
+        ('dimension', 'dimensions'),
+        ('envelope-type', 'envelope_type'),
+        ('fragile', 'fragile'),
+        ('given-name', 'given_name'),
+        ('goods', '_goods'),
+        ('hotel-to', 'hotel_to'),
+        ('house-to', 'house_to'),
+        ('index-to', 'index_to'),
+        ('insr-value', 'insurance_value'),
+        ('inventory', 'inventory'),
+        ('letter-to', 'letter_to'),
+        ('location-to', 'location_to'),
+        ('mail-category', 'mail_category'),
+        ('mail-direct', 'mail_direct'),
+        ('mail-type', 'mail_type'),
+        ('mass', 'mass'),
+        ('middle-name', 'middle_name'),
+        ('no-return', 'no_return'),
+        ('notice-payment-method', 'notice_payment_method'),
+        ('num-address-type-to', 'num_address_type_to'),
+        ('office-to', 'office_to'),
+        ('order-num', 'order_num'),
+        ('payment', 'payment'),
+        ('payment-method', 'payment_method'),
+        ('place-to', 'place_to'),
+        ('postoffice-code', 'postoffice_code'),
+        ('raw-address', 'raw_address'),
+        ('recipient-name', 'recipient_name'),
+        ('region-to', 'region_to'),
+        ('room-to', 'room_to'),
+        ('slash-to', 'slash_to'),
+        ('sms-notice-recipient', 'sms_notice_recipient'),
+        ('str-index-to', 'str_index_to'),
+        ('street-to', 'street_to'),
+        ('surname', 'surname'),
+        ('tel-address', 'tel_address'),
+        ('transport-type', 'transport_type'),
+        ('vladenie-to', 'vladenie_to'),
+        ('with-order-of-notice', 'with_order_of_notice'),
+        ('with-simple-notice', 'with_simple_notice'),
+        ('wo-mail-rank', 'wo_mail_rank'),
+    )
+    _RAW_KEYS = tuple(key for key, _ in RAW_FIELDS)
+    _RAW_VALUES = attrgetter(*(attr for _, attr in RAW_FIELDS))
+
     @property
     def raw(self) -> dict:
         """
@@ -479,72 +587,20 @@ class Order:
 
         :return: Словарь с данными РПО
         """
-        if self.customs:
-            customs_entries = [entry.raw for entry in self.customs_entries]
-            customs_declaration = {
-                'currency': self.customs_currency,
-                'customs-entries': customs_entries,
-                'entries-type': self.customs_entries_type,
-                'with-certificate': self.customs_with_certificate,
-                'with-invoice': self.customs_with_invoice,
-                'with-license': self.customs_with_license,
-            }
-        else:
-            customs_declaration = None
+        return dict(zip(self._RAW_KEYS, self._RAW_VALUES(self)))
 
-        if self.items:
-            items = {'items': [item.raw for item in self.items]}
-        else:
-            items = None
+    @property
+    def payload(self) -> dict:
+        """
+        Представление РПО без пустых полей для отправки в API.
+
+        Совпадает с ``clean_data(order.raw)``, но поля со значением None
+        отбрасываются сразу при построении словаря.
 
+        :return: Словарь с данными РПО
+        """
         return {
-            'address-type-to': self.address_type_to,
-            'area-to': self.area_to,
-            'building-to': self.building_to,
-            'corpus-to': self.corpus_to,
-            'completeness-checking': self.completeness_checking,
-            'courier': self.courier,
-            'customs-declaration': customs_declaration,
-            'delivery-with-cod': self.delivery_with_cod,
-            'dimension': self.dimensions,
-            'envelope-type': self.envelope_type,
-            'fragile': self.fragile,
-            'given-name': self.given_name,
-            'goods': items,
-            'hotel-to': self.hotel_to,
-            'house-to': self.house_to,
-            'index-to': self.index_to,
-            'insr-value': self.insurance_value,
-            'inventory': self.inventory,
-            'letter-to': self.letter_to,
-            'location-to': self.location_to,
-            'mail-category': self.mail_category,
-            'mail-direct': self.mail_direct,
-            'mail-type': self.mail_type,
-            'mass': self.mass,
-            'middle-name': self.middle_name,
-            'no-return': self.no_return,
-            'notice-payment-method': self.notice_payment_method,
-            'num-address-type-to': self.num_address_type_to,
-            'office-to': self.office_to,
-            'order-num': self.order_num,
-            'payment': self.payment,
-            'payment-method': self.payment_method,
-            'place-to': self.place_to,
-            'postoffice-code': self.postoffice_code,
-            'raw-address': self.raw_address,
-            'recipient-name': self.recipient_name,
-            'region-to': self.region_to,
-            'room-to': self.room_to,
-            'slash-to': self.slash_to,
-            'sms-notice-recipient': self.sms_notice_recipient,
-            'str-index-to': self.str_index_to,
-            'street-to': self.street_to,
-            'surname': self.surname,
-            'tel-address': self.tel_address,
-            'transport-type': self.transport_type,
-            'vladenie-to': self.vladenie_to,
-            'with-order-of-notice': self.with_order_of_notice,
-            'with-simple-notice': self.with_simple_notice,
-            'wo-mail-rank': self.wo_mail_rank,
+            key: _clean_value(value)
+            for key, value in zip(self._RAW_KEYS, self._RAW_VALUES(self))
+            if value is not None
         }
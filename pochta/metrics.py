@@ -0,0 +1,522 @@
+from abc import ABC
+from bisect import bisect_left
+from threading import Lock
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .exceptions import APIError
+
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # pragma: no cover
+    otel_trace = None
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class RequestEvent:
+    """Сведения о выполненном запросе к API Доставки."""
+
+    __slots__ = (
+        'method', 'endpoint', 'path', 'status', 'retries', 'request_size', 'response_size',
+        'connect_time', 'ttfb', 'total_time', 'started_at', 'error',
+    )
+
+    def __init__(self, method: str, endpoint: str, path: str) -> None:
+        """
+        Инициализация события.
+
+        :param method: HTTP метод
+        :param endpoint: Шаблон эндпоинта (например ``/1.0/batch/{batch_name}/shipment``)
+        :param path: Эндпоинт с подставленными параметрами
+        """
+        self.method = method.upper()
+        self.endpoint = endpoint
+        self.path = path
+        #: HTTP статус последнего ответа, либо None при сетевой ошибке
+        self.status: Optional[int] = None
+        #: Количество повторов запроса
+        self.retries = 0
+        #: Размер тела запроса в байтах
+        self.request_size = 0
+        #: Размер тела ответа в байтах, либо None для непрочитанного потокового ответа
+        self.response_size: Optional[int] = None
+        #: Время установки соединения последней попытки, включая разрешение имени (секунды).
+        #: None, если использовано открытое соединение или время недоступно
+        self.connect_time: Optional[float] = None
+        #: Время от отправки последней попытки до получения заголовков ответа (секунды)
+        self.ttfb: Optional[float] = None
+        #: Полное время запроса, включая повторы и чтение ответа (секунды)
+        self.total_time = 0.0
+        #: Время начала запроса (unix timestamp)
+        self.started_at = time.time()
+        #: Исключение, с которым завершился запрос
+        self.error: Optional[BaseException] = None
+
+    def __repr__(self) -> str:
+        """Строковое представление."""
+        return (f'RequestEvent({self.method} {self.endpoint}, status={self.status}, '
+                f'retries={self.retries}, total_time={self.total_time:.3f})')
+
+
+class SoapEvent:
+    """Сведения о выполненном вызове метода сервиса отслеживания."""
+
+    __slots__ = (
+        'operation', 'request_size', 'response_size', 'status', 'serialize_time',
+        'transport_time', 'total_time', 'started_at', 'fault_code', 'error',
+    )
+
+    def __init__(self, operation: str) -> None:
+        """
+        Инициализация события.
+
+        :param operation: Имя SOAP операции (например ``getOperationHistory``)
+        """
+        self.operation = operation
+        #: Размер XML запроса в байтах
+        self.request_size = 0
+        #: Размер XML ответа в байтах, либо None если ответ не получен
+        self.response_size: Optional[int] = None
+        #: HTTP статус ответа, либо None при сетевой ошибке
+        self.status: Optional[int] = None
+        #: Время сериализации XML запроса (секунды)
+        self.serialize_time = 0.0
+        #: Время HTTP запроса, включая чтение ответа (секунды)
+        self.transport_time = 0.0
+        #: Полное время вызова (секунды)
+        self.total_time = 0.0
+        #: Время начала вызова (unix timestamp)
+        self.started_at = time.time()
+        #: Код SOAP Fault (пустая строка, если код не указан), если сервис вернул ошибку
+        self.fault_code: Optional[str] = None
+        #: Исключение, с которым завершился вызов (в том числе APIError)
+        self.error: Optional[BaseException] = None
+
+    @property
+    def parse_time(self) -> float:
+        """Время разбора XML ответа и построения объектов zeep (секунды)."""
+        return max(self.total_time - self.transport_time - self.serialize_time, 0.0)
+
+    @property
+    def outcome(self) -> str:
+        """Результат вызова: ``ok``, ``fault``, ``api_error`` или ``error``."""
+        if self.error is None:
+            return 'ok'
+        if self.fault_code is not None:
+            return 'fault'
+        if isinstance(self.error, APIError):
+            return 'api_error'
+        return 'error'
+
+    def __repr__(self) -> str:
+        """Строковое представление."""
+        return (f'SoapEvent({self.operation}, outcome={self.outcome}, '
+                f'transport_time={self.transport_time:.3f}, total_time={self.total_time:.3f})')
+
+
+class MetricsSink(ABC):
+    """
+    Получатель событий инструментирования.
+
+    Методы вызываются синхронно в потоке, выполнившем запрос, поэтому
+    не должны блокироваться надолго. По умолчанию события игнорируются.
+    """
+
+    def on_request(self, event: RequestEvent) -> None:
+        """
+        Обработка завершенного запроса к API Доставки.
+
+        :param event: Сведения о запросе
+        """
+
+    def on_soap_call(self, event: SoapEvent) -> None:
+        """
+        Обработка завершенного вызова метода сервиса отслеживания.
+
+        :param event: Сведения о вызове
+        """
+
+
+class CompositeSink(MetricsSink):
+    """Передача событий нескольким получателям."""
+
+    def __init__(self, sinks: Iterable[MetricsSink]) -> None:
+        """
+        Инициализация получателя.
+
+        :param sinks: Получатели событий
+        """
+        self.sinks = list(sinks)
+
+    def on_request(self, event: RequestEvent) -> None:
+        """Обработка завершенного запроса к API Доставки."""
+        for sink in self.sinks:
+            sink.on_request(event)
+
+    def on_soap_call(self, event: SoapEvent) -> None:
+        """Обработка завершенного вызова метода сервиса отслеживания."""
+        for sink in self.sinks:
+            sink.on_soap_call(event)
+
+
+class Histogram:
+    """Гистограмма значений с фиксированными границами интервалов."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """
+        Инициализация гистограммы.
+
+        :param buckets: Возрастающие верхние границы интервалов
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        Учет значения.
+
+        :param value: Значение
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Оценка квантиля по верхним границам интервалов.
+
+        :param q: Квантиль от 0 до 1
+        :return: Верхняя граница интервала, в который попадает квантиль
+            (``inf`` для значений больше последней границы), либо None без значений
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return bound
+        return float('inf')
+
+
+class EndpointStats:
+    """Накопленная статистика запросов к эндпоинту."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """
+        Инициализация статистики.
+
+        :param buckets: Границы интервалов гистограммы времени запроса
+        """
+        self.latency = Histogram(buckets)
+        self.ttfb = Histogram(buckets)
+        self.statuses: Dict[str, int] = {}
+        self.errors = 0
+        self.retries = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+    def add(self, event: RequestEvent) -> None:
+        """
+        Учет запроса.
+
+        :param event: Сведения о запросе
+        """
+        self.latency.observe(event.total_time)
+        if event.ttfb is not None:
+            self.ttfb.observe(event.ttfb)
+        status = str(event.status) if event.status is not None else 'error'
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if event.error is not None:
+            self.errors += 1
+        self.retries += event.retries
+        self.request_bytes += event.request_size
+        self.response_bytes += event.response_size or 0
+
+
+class SoapOperationStats:
+    """Накопленная статистика вызовов SOAP операции."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """
+        Инициализация статистики.
+
+        :param buckets: Границы интервалов гистограмм времени вызова
+        """
+        self.latency = Histogram(buckets)
+        self.transport = Histogram(buckets)
+        self.parse = Histogram(buckets)
+        self.outcomes: Dict[str, int] = {}
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+    def add(self, event: SoapEvent) -> None:
+        """
+        Учет вызова.
+
+        :param event: Сведения о вызове
+        """
+        self.latency.observe(event.total_time)
+        if event.response_size is not None:
+            self.transport.observe(event.transport_time)
+            self.parse.observe(event.parse_time)
+        outcome = event.outcome
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        self.request_bytes += event.request_size
+        self.response_bytes += event.response_size or 0
+
+
+class HistogramSink(MetricsSink):
+    """
+    Агрегация запросов в памяти процесса по методу и шаблону эндпоинта,
+    а вызовов сервиса отслеживания по SOAP операции.
+
+    Накопленная статистика доступна через :meth:`snapshot` и :meth:`soap_snapshot`,
+    а также в текстовом формате Prometheus через :meth:`render_prometheus`.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """
+        Инициализация агрегатора.
+
+        :param buckets: Границы интервалов гистограмм времени запроса (секунды)
+        """
+        self.buckets = tuple(buckets)
+        self._stats: Dict[Tuple[str, str], EndpointStats] = {}
+        self._soap_stats: Dict[str, SoapOperationStats] = {}
+        self._lock = Lock()
+
+    def on_request(self, event: RequestEvent) -> None:
+        """Учет завершенного запроса к API Доставки."""
+        key = (event.method, event.endpoint)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = EndpointStats(self.buckets)
+            stats.add(event)
+
+    def on_soap_call(self, event: SoapEvent) -> None:
+        """Учет завершенного вызова метода сервиса отслеживания."""
+        with self._lock:
+            stats = self._soap_stats.get(event.operation)
+            if stats is None:
+                stats = self._soap_stats[event.operation] = SoapOperationStats(self.buckets)
+            stats.add(event)
+
+    def snapshot(self) -> Dict[Tuple[str, str], dict]:
+        """
+        Сводка по эндпоинтам.
+
+        :return: Словарь {(метод, шаблон эндпоинта): сводка} с количеством запросов,
+            ошибок и повторов, оценками p50/p99 времени запроса и объемом переданных данных
+        """
+        with self._lock:
+            return {
+                key: {
+                    'count': stats.latency.count,
+                    'errors': stats.errors,
+                    'retries': stats.retries,
+                    'statuses': dict(stats.statuses),
+                    'total_time': stats.latency.sum,
+                    'p50': stats.latency.quantile(0.5),
+                    'p99': stats.latency.quantile(0.99),
+                    'request_bytes': stats.request_bytes,
+                    'response_bytes': stats.response_bytes,
+                }
+                for key, stats in self._stats.items()
+            }
+
+    def soap_snapshot(self) -> Dict[str, dict]:
+        """
+        Сводка по SOAP операциям сервиса отслеживания.
+
+        :return: Словарь {операция: сводка} с количеством вызовов по результатам
+            (``ok``, ``fault``, ``api_error``, ``error``), оценками p50/p99 полного времени,
+            времени HTTP запроса и разбора ответа, объемом переданных данных
+        """
+        with self._lock:
+            return {
+                operation: {
+                    'count': stats.latency.count,
+                    'outcomes': dict(stats.outcomes),
+                    'total_time': stats.latency.sum,
+                    'transport_time': stats.transport.sum,
+                    'parse_time': stats.parse.sum,
+                    'p50': stats.latency.quantile(0.5),
+                    'p99': stats.latency.quantile(0.99),
+                    'transport_p50': stats.transport.quantile(0.5),
+                    'transport_p99': stats.transport.quantile(0.99),
+                    'parse_p50': stats.parse.quantile(0.5),
+                    'parse_p99': stats.parse.quantile(0.99),
+                    'request_bytes': stats.request_bytes,
+                    'response_bytes': stats.response_bytes,
+                }
+                for operation, stats in self._soap_stats.items()
+            }
+
+    def reset(self) -> None:
+        """Сброс накопленной статистики."""
+        with self._lock:
+            self._stats.clear()
+            self._soap_stats.clear()
+
+    @staticmethod
+    def _labels(**labels: str) -> str:
+        values = ','.join(
+            '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+            for name, value in labels.items()
+        )
+        return f'{{{values}}}'
+
+    def _render_histogram(self, lines: List[str], name: str, histogram: Histogram,
+                          **labels: str) -> None:
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{self._labels(**labels, le=repr(bound))} {cumulative}')
+        lines.append(f'{name}_bucket{self._labels(**labels, le="+Inf")} {histogram.count}')
+        lines.append(f'{name}_sum{self._labels(**labels)} {histogram.sum}')
+        lines.append(f'{name}_count{self._labels(**labels)} {histogram.count}')
+
+    def render_prometheus(self, prefix: str = 'pochta') -> str:
+        """
+        Статистика в текстовом формате Prometheus.
+
+        :param prefix: Префикс имен метрик
+        :return: Текст для отдачи на эндпоинте ``/metrics``
+        """
+        with self._lock:
+            endpoints = [
+                ({'method': method, 'endpoint': endpoint}, stats)
+                for (method, endpoint), stats in sorted(self._stats.items())
+            ]
+            operations = [
+                ({'operation': operation}, stats)
+                for operation, stats in sorted(self._soap_stats.items())
+            ]
+            # Строки одной метрики должны идти подряд сразу после ее строки TYPE
+            families = [
+                ('request_duration_seconds', 'histogram',
+                 [(labels, stats.latency) for labels, stats in endpoints]),
+                ('request_ttfb_seconds', 'histogram',
+                 [(labels, stats.ttfb) for labels, stats in endpoints]),
+                ('requests_total', 'counter', [
+                    ({**labels, 'status': status}, count)
+                    for labels, stats in endpoints
+                    for status, count in sorted(stats.statuses.items())
+                ]),
+                ('request_retries_total', 'counter',
+                 [(labels, stats.retries) for labels, stats in endpoints]),
+                ('request_bytes_total', 'counter',
+                 [(labels, stats.request_bytes) for labels, stats in endpoints]),
+                ('response_bytes_total', 'counter',
+                 [(labels, stats.response_bytes) for labels, stats in endpoints]),
+                ('soap_duration_seconds', 'histogram',
+                 [(labels, stats.latency) for labels, stats in operations]),
+                ('soap_transport_seconds', 'histogram',
+                 [(labels, stats.transport) for labels, stats in operations]),
+                ('soap_parse_seconds', 'histogram',
+                 [(labels, stats.parse) for labels, stats in operations]),
+                ('soap_calls_total', 'counter', [
+                    ({**labels, 'outcome': outcome}, count)
+                    for labels, stats in operations
+                    for outcome, count in sorted(stats.outcomes.items())
+                ]),
+                ('soap_request_bytes_total', 'counter',
+                 [(labels, stats.request_bytes) for labels, stats in operations]),
+                ('soap_response_bytes_total', 'counter',
+                 [(labels, stats.response_bytes) for labels, stats in operations]),
+            ]
+
+            lines = []
+            for name, kind, samples in families:
+                name = f'{prefix}_{name}'
+                lines.append(f'# TYPE {name} {kind}')
+                for labels, value in samples:
+                    if kind == 'histogram':
+                        self._render_histogram(lines, name, value, **labels)
+                    else:
+                        lines.append(f'{name}{self._labels(**labels)} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+class OpenTelemetrySink(MetricsSink):
+    """
+    Запись запросов и вызовов сервиса отслеживания в виде спанов OpenTelemetry.
+
+    Спан создается по завершении запроса с фактическими временем начала и окончания,
+    родителем становится текущий спан вызывающего кода.
+    Для работы требуется пакет ``opentelemetry-api``.
+    """
+
+    def __init__(self, tracer_provider=None, name: str = 'pochta') -> None:
+        """
+        Инициализация получателя.
+
+        :param tracer_provider: Провайдер трассировки (по умолчанию глобальный)
+        :param name: Имя инструментирующей библиотеки
+        """
+        if otel_trace is None:
+            raise ImportError('Для OpenTelemetrySink требуется установить пакет opentelemetry-api')
+        self.tracer = otel_trace.get_tracer(name, tracer_provider=tracer_provider)
+
+    def on_request(self, event: RequestEvent) -> None:
+        """Запись завершенного запроса к API Доставки."""
+        start_time = int(event.started_at * 1e9)
+        attributes = {
+            'http.request.method': event.method,
+            'url.path': event.path,
+            'url.template': event.endpoint,
+            'http.request.resend_count': event.retries,
+            'http.request.body.size': event.request_size,
+        }
+        if event.status is not None:
+            attributes['http.response.status_code'] = event.status
+        if event.response_size is not None:
+            attributes['http.response.body.size'] = event.response_size
+
+        span = self.tracer.start_span(
+            f'{event.method} {event.endpoint}',
+            kind=otel_trace.SpanKind.CLIENT,
+            attributes=attributes,
+            start_time=start_time,
+        )
+        if event.error is not None:
+            span.record_exception(event.error)
+            span.set_status(otel_trace.Status(otel_trace.StatusCode.ERROR, str(event.error)))
+        span.end(end_time=start_time + int(event.total_time * 1e9))
+
+    def on_soap_call(self, event: SoapEvent) -> None:
+        """Запись завершенного вызова метода сервиса отслеживания."""
+        start_time = int(event.started_at * 1e9)
+        attributes = {
+            'rpc.system': 'soap',
+            'rpc.method': event.operation,
+            'http.request.body.size': event.request_size,
+            'pochta.soap.outcome': event.outcome,
+            'pochta.soap.transport_time': event.transport_time,
+            'pochta.soap.parse_time': event.parse_time,
+        }
+        if event.status is not None:
+            attributes['http.response.status_code'] = event.status
+        if event.response_size is not None:
+            attributes['http.response.body.size'] = event.response_size
+        if event.fault_code is not None:
+            attributes['pochta.soap.fault_code'] = event.fault_code
+
+        span = self.tracer.start_span(
+            event.operation,
+            kind=otel_trace.SpanKind.CLIENT,
+            attributes=attributes,
+            start_time=start_time,
+        )
+        if event.error is not None:
+            span.record_exception(event.error)
+            span.set_status(otel_trace.Status(otel_trace.StatusCode.ERROR, str(event.error)))
+        span.end(end_time=start_time + int(event.total_time * 1e9))
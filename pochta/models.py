@@ -0,0 +1,226 @@
+from typing import Any, Iterable, List, Optional, Tuple, Type, TypeVar, Union
+
+from .utils import get_history_records, get_in
+
+
+M = TypeVar('M', bound='Model')
+Key = Union[str, Tuple[str, ...]]
+
+
+class Model:
+    """
+    Компактное представление ответа API.
+
+    В отличие от словаря, полученного из JSON, или объекта zeep, модель хранит
+    только перечисленные в :attr:`FIELDS` поля в слотах экземпляра. Остальные поля
+    ответа не копируются, а исходный словарь может быть освобожден. Преобразование
+    значений (например вложенных словарей) выполняется при обращении к свойствам модели.
+
+    Объявленные поля заполняются сразу в :meth:`from_raw`: в слоты копируются ссылки
+    на значения ответа, новые объекты при этом не создаются. Ленивое чтение полей
+    потребовало бы хранить в модели исходный ответ целиком, что лишает ее смысла
+    при хранении большого количества записей.
+
+    Для собственных моделей достаточно объявить :attr:`FIELDS` и ``__slots__``
+    с теми же именами атрибутов.
+    """
+
+    __slots__ = ()
+
+    #: Пары (атрибут, ключ в ответе API). Ключ может быть кортежем для вложенных значений
+    FIELDS: Tuple[Tuple[str, Key], ...] = ()
+
+    def __init__(self, **values: Any) -> None:
+        """
+        Инициализация модели.
+
+        :param values: Значения атрибутов, отсутствующие атрибуты равны None
+        """
+        for attr, _ in self.FIELDS:
+            setattr(self, attr, values.pop(attr, None))
+        if values:
+            raise TypeError(f'Unexpected fields: {", ".join(values)}')
+
+    @classmethod
+    def from_raw(cls: Type[M], raw: Any) -> M:
+        """
+        Создание модели из ответа API.
+
+        :param raw: Словарь из ответа API или объект zeep
+        :return: Модель
+        """
+        instance = cls.__new__(cls)
+        for attr, key in cls.FIELDS:
+            if isinstance(key, tuple):
+                value = get_in(raw, *key)
+            else:
+                value = raw.get(key)
+            setattr(instance, attr, value)
+        return instance
+
+    @classmethod
+    def from_list(cls: Type[M], items: Optional[Iterable[Any]]) -> List[M]:
+        """
+        Создание списка моделей из ответа API.
+
+        :param items: Список словарей из ответа API или объектов zeep
+        :return: Список моделей
+        """
+        return [cls.from_raw(item) for item in items or ()]
+
+    @property
+    def raw(self) -> dict:
+        """Представление модели в виде словаря с ключами ответа API (кроме вложенных)."""
+        return {
+            key: getattr(self, attr)
+            for attr, key in self.FIELDS
+            if not isinstance(key, tuple)
+        }
+
+    def __eq__(self, other: Any) -> bool:
+        """Сравнение моделей по значениям полей."""
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, attr) == getattr(other, attr) for attr, _ in self.FIELDS)
+
+    def __repr__(self) -> str:
+        """Строковое представление."""
+        values = ', '.join(
+            f'{attr}={getattr(self, attr)!r}' for attr, _ in self.FIELDS[:3]
+        )
+        return f'{type(self).__name__}({values}, ...)'
+
+
+class Shipment(Model):
+    """Заказ (отправление) из ответов методов заказов и партий."""
+
+    FIELDS = (
+        ('id', 'id'),
+        ('barcode', 'barcode'),
+        ('order_num', 'order-num'),
+        ('batch_name', 'batch-name'),
+        ('mail_type', 'mail-type'),
+        ('mail_category', 'mail-category'),
+        ('mass', 'mass'),
+        ('payment', 'payment'),
+        ('insurance_value', 'insr-value'),
+        ('total_rate_wo_vat', 'total-rate-wo-vat'),
+        ('total_vat', 'total-vat'),
+        ('index_to', 'index-to'),
+        ('region_to', 'region-to'),
+        ('place_to', 'place-to'),
+        ('recipient_name', 'recipient-name'),
+        ('tel_address', 'tel-address'),
+        ('postoffice_code', 'postoffice-code'),
+        ('human_operation_name', 'human-operation-name'),
+        ('last_oper_date', 'last-oper-date'),
+        ('version', 'version'),
+    )
+    __slots__ = tuple(attr for attr, _ in FIELDS)
+
+
+class Batch(Model):
+    """Партия из ответов методов партий."""
+
+    FIELDS = (
+        ('batch_name', 'batch-name'),
+        ('batch_status', 'batch-status'),
+        ('batch_status_date', 'batch-status-date'),
+        ('list_number', 'list-number'),
+        ('list_number_date', 'list-number-date'),
+        ('mail_type', 'mail-type'),
+        ('mail_category', 'mail-category'),
+        ('payment_method', 'payment-method'),
+        ('postoffice_code', 'postoffice-code'),
+        ('shipment_count', 'shipment-count'),
+        ('shipment_mass', 'shipment-mass'),
+        ('shipment_mass_rate', 'shipment-mass-rate'),
+    )
+    __slots__ = tuple(attr for attr, _ in FIELDS)
+
+
+class PostOffice(Model):
+    """Почтовое отделение из ответов методов поиска ОПС."""
+
+    FIELDS = (
+        ('postal_code', 'postal-code'),
+        ('type_code', 'type-code'),
+        ('region', 'region'),
+        ('district', 'district'),
+        ('settlement', 'settlement'),
+        ('address_source', 'address-source'),
+        ('latitude', 'latitude'),
+        ('longitude', 'longitude'),
+        ('is_closed', 'is-closed'),
+        ('is_temporary_closed', 'is-temporary-closed'),
+        ('working_hours', 'working-hours'),
+    )
+    __slots__ = tuple(attr for attr, _ in FIELDS)
+
+
+class Tariff(Model):
+    """Результат расчета стоимости доставки."""
+
+    FIELDS = (
+        ('total_rate', 'total-rate'),
+        ('total_vat', 'total-vat'),
+        ('delivery_time', 'delivery-time'),
+        ('avia_rate', 'avia-rate'),
+        ('ground_rate', 'ground-rate'),
+        ('insurance_rate', 'insurance-rate'),
+        ('fragile_rate', 'fragile-rate'),
+        ('notice_rate', 'notice-rate'),
+        ('oversize_rate', 'oversize-rate'),
+    )
+    __slots__ = tuple(attr for attr, _ in FIELDS)
+
+    @property
+    def total(self) -> Optional[int]:
+        """Полная стоимость доставки с НДС (копейки)."""
+        if self.total_rate is None:
+            return None
+        return self.total_rate + (self.total_vat or 0)
+
+    @property
+    def min_days(self) -> Optional[int]:
+        """Минимальный срок доставки (дни)."""
+        return get_in(self.delivery_time, 'min-days')
+
+    @property
+    def max_days(self) -> Optional[int]:
+        """Максимальный срок доставки (дни)."""
+        return get_in(self.delivery_time, 'max-days')
+
+
+class HistoryRecord(Model):
+    """Операция над отправлением из ответа :meth:`SingleTracker.get_history
+    <pochta.tracking.SingleTracker.get_history>`."""
+
+    FIELDS = (
+        ('barcode', ('ItemParameters', 'Barcode')),
+        ('oper_type_id', ('OperationParameters', 'OperType', 'Id')),
+        ('oper_type_name', ('OperationParameters', 'OperType', 'Name')),
+        ('oper_attr_id', ('OperationParameters', 'OperAttr', 'Id')),
+        ('oper_attr_name', ('OperationParameters', 'OperAttr', 'Name')),
+        ('oper_date', ('OperationParameters', 'OperDate')),
+        ('index', ('AddressParameters', 'OperationAddress', 'Index')),
+        ('description', ('AddressParameters', 'OperationAddress', 'Description')),
+        ('mass', ('ItemParameters', 'Mass')),
+    )
+    __slots__ = tuple(attr for attr, _ in FIELDS)
+
+    @classmethod
+    def from_history(cls, history: Any) -> List['HistoryRecord']:
+        """
+        Создание списка операций из ответа метода getOperationHistory.
+
+        :param history: Ответ :meth:`SingleTracker.get_history
+            <pochta.tracking.SingleTracker.get_history>`
+        :return: Список операций в хронологическом порядке
+        """
+        return cls.from_list(get_history_records(history))
+
+    @property
+    def raw(self) -> dict:
+        """Представление операции в виде словаря с именами атрибутов в качестве ключей."""
+        return {attr: getattr(self, attr) for attr, _ in self.FIELDS}
@@ -0,0 +1,212 @@
+from abc import ABC, abstractmethod
+import asyncio
+from fnmatch import fnmatchcase
+import json
+import os
+from threading import Lock
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+class RateLimit:
+    """Ограничение частоты запросов к группе эндпоинтов."""
+
+    def __init__(self, pattern: str, rate: float, burst: Optional[int] = None) -> None:
+        """
+        Инициализация ограничения.
+
+        :param pattern: Шаблон эндпоинта в формате fnmatch (например ``/1.0/clean/*``)
+        :param rate: Количество запросов в секунду
+        :param burst: Максимальное количество запросов подряд без ожидания
+            (по умолчанию равно ``rate``, но не меньше 1)
+        """
+        self.pattern = pattern
+        self.rate = rate
+        self.burst = burst if burst is not None else max(int(rate), 1)
+
+    def match(self, endpoint: str) -> bool:
+        """Относится ли эндпоинт к группе."""
+        return fnmatchcase(endpoint, self.pattern)
+
+
+class RateLimitBackend(ABC):
+    """
+    Хранилище состояния корзин токенов.
+
+    Для распределенного ограничения (например через Redis) достаточно реализовать
+    метод :meth:`take` атомарно на стороне хранилища. Асинхронные клиенты вызывают
+    :meth:`take_async`, который по умолчанию выполняет :meth:`take` в пуле потоков,
+    чтобы блокирующий ввод-вывод хранилища не останавливал цикл событий.
+    """
+
+    @abstractmethod
+    def take(self, key: str, rate: float, burst: int) -> float:
+        """
+        Попытка взять токен из корзины.
+
+        :param key: Идентификатор корзины
+        :param rate: Скорость пополнения корзины (токенов в секунду)
+        :param burst: Емкость корзины
+        :return: 0 если токен получен, иначе время в секундах до появления токена
+        """
+
+    async def take_async(self, key: str, rate: float, burst: int) -> float:
+        """
+        Асинхронная попытка взять токен из корзины.
+
+        :param key: Идентификатор корзины
+        :param rate: Скорость пополнения корзины (токенов в секунду)
+        :param burst: Емкость корзины
+        :return: 0 если токен получен, иначе время в секундах до появления токена
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.take, key, rate, burst)
+
+    @staticmethod
+    def _refill(state: Optional[Tuple[float, float]], rate: float, burst: int,
+                now: float) -> Tuple[float, float]:
+        if state is None:
+            return float(burst), now
+        tokens, updated = state
+        return min(burst, tokens + (now - updated) * rate), now
+
+    @staticmethod
+    def _consume(tokens: float, rate: float) -> Tuple[float, float]:
+        if tokens >= 1:
+            return tokens - 1, 0
+        return tokens, (1 - tokens) / rate
+
+
+class MemoryBackend(RateLimitBackend):
+    """Хранилище в памяти процесса, разделяемое между потоками."""
+
+    def __init__(self) -> None:
+        """Инициализация хранилища."""
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = Lock()
+
+    def take(self, key: str, rate: float, burst: int) -> float:
+        """Попытка взять токен из корзины."""
+        with self._lock:
+            tokens, now = self._refill(self._buckets.get(key), rate, burst, time.monotonic())
+            tokens, wait = self._consume(tokens, rate)
+            self._buckets[key] = (tokens, now)
+        return wait
+
+    async def take_async(self, key: str, rate: float, burst: int) -> float:
+        """Попытка взять токен из корзины без передачи в пул потоков."""
+        return self.take(key, rate, burst)
+
+
+class FileBackend(RateLimitBackend):
+    """
+    Хранилище в файле с блокировкой для нескольких процессов на одном хосте.
+
+    Состояние корзин хранится в JSON файле, доступ к которому синхронизируется
+    через ``fcntl.flock``. Доступно только в Unix системах.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Инициализация хранилища.
+
+        :param path: Путь к файлу состояния, общий для всех процессов
+        """
+        if fcntl is None:
+            raise RuntimeError('FileBackend доступен только в Unix системах')
+        self.path = path
+
+    def take(self, key: str, rate: float, burst: int) -> float:
+        """Попытка взять токен из корзины."""
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        with os.fdopen(fd, 'r+') as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                content = file.read()
+                buckets = json.loads(content) if content else {}
+                state = buckets.get(key)
+                # time.time(), так как monotonic не сопоставим между процессами
+                tokens, now = self._refill(
+                    tuple(state) if state else None, rate, burst, time.time(),
+                )
+                tokens, wait = self._consume(tokens, rate)
+                buckets[key] = (tokens, now)
+                file.seek(0)
+                file.truncate()
+                file.write(json.dumps(buckets))
+                file.flush()
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+        return wait
+
+
+class RateLimiter:
+    """
+    Ограничитель частоты запросов к API по алгоритму корзины токенов.
+
+    Для каждого запроса используется первое подходящее по шаблону ограничение,
+    запросы к эндпоинтам без подходящего ограничения не ограничиваются.
+    """
+
+    def __init__(self, limits: Iterable[RateLimit],
+                 backend: Optional[RateLimitBackend] = None,
+                 namespace: str = 'pochta') -> None:
+        """
+        Инициализация ограничителя.
+
+        :param limits: Список ограничений
+        :param backend: Хранилище состояния (по умолчанию в памяти процесса)
+        :param namespace: Префикс ключей корзин, например логин учетной записи
+        """
+        self.limits = list(limits)
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.namespace = namespace
+
+    def _find_limit(self, endpoint: str) -> Optional[RateLimit]:
+        for limit in self.limits:
+            if limit.match(endpoint):
+                return limit
+        return None
+
+    def _key(self, limit: RateLimit) -> str:
+        return f'{self.namespace}:{limit.pattern}'
+
+    def _take(self, limit: RateLimit) -> float:
+        return self.backend.take(self._key(limit), limit.rate, limit.burst)
+
+    async def _take_async(self, limit: RateLimit) -> float:
+        return await self.backend.take_async(self._key(limit), limit.rate, limit.burst)
+
+    def acquire(self, endpoint: str) -> None:
+        """
+        Ожидание разрешения на запрос к эндпоинту.
+
+        :param endpoint: Эндпоинт API
+        """
+        limit = self._find_limit(endpoint)
+        if limit is None:
+            return
+        wait = self._take(limit)
+        while wait > 0:
+            time.sleep(wait)
+            wait = self._take(limit)
+
+    async def acquire_async(self, endpoint: str) -> None:
+        """
+        Асинхронное ожидание разрешения на запрос к эндпоинту.
+
+        :param endpoint: Эндпоинт API
+        """
+        limit = self._find_limit(endpoint)
+        if limit is None:
+            return
+        wait = await self._take_async(limit)
+        while wait > 0:
+            await asyncio.sleep(wait)
+            wait = await self._take_async(limit)
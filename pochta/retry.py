@@ -0,0 +1,166 @@
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import random
+from threading import Lock
+from typing import Iterable, Optional
+
+from .utils import HTTPMethod
+
+
+class RetryBudget:
+    """
+    Бюджет повторных запросов.
+
+    Каждый исходный запрос пополняет бюджет на ``ratio`` единиц, каждый повтор
+    расходует одну единицу. Таким образом доля повторов в общем потоке запросов
+    не превышает ``ratio`` и при массовом отказе сервиса клиенты не усиливают
+    нагрузку на него. Объект потокобезопасен и может разделяться несколькими клиентами.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_balance: float = 10, max_balance: float = 100):
+        """
+        Инициализация бюджета повторов.
+
+        :param ratio: Доля повторов относительно количества запросов
+        :param min_balance: Начальный баланс, позволяющий повторы при малом количестве запросов
+        :param max_balance: Максимальный накапливаемый баланс
+        """
+        self.ratio = ratio
+        self.max_balance = max_balance
+        self._balance = min_balance
+        self._lock = Lock()
+
+    def deposit(self) -> None:
+        """Учет исходного запроса."""
+        with self._lock:
+            self._balance = min(self._balance + self.ratio, self.max_balance)
+
+    def withdraw(self) -> bool:
+        """
+        Попытка списать единицу бюджета на повтор.
+
+        :return: Разрешен ли повтор
+        """
+        with self._lock:
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+
+class RetryPolicy:
+    """
+    Политика повторных запросов к API.
+
+    Повторяются ответы с временными ошибками (по умолчанию 429, 502, 503, 504)
+    и сетевые ошибки. Запросы неидемпотентными методами (POST) повторяются
+    только при ответе 429, так как в этом случае запрос гарантированно
+    не был обработан сервером. Так же обрабатываются запросы, для которых
+    клиент передал ``idempotent=False``, например создание заказов (PUT).
+
+    Задержка перед повтором вычисляется по схеме экспоненциального роста
+    с ограничением и полным джиттером, либо берется из заголовка Retry-After.
+    """
+
+    IDEMPOTENT_METHODS = frozenset(
+        method.value for method in (HTTPMethod.GET, HTTPMethod.PUT, HTTPMethod.DELETE)
+    )
+    RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+    def __init__(self, total: int = 3,
+                 backoff_factor: float = 0.5,
+                 backoff_max: float = 30,
+                 statuses: Optional[Iterable[int]] = None,
+                 methods: Optional[Iterable[str]] = None,
+                 respect_retry_after: bool = True,
+                 retry_after_max: float = 120,
+                 budget: Optional[RetryBudget] = None) -> None:
+        """
+        Инициализация политики повторов.
+
+        :param total: Максимальное количество повторов одного запроса
+        :param backoff_factor: Базовая задержка (секунды), удваивается с каждым повтором
+        :param backoff_max: Максимальная задержка между повторами (секунды)
+        :param statuses: HTTP статусы, при которых запрос повторяется
+        :param methods: HTTP методы, запросы которыми считаются идемпотентными
+        :param respect_retry_after: Учитывать заголовок Retry-After
+        :param retry_after_max: Максимальное значение Retry-After (секунды),
+            при превышении которого запрос не повторяется
+        :param budget: Бюджет повторов, может разделяться несколькими клиентами
+        """
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.statuses = frozenset(statuses) if statuses is not None else self.RETRY_STATUSES
+        self.methods = (
+            frozenset(method.lower() for method in methods)
+            if methods is not None else self.IDEMPOTENT_METHODS
+        )
+        self.respect_retry_after = respect_retry_after
+        self.retry_after_max = retry_after_max
+        self.budget = budget if budget is not None else RetryBudget()
+
+    def on_request(self) -> None:
+        """Учет исходного запроса в бюджете повторов."""
+        self.budget.deposit()
+
+    def is_idempotent(self, method: str) -> bool:
+        """Является ли метод идемпотентным."""
+        return method.lower() in self.methods
+
+    def can_retry(self, method: str, attempt: int, status: Optional[int] = None,
+                  idempotent: Optional[bool] = None) -> bool:
+        """
+        Проверка возможности повтора запроса.
+
+        :param method: HTTP метод
+        :param attempt: Количество уже выполненных повторов
+        :param status: HTTP статус ответа, либо None при сетевой ошибке
+        :param idempotent: Идемпотентен ли запрос (по умолчанию определяется по методу)
+        :return: Следует ли повторить запрос
+        """
+        if attempt >= self.total:
+            return False
+        if status is not None and status not in self.statuses:
+            return False
+        if idempotent is None:
+            idempotent = self.is_idempotent(method)
+        if status != 429 and not idempotent:
+            return False
+        return self.budget.withdraw()
+
+    def get_delay(self, attempt: int, retry_after: Optional[str] = None) -> Optional[float]:
+        """
+        Вычисление задержки перед повтором.
+
+        :param attempt: Количество уже выполненных повторов
+        :param retry_after: Значение заголовка Retry-After
+        :return: Задержка в секундах, либо None если повтор выполнять не следует
+        """
+        if retry_after and self.respect_retry_after:
+            delay = self.parse_retry_after(retry_after)
+            if delay is not None:
+                return delay if delay <= self.retry_after_max else None
+
+        return random.uniform(0, min(self.backoff_max, self.backoff_factor * 2 ** attempt))
+
+    @staticmethod
+    def parse_retry_after(value: str) -> Optional[float]:
+        """
+        Разбор заголовка Retry-After.
+
+        :param value: Количество секунд или дата в формате HTTP-date
+        :return: Задержка в секундах
+        """
+        try:
+            return max(float(value), 0)
+        except ValueError:
+            pass
+
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0)
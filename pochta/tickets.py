@@ -0,0 +1,270 @@
+from abc import ABC, abstractmethod
+from enum import Enum
+import json
+import os
+import sqlite3
+from threading import Lock
+from typing import Dict, List, Optional
+
+
+class TicketState(str, Enum):
+    PENDING = 'pending'
+    DONE = 'done'
+    FAILED = 'failed'
+
+
+class TrackingTicket:
+    """Билет пакетной обработки запросов трекинга."""
+
+    def __init__(self, ticket: str, barcodes: List[str], issued_at: float,
+                 next_poll_at: float,
+                 attempts: int = 0,
+                 state: TicketState = TicketState.PENDING,
+                 error: Optional[str] = None) -> None:
+        """
+        Инициализация билета.
+
+        :param ticket: Номер билета, полученный от getTicket
+        :param barcodes: Идентификаторы отправлений, переданные в getTicket
+        :param issued_at: Время выдачи билета (unix timestamp)
+        :param next_poll_at: Время следующего обращения за ответом (unix timestamp)
+        :param attempts: Количество выполненных обращений за ответом
+        :param state: Состояние билета
+        :param error: Текст последней ошибки
+        """
+        self.ticket = ticket
+        self.barcodes = barcodes
+        self.issued_at = issued_at
+        self.next_poll_at = next_poll_at
+        self.attempts = attempts
+        self.state = TicketState(state)
+        self.error = error
+
+    @property
+    def raw(self) -> dict:
+        """Представление билета для сохранения в хранилище."""
+        return {
+            'ticket': self.ticket,
+            'barcodes': self.barcodes,
+            'issued_at': self.issued_at,
+            'next_poll_at': self.next_poll_at,
+            'attempts': self.attempts,
+            'state': self.state.value,
+            'error': self.error,
+        }
+
+    @classmethod
+    def from_raw(cls, raw: dict) -> 'TrackingTicket':
+        """
+        Восстановление билета из хранилища.
+
+        :param raw: Словарь, полученный из :attr:`raw`
+        :return: Билет
+        """
+        return cls(**raw)
+
+    def __repr__(self) -> str:
+        """Строковое представление."""
+        return (f'TrackingTicket(ticket={self.ticket!r}, barcodes={len(self.barcodes)}, '
+                f'state={self.state.value!r}, attempts={self.attempts})')
+
+
+class TicketStore(ABC):
+    """Хранилище билетов пакетной обработки."""
+
+    @abstractmethod
+    def add(self, ticket: TrackingTicket) -> None:
+        """
+        Сохранение нового билета.
+
+        :param ticket: Билет
+        """
+
+    @abstractmethod
+    def update(self, ticket: TrackingTicket) -> None:
+        """
+        Сохранение изменений билета (обращения за ответом, состояние).
+
+        :param ticket: Билет
+        """
+
+    @abstractmethod
+    def pending(self) -> List[TrackingTicket]:
+        """Список билетов, ответ по которым еще не получен."""
+
+
+class MemoryTicketStore(TicketStore):
+    """
+    Хранилище билетов в памяти процесса.
+
+    Используется :meth:`BatchTracker.track_many <pochta.tracking.BatchTracker.track_many>`
+    по умолчанию. Билеты теряются при ошибке или перезапуске процесса.
+    """
+
+    def __init__(self) -> None:
+        """Инициализация хранилища."""
+        self._tickets: Dict[str, TrackingTicket] = {}
+        self._lock = Lock()
+
+    def add(self, ticket: TrackingTicket) -> None:
+        """Сохранение нового билета."""
+        with self._lock:
+            self._tickets[ticket.ticket] = ticket
+
+    def update(self, ticket: TrackingTicket) -> None:
+        """Сохранение изменений билета."""
+        with self._lock:
+            self._tickets[ticket.ticket] = ticket
+
+    def pending(self) -> List[TrackingTicket]:
+        """Список билетов, ответ по которым еще не получен."""
+        with self._lock:
+            return [
+                ticket for ticket in self._tickets.values()
+                if ticket.state == TicketState.PENDING
+            ]
+
+
+class SQLiteTicketStore(TicketStore):
+    """
+    Хранилище билетов в базе SQLite.
+
+    Билеты сохраняются между перезапусками процесса, что позволяет продолжить
+    обращение за ответами по уже выданным билетам.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Инициализация хранилища.
+
+        :param path: Путь к файлу базы данных
+        """
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS tickets ('
+            'ticket TEXT PRIMARY KEY, barcodes TEXT NOT NULL, issued_at REAL NOT NULL, '
+            'next_poll_at REAL NOT NULL, attempts INTEGER NOT NULL, state TEXT NOT NULL, '
+            'error TEXT)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS tickets_state ON tickets (state)')
+
+    def _save(self, ticket: TrackingTicket) -> None:
+        raw = ticket.raw
+        raw['barcodes'] = json.dumps(raw['barcodes'])
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO tickets '
+                '(ticket, barcodes, issued_at, next_poll_at, attempts, state, error) '
+                'VALUES (:ticket, :barcodes, :issued_at, :next_poll_at, :attempts, :state, :error)',
+                raw,
+            )
+
+    def add(self, ticket: TrackingTicket) -> None:
+        """Сохранение нового билета."""
+        self._save(ticket)
+
+    def update(self, ticket: TrackingTicket) -> None:
+        """Сохранение изменений билета."""
+        self._save(ticket)
+
+    def pending(self) -> List[TrackingTicket]:
+        """Список билетов, ответ по которым еще не получен."""
+        with self._lock:
+            cursor = self._conn.execute(
+                'SELECT ticket, barcodes, issued_at, next_poll_at, attempts, state, error '
+                'FROM tickets WHERE state = ?',
+                (TicketState.PENDING.value,),
+            )
+            columns = [column[0] for column in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        for row in rows:
+            row['barcodes'] = json.loads(row['barcodes'])
+        return [TrackingTicket.from_raw(row) for row in rows]
+
+
+class JournalTicketStore(TicketStore):
+    """
+    Хранилище билетов в виде журнала в текстовом файле.
+
+    Каждое изменение билета дописывается в конец файла отдельной JSON строкой,
+    при открытии журнала актуальное состояние билетов восстанавливается по последним
+    записям. Для уменьшения размера файла используйте :meth:`compact`.
+    """
+
+    def __init__(self, path: str, fsync: bool = False) -> None:
+        """
+        Инициализация хранилища.
+
+        :param path: Путь к файлу журнала
+        :param fsync: Сбрасывать каждую запись на диск (надежнее, но медленнее)
+        """
+        self.path = path
+        self.fsync = fsync
+        self._lock = Lock()
+        self._tickets: Dict[str, TrackingTicket] = {}
+
+        complete = True
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as journal:
+                for line in journal:
+                    complete = line.endswith('\n')
+                    try:
+                        ticket = TrackingTicket.from_raw(json.loads(line))
+                    except (ValueError, TypeError):
+                        # Пустая или недописанная при аварийном завершении строка
+                        continue
+                    self._tickets[ticket.ticket] = ticket
+
+        self._journal = open(path, 'a', encoding='utf-8')
+        if not complete:
+            self._journal.write('\n')
+
+    def _append(self, ticket: TrackingTicket) -> None:
+        with self._lock:
+            self._tickets[ticket.ticket] = ticket
+            self._journal.write(json.dumps(ticket.raw) + '\n')
+            self._journal.flush()
+            if self.fsync:
+                os.fsync(self._journal.fileno())
+
+    def add(self, ticket: TrackingTicket) -> None:
+        """Сохранение нового билета."""
+        self._append(ticket)
+
+    def update(self, ticket: TrackingTicket) -> None:
+        """Сохранение изменений билета."""
+        self._append(ticket)
+
+    def pending(self) -> List[TrackingTicket]:
+        """Список билетов, ответ по которым еще не получен."""
+        with self._lock:
+            return [
+                ticket for ticket in self._tickets.values()
+                if ticket.state == TicketState.PENDING
+            ]
+
+    def compact(self, keep_completed: bool = False) -> None:
+        """
+        Перезапись журнала только с актуальным состоянием билетов.
+
+        :param keep_completed: Сохранять завершенные билеты
+        """
+        with self._lock:
+            tickets = [
+                ticket for ticket in self._tickets.values()
+                if keep_completed or ticket.state == TicketState.PENDING
+            ]
+            tmp_path = f'{self.path}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as journal:
+                for ticket in tickets:
+                    journal.write(json.dumps(ticket.raw) + '\n')
+            self._journal.close()
+            os.replace(tmp_path, self.path)
+            self._tickets = {ticket.ticket: ticket for ticket in tickets}
+            self._journal = open(self.path, 'a', encoding='utf-8')
+
+    def close(self) -> None:
+        """Закрытие файла журнала."""
+        self._journal.close()
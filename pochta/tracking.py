@@ -1,9 +1,91 @@
 from abc import ABC
-from typing import List
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextvars import ContextVar
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from boltons.iterutils import chunked
+from requests import Session
+from requests.adapters import HTTPAdapter
+from zeep import AsyncClient, Client, Settings
+from zeep.cache import SqliteCache
+from zeep.exceptions import Fault
+from zeep.transports import AsyncTransport, Transport
+from zeep.wsdl import Document
+from zeep.wsdl.utils import etree_to_string
+
+from .cache import CacheBackend, MemoryCache
+from .exceptions import APIError
+from .metrics import MetricsSink, SoapEvent
+from .tickets import MemoryTicketStore, TicketState, TicketStore, TrackingTicket
+from .utils import get_history_records, get_in
+from .wsdl import WSDLCache
 
-from zeep import CachingClient, Client, Settings
 
-from .exceptions import APIError
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+# Событие выполняемого вызова метода сервиса, дополняемое транспортом
+_soap_event: ContextVar[Optional[SoapEvent]] = ContextVar('pochta_soap_event', default=None)
+
+
+class _InstrumentedTransport:
+    """Обертка транспорта zeep с замером сериализации запроса и HTTP обмена."""
+
+    def __init__(self, transport: Transport) -> None:
+        self.transport = transport
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.transport, name)
+
+    @staticmethod
+    def _serialize(envelope: Any, event: SoapEvent) -> bytes:
+        started = time.perf_counter()
+        message = etree_to_string(envelope)
+        event.serialize_time = time.perf_counter() - started
+        event.request_size = len(message)
+        return message
+
+    def post_xml(self, address: str, envelope: Any, headers: dict) -> Any:
+        event = _soap_event.get()
+        if event is None:
+            return self.transport.post_xml(address, envelope, headers)
+
+        message = self._serialize(envelope, event)
+        started = time.perf_counter()
+        try:
+            response = self.transport.post(address, message, headers)
+        finally:
+            event.transport_time = time.perf_counter() - started
+        event.status = response.status_code
+        event.response_size = len(response.content)
+        return response
+
+
+class _AsyncInstrumentedTransport(_InstrumentedTransport):
+    """Обертка асинхронного транспорта zeep с замером сериализации запроса и HTTP обмена."""
+
+    async def post_xml(self, address: str, envelope: Any, headers: dict) -> Any:
+        event = _soap_event.get()
+        if event is None:
+            return await self.transport.post_xml(address, envelope, headers)
+
+        message = self._serialize(envelope, event)
+        started = time.perf_counter()
+        try:
+            response = await self.transport.post(address, message, headers)
+        finally:
+            event.transport_time = time.perf_counter() - started
+        event.status = response.status_code
+        event.response_size = len(response.content)
+        return self.transport.new_response(response)
 
 
 class _BaseClient(ABC):
@@ -13,23 +95,108 @@ class _BaseClient(ABC):
     """
 
     WSDL = ''
+    CLIENT_CLASS = Client
+    INSTRUMENTED_TRANSPORT_CLASS = _InstrumentedTransport
 
-    def __init__(self, login: str, password: str, caching=True):
+    # Разобранные WSDL документы, общие для клиентов процесса с кэшем WSDL на диске
+    _documents: Dict[Tuple[str, str], Document] = {}
+    _documents_lock = threading.Lock()
+
+    def __init__(self, login: str, password: str, caching=True,
+                 transport: Optional[Transport] = None,
+                 wsdl_cache: Optional[str] = None,
+                 metrics: Optional[MetricsSink] = None):
         """Инициализация API клиента сервиса отслеживания посылок.
 
         :param login: Логин от системы трекинга
         :param password: Пароль от системы трекинга
         :param caching: Флаг, позволяющий отключить кэширование в zeep
+        :param transport: Транспорт zeep (при указании кэширование настраивается в нем)
+        :param wsdl_cache: Директория для хранения WSDL и XSD документов
+            (см. :class:`WSDLCache <pochta.wsdl.WSDLCache>`). Разобранное описание сервиса
+            при этом используется повторно всеми клиентами процесса
+        :param metrics: Получатель метрик вызовов методов сервиса
+            (см. :mod:`pochta.metrics`). По умолчанию метрики не собираются
         """
         self._login = login
         self._password = password
+        self.metrics = metrics
 
-        zeep_client = CachingClient if caching else Client
+        if transport is None:
+            transport = self.build_transport(caching, wsdl_cache)
+        settings = Settings(strict=False)
 
-        self._client = zeep_client(
-            self.WSDL,
-            settings=Settings(strict=False),
-        )
+        wsdl = self.WSDL
+        if wsdl_cache is not None:
+            wsdl = self._load_document(os.path.abspath(wsdl_cache), transport, settings)
+
+        if metrics is not None:
+            transport = self.INSTRUMENTED_TRANSPORT_CLASS(transport)
+        self._client = self.CLIENT_CLASS(wsdl, transport=transport, settings=settings)
+
+    @staticmethod
+    def build_transport(caching: bool = True,
+                        wsdl_cache: Optional[str] = None,
+                        session: Optional[Session] = None) -> Transport:
+        """
+        Создание транспорта zeep.
+
+        :param caching: Кэшировать WSDL документы в SQLite кэше zeep
+        :param wsdl_cache: Директория кэша WSDL документов (имеет приоритет над ``caching``)
+        :param session: Сессия requests
+        :return: Транспорт zeep
+        """
+        if wsdl_cache is not None:
+            cache = WSDLCache(wsdl_cache)
+        elif caching:
+            cache = SqliteCache()
+        else:
+            cache = None
+        return Transport(cache=cache, session=session)
+
+    def _load_document(self, wsdl_cache: str, transport: Transport,
+                       settings: Settings) -> Document:
+        key = (self.WSDL, wsdl_cache)
+        with self._documents_lock:
+            document = self._documents.get(key)
+            if document is None:
+                document = self._documents[key] = Document(self.WSDL, transport, settings=settings)
+        return document
+
+    @staticmethod
+    def _record_error(event: SoapEvent, error: Exception) -> None:
+        event.error = error
+        if isinstance(error, Fault):
+            event.fault_code = error.code or ''
+
+    def _call(self, operation: str, convert: Optional[Callable[[Any], Any]] = None,
+              **kwargs) -> Any:
+        """
+        Вызов метода сервиса с учетом метрик.
+
+        :param operation: Имя SOAP операции
+        :param convert: Функция обработки ответа (ее ошибки, например APIError,
+            учитываются в метриках вызова)
+        :param kwargs: Аргументы операции
+        :return: Ответ метода, обработанный функцией ``convert``
+        """
+        if self.metrics is None:
+            response = getattr(self._client.service, operation)(**kwargs)
+            return convert(response) if convert is not None else response
+
+        event = SoapEvent(operation)
+        token = _soap_event.set(event)
+        started = time.perf_counter()
+        try:
+            response = getattr(self._client.service, operation)(**kwargs)
+            return convert(response) if convert is not None else response
+        except Exception as exc:
+            self._record_error(event, exc)
+            raise
+        finally:
+            event.total_time = time.perf_counter() - started
+            _soap_event.reset(token)
+            self.metrics.on_soap_call(event)
 
 
 class SingleTracker(_BaseClient):
@@ -55,7 +222,8 @@ class SingleTracker(_BaseClient):
             отправлением. Если над отправлением еще не зарегистрировано ни одной
             операции, то возвращается пустой список элементов historyRecord.
         """
-        return self._client.service.getOperationHistory(
+        return self._call(
+            'getOperationHistory',
             OperationHistoryRequest={
                 'Barcode': barcode,
                 'MessageType': '0'
@@ -80,7 +248,8 @@ class SingleTracker(_BaseClient):
             - международный, состоящий из 13 символов (буквенно-цифровой) в формате S10.
         :return: Список событий
         """
-        return self._client.service.PostalOrderEventsForMail(
+        return self._call(
+            'PostalOrderEventsForMail',
             PostalOrderEventsForMailInput={
                 'Barcode': barcode,
             },
@@ -91,11 +260,96 @@ class SingleTracker(_BaseClient):
         )
 
 
+class ParallelSingleTracker(SingleTracker):
+    """
+    Клиент API единичной обработки запросов для параллельного использования из нескольких потоков.
+
+    Каждый поток получает собственный клиент zeep. Клиенты используют общее
+    разобранное описание WSDL и общий транспорт с пулом HTTP соединений,
+    поэтому создание клиента для потока не требует повторной загрузки WSDL.
+    """
+
+    def __init__(self, login: str, password: str, caching=True, workers: int = 8,
+                 wsdl_cache: Optional[str] = None,
+                 metrics: Optional[MetricsSink] = None):
+        """
+        Инициализация клиента.
+
+        :param login: Логин от системы трекинга
+        :param password: Пароль от системы трекинга
+        :param caching: Флаг, позволяющий отключить кэширование в zeep
+        :param workers: Количество одновременных запросов по умолчанию и размер пула соединений
+        :param wsdl_cache: Директория для хранения WSDL и XSD документов
+        :param metrics: Получатель метрик вызовов методов сервиса
+        """
+        self.workers = workers
+        self._local = threading.local()
+
+        session = Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        transport = self.build_transport(caching, wsdl_cache, session)
+
+        super().__init__(login, password, caching, transport, wsdl_cache, metrics)
+
+    @property
+    def _client(self) -> Client:
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = Client(
+                self._document_client.wsdl,
+                transport=self._document_client.transport,
+                settings=self._document_client.settings,
+            )
+        return client
+
+    @_client.setter
+    def _client(self, client: Client) -> None:
+        self._document_client = client
+
+    def get_histories(self, barcodes: Iterable[str],
+                      workers: Optional[int] = None,
+                      ) -> Iterator[Tuple[str, Optional[dict], Optional[Exception]]]:
+        """
+        Параллельное получение историй операций над отправлениями.
+
+        Ошибка запроса по одному отправлению не прерывает обработку остальных.
+
+        :param barcodes: Идентификаторы отправлений
+        :param workers: Максимальное количество одновременных запросов
+            (по умолчанию ``self.workers``)
+        :return: Итератор по результатам в порядке их готовности: кортежи
+            (идентификатор, ответ :meth:`get_history` или None, исключение или None)
+        """
+        with ThreadPoolExecutor(max_workers=workers or self.workers) as executor:
+            futures = {
+                executor.submit(self.get_history, barcode): barcode
+                for barcode in dict.fromkeys(barcodes)
+            }
+            try:
+                for future in as_completed(futures):
+                    history, error = None, None
+                    try:
+                        history = future.result()
+                    except Exception as exc:  # pylint: disable=broad-except
+                        error = exc
+                    yield futures[future], history, error
+            finally:
+                # При досрочном завершении итерации не выполнять оставшиеся запросы
+                for future in futures:
+                    future.cancel()
+
+
 class BatchTracker(_BaseClient):
     """Клиент для взаимодеействия с API пакетной обработки запросов."""
 
     WSDL = 'https://tracking.russianpost.ru/fc?wsdl'
 
+    MAX_BARCODES = 3000
+    POLL_INTERVAL = 15 * 60
+    TICKET_TTL = 32 * 60 * 60
+
     def get_ticket(self, barcodes: List[str]) -> str:
         """Получения билета на подготовку информации по списку идентификаторов отправлений.
 
@@ -122,26 +376,15 @@ class BatchTracker(_BaseClient):
             ticketResponse в случае успешного запроса, функция возвращает номер созданного ticket,
             полученного из ticketResponse.value
         """
-        # По умолчанию zeep генерирует Request старой версии,
-        # где запрос отправляется в виде файла с метаданными
-        # Поэтому, вручную создаём объект Request  и убираем аттрибуты, относящиеся к файлу
-        request = self._client.get_type('{http://fclient.russianpost.org}file')
-        request.attributes.clear()
-
-        items = [{'Barcode': barcode} for barcode in barcodes]
-
-        response = self._client.service.getTicket(
-            request=request(Item=items),
+        return self._call(
+            'getTicket',
+            self._get_value,
+            request=self._build_ticket_request(barcodes),
             login=self._login,
             password=self._password,
             language='RUS',
         )
 
-        if response['error'] is not None:
-            raise APIError(f'Response body contains error: {response["error"]}')
-
-        return response['value']
-
     def get_response_by_ticket(self, ticket: str) -> List[dict]:
         """Метод используется для получения информации об отправлениях по ранее полученному билету.
 
@@ -154,13 +397,531 @@ class BatchTracker(_BaseClient):
         :return: Результаты пакетной обработки в виде списка словарей,
             содержащих результаты выполнения запроса на пакетную обработку
         """
-        response = self._client.service.getResponseByTicket(
+        return self._call(
+            'getResponseByTicket',
+            self._get_items,
             ticket=ticket,
             login=self._login,
             password=self._password,
         )
 
+    def _build_ticket_request(self, barcodes: List[str]) -> Any:
+        # По умолчанию zeep генерирует Request старой версии,
+        # где запрос отправляется в виде файла с метаданными
+        # Поэтому, вручную создаём объект Request  и убираем аттрибуты, относящиеся к файлу
+        request = self._client.get_type('{http://fclient.russianpost.org}file')
+        request.attributes.clear()
+
+        items = [{'Barcode': barcode} for barcode in barcodes]
+        return request(Item=items)
+
+    @staticmethod
+    def _get_value(response: Any) -> Any:
         if response['error'] is not None:
             raise APIError(f'Response body contains error: {response["error"]}')
 
-        return response['value']['Item']
+        return response['value']
+
+    @classmethod
+    def _get_items(cls, response: Any) -> List[Any]:
+        return cls._get_value(response)['Item']
+
+    def track_many(self, barcodes: Iterable[str] = (),
+                   store: Optional[TicketStore] = None,
+                   workers: int = 4) -> Iterator[Tuple[TrackingTicket, Optional[List[dict]]]]:
+        """
+        Пакетное отслеживание произвольного количества отправлений.
+
+        Разбивает идентификаторы на части не более :attr:`MAX_BARCODES` штук
+        и параллельно (не более ``workers`` одновременных запросов) получает по ним билеты.
+        Затем обращается за ответами с соблюдением ограничений сервиса: первое обращение
+        не ранее чем через :attr:`POLL_INTERVAL` секунд после выдачи билета,
+        повторные - не чаще одного раза в :attr:`POLL_INTERVAL` секунд.
+        Билеты, ответ по которым не получен за :attr:`TICKET_TTL` секунд,
+        переводятся в состояние ``failed``.
+
+        Перед выдачей новых билетов обрабатываются незавершенные билеты из ``store``,
+        поэтому при использовании постоянного хранилища отслеживание можно продолжить
+        после перезапуска процесса, вызвав метод без идентификаторов. Хранилище
+        по умолчанию находится в памяти процесса: при ошибке или перезапуске уже
+        выданные билеты теряются. Для их сохранения передайте постоянное хранилище,
+        например :class:`SQLiteTicketStore <pochta.tickets.SQLiteTicketStore>`.
+
+        Завершенный билет сохраняется в хранилище после того, как его результат
+        обработан вызывающим кодом (при запросе следующего элемента итератора).
+        Если обработка прервана исключением, после перезапуска за ответом по билету
+        обратятся повторно.
+
+        :param barcodes: Идентификаторы отправлений
+        :param store: Хранилище билетов (по умолчанию :class:`MemoryTicketStore
+            <pochta.tickets.MemoryTicketStore>`, билеты не сохраняются между запусками)
+        :param workers: Максимальное количество одновременных запросов
+        :return: Итератор по завершенным билетам в порядке их готовности:
+            пары (билет, результат :meth:`get_response_by_ticket`).
+            Для билетов в состоянии ``failed`` результат равен None,
+            а текст ошибки находится в ``ticket.error``
+        """
+        store = store if store is not None else MemoryTicketStore()
+        chunks = chunked(list(dict.fromkeys(barcodes)), self.MAX_BARCODES)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            self._issue_tickets(executor, chunks, store)
+
+            while True:
+                pending = store.pending()
+                if not pending:
+                    return
+
+                now = time.time()
+                due = [ticket for ticket in pending if ticket.next_poll_at <= now]
+                if not due:
+                    time.sleep(min(ticket.next_poll_at for ticket in pending) - now)
+                    continue
+
+                futures = {executor.submit(self._poll_ticket, ticket): ticket for ticket in due}
+                for future in as_completed(futures):
+                    ticket = futures[future]
+                    result = future.result()
+                    if ticket.state == TicketState.PENDING:
+                        store.update(ticket)
+                        continue
+                    yield ticket, result
+                    store.update(ticket)
+
+    def _issue_tickets(self, executor: ThreadPoolExecutor, chunks: List[List[str]],
+                       store: TicketStore) -> None:
+        futures = {executor.submit(self.get_ticket, chunk): chunk for chunk in chunks}
+        error = None
+        for future in as_completed(futures):
+            try:
+                ticket = future.result()
+            except Exception as exc:  # pylint: disable=broad-except
+                error = error or exc
+                continue
+            self._add_ticket(store, ticket, futures[future])
+        # Полученные билеты уже сохранены и будут обработаны при следующем вызове
+        if error is not None:
+            raise error
+
+    def _add_ticket(self, store: TicketStore, ticket: str, barcodes: List[str]) -> None:
+        issued_at = time.time()
+        store.add(TrackingTicket(
+            ticket=ticket,
+            barcodes=barcodes,
+            issued_at=issued_at,
+            next_poll_at=issued_at + self.POLL_INTERVAL,
+        ))
+
+    def _reschedule_ticket(self, ticket: TrackingTicket, error: Exception) -> None:
+        ticket.error = str(error)
+        ticket.next_poll_at = time.time() + self.POLL_INTERVAL
+        if ticket.next_poll_at > ticket.issued_at + self.TICKET_TTL:
+            ticket.state = TicketState.FAILED
+
+    def _poll_ticket(self, ticket: TrackingTicket) -> Optional[List[dict]]:
+        ticket.attempts += 1
+        try:
+            result = self.get_response_by_ticket(ticket.ticket)
+        except Exception as exc:  # pylint: disable=broad-except
+            self._reschedule_ticket(ticket, exc)
+            return None
+
+        ticket.error = None
+        ticket.state = TicketState.DONE
+        return result
+
+
+class IncrementalTracker:
+    """
+    Инкрементальное отслеживание отправлений через API единичной обработки запросов.
+
+    Для каждого отправления хранится последняя полученная операция, поэтому
+    при очередном опросе возвращаются только новые операции. Отправления,
+    последняя операция над которыми относится к :attr:`TERMINAL_OPERATION_TYPES`
+    (вручение адресату или отправителю при возврате, уничтожение и т.п.),
+    больше не запрашиваются.
+
+    Состояние хранится в :class:`CacheBackend <pochta.cache.CacheBackend>`. Для сохранения
+    состояния между перезапусками процесса используйте
+    :class:`SQLiteCache <pochta.cache.SQLiteCache>` с ``maxsize=None``. Хранилище
+    не должно вытеснять записи раньше ``state_ttl``: отправление без сохраненного
+    состояния считается новым, его история возвращается целиком, а врученные
+    отправления снова запрашиваются.
+    """
+
+    # Вручение, уничтожение, оформление в собственность, регистрация утраты
+    TERMINAL_OPERATION_TYPES = frozenset({2, 16, 17, 18})
+    STATE_TTL = 180 * 24 * 60 * 60
+
+    def __init__(self, tracker: SingleTracker,
+                 state: Optional[CacheBackend] = None,
+                 terminal_types: Optional[Iterable[int]] = None,
+                 state_ttl: Optional[float] = None) -> None:
+        """
+        Инициализация инкрементального отслеживания.
+
+        :param tracker: Клиент API единичной обработки запросов
+        :param state: Хранилище состояния отправлений без вытеснения записей
+            (по умолчанию :class:`MemoryCache <pochta.cache.MemoryCache>` без ограничения размера)
+        :param terminal_types: Идентификаторы типов операций, после которых
+            отправление больше не запрашивается
+        :param state_ttl: Время хранения состояния отправления в секундах
+            (по умолчанию :attr:`STATE_TTL`, 180 дней)
+        """
+        self.tracker = tracker
+        self.state = state if state is not None else MemoryCache(maxsize=None)
+        self.terminal_types = (
+            frozenset(terminal_types) if terminal_types is not None
+            else self.TERMINAL_OPERATION_TYPES
+        )
+        self.state_ttl = state_ttl if state_ttl is not None else self.STATE_TTL
+
+    @staticmethod
+    def get_records(history: Any) -> list:
+        """
+        Список операций из ответа :meth:`SingleTracker.get_history`.
+
+        :param history: Ответ метода getOperationHistory
+        :return: Список элементов historyRecord в хронологическом порядке
+        """
+        return get_history_records(history)
+
+    @staticmethod
+    def get_operation_key(record: Any) -> str:
+        """
+        Идентификатор операции для сравнения с ранее полученными.
+
+        :param record: Элемент historyRecord
+        :return: Строка из даты, типа, атрибута и индекса места операции
+        """
+        return json.dumps([
+            get_in(record, 'OperationParameters', 'OperDate'),
+            get_in(record, 'OperationParameters', 'OperType', 'Id'),
+            get_in(record, 'OperationParameters', 'OperAttr', 'Id'),
+            get_in(record, 'AddressParameters', 'OperationAddress', 'Index'),
+        ], default=str)
+
+    def is_terminal_record(self, record: Any) -> bool:
+        """
+        Является ли операция завершающей для отправления.
+
+        :param record: Элемент historyRecord
+        :return: Относится ли тип операции к ``terminal_types``
+        """
+        oper_type = get_in(record, 'OperationParameters', 'OperType', 'Id')
+        return oper_type is not None and int(oper_type) in self.terminal_types
+
+    @staticmethod
+    def _state_key(barcode: str) -> str:
+        return f'history {barcode}'
+
+    def get_state(self, barcode: str) -> Optional[dict]:
+        """
+        Сохраненное состояние отправления.
+
+        :param barcode: Идентификатор отправления
+        :return: Словарь с ключами ``last`` (идентификатор последней операции)
+            и ``terminal`` (завершено ли отслеживание), либо None
+        """
+        hit, value = self.state.get(self._state_key(barcode))
+        return value if hit else None
+
+    def is_terminal(self, barcode: str) -> bool:
+        """
+        Завершено ли отслеживание отправления.
+
+        :param barcode: Идентификатор отправления
+        """
+        state = self.get_state(barcode)
+        return bool(state and state['terminal'])
+
+    def _fetch_new_operations(self, barcode: str) -> Tuple[list, Optional[dict]]:
+        state = self.get_state(barcode)
+        if state and state['terminal']:
+            return [], None
+
+        records = self.get_records(self.tracker.get_history(barcode))
+        if not records:
+            return [], None
+
+        keys = [self.get_operation_key(record) for record in records]
+        start = 0
+        if state is not None:
+            # Если последняя операция не найдена (например история изменилась),
+            # возвращается вся история
+            for index in range(len(keys) - 1, -1, -1):
+                if keys[index] == state['last']:
+                    start = index + 1
+                    break
+
+        new_records = records[start:]
+        if not new_records:
+            return [], None
+        return new_records, {'last': keys[-1], 'terminal': self.is_terminal_record(records[-1])}
+
+    def _save_state(self, barcode: str, state: Optional[dict]) -> None:
+        if state is not None:
+            self.state.set(self._state_key(barcode), state, self.state_ttl)
+
+    def get_new_operations(self, barcode: str) -> list:
+        """
+        Операции над отправлением, не полученные при предыдущих вызовах.
+
+        Для отправлений в завершающем состоянии запрос к API не выполняется.
+
+        :param barcode: Идентификатор отправления
+        :return: Список новых элементов historyRecord в хронологическом порядке
+        """
+        records, state = self._fetch_new_operations(barcode)
+        self._save_state(barcode, state)
+        return records
+
+    def poll(self, barcodes: Iterable[str]) -> Iterator[Tuple[str, list]]:
+        """
+        Опрос списка отправлений с получением только новых операций.
+
+        Состояние отправления сохраняется после того, как его операции обработаны
+        вызывающим кодом (при запросе следующего элемента итератора). Если обработка
+        прервана исключением, при следующем опросе операции будут получены повторно.
+
+        :param barcodes: Идентификаторы отправлений
+        :return: Итератор по парам (идентификатор, список новых элементов historyRecord)
+            только для отправлений, по которым появились новые операции
+        """
+        for barcode in dict.fromkeys(barcodes):
+            records, state = self._fetch_new_operations(barcode)
+            if records:
+                yield barcode, records
+            self._save_state(barcode, state)
+
+
+class _AsyncBaseClient(_BaseClient):
+    """Асинхронный API клиент сервиса отслеживания посылок.
+
+    Загрузка WSDL выполняется синхронно при создании клиента, вызовы методов
+    API выполняются через ``httpx.AsyncClient`` с пулом соединений.
+    Для работы требуется пакет ``httpx`` (``pip install fs-pochta-api[async]``).
+    """
+
+    CLIENT_CLASS = AsyncClient
+    INSTRUMENTED_TRANSPORT_CLASS = _AsyncInstrumentedTransport
+
+    def __init__(self, login: str, password: str, caching=True,
+                 transport: Optional[AsyncTransport] = None,
+                 wsdl_cache: Optional[str] = None,
+                 metrics: Optional[MetricsSink] = None):
+        """Инициализация асинхронного API клиента сервиса отслеживания посылок.
+
+        :param login: Логин от системы трекинга
+        :param password: Пароль от системы трекинга
+        :param caching: Флаг, позволяющий отключить кэширование в zeep
+        :param transport: Асинхронный транспорт zeep, например созданный через
+            :meth:`build_transport` с общим ``httpx.AsyncClient``. Переданный
+            транспорт не закрывается в :meth:`close`
+        :param wsdl_cache: Директория для хранения WSDL и XSD документов
+        :param metrics: Получатель метрик вызовов методов сервиса
+        """
+        if httpx is None:
+            raise ImportError(f'Для {type(self).__name__} требуется установить пакет httpx')
+
+        self._own_transport = transport is None
+        super().__init__(login, password, caching, transport, wsdl_cache, metrics)
+
+    @staticmethod
+    def build_transport(caching: bool = True,
+                        wsdl_cache: Optional[str] = None,
+                        session: Optional['httpx.AsyncClient'] = None) -> AsyncTransport:
+        """
+        Создание асинхронного транспорта zeep.
+
+        :param caching: Кэшировать WSDL документы в SQLite кэше zeep
+        :param wsdl_cache: Директория кэша WSDL документов (имеет приоритет над ``caching``)
+        :param session: ``httpx.AsyncClient`` для вызовов методов API. Заголовки
+            переданного клиента сохраняются, закрывает его вызывающая сторона
+        :return: Асинхронный транспорт zeep
+        """
+        if wsdl_cache is not None:
+            cache = WSDLCache(wsdl_cache)
+        elif caching:
+            cache = SqliteCache()
+        else:
+            cache = None
+        if session is None:
+            return AsyncTransport(cache=cache)
+
+        # AsyncTransport заменяет заголовки клиента на User-Agent zeep
+        headers = session.headers.copy()
+        transport = AsyncTransport(client=session, cache=cache)
+        session.headers = headers
+        return transport
+
+    async def _call(self, operation: str, convert: Optional[Callable[[Any], Any]] = None,
+                    **kwargs) -> Any:
+        """
+        Асинхронный вызов метода сервиса с учетом метрик.
+
+        :param operation: Имя SOAP операции
+        :param convert: Функция обработки ответа
+        :param kwargs: Аргументы операции
+        :return: Ответ метода, обработанный функцией ``convert``
+        """
+        if self.metrics is None:
+            response = await getattr(self._client.service, operation)(**kwargs)
+            return convert(response) if convert is not None else response
+
+        event = SoapEvent(operation)
+        token = _soap_event.set(event)
+        started = time.perf_counter()
+        try:
+            response = await getattr(self._client.service, operation)(**kwargs)
+            return convert(response) if convert is not None else response
+        except Exception as exc:
+            self._record_error(event, exc)
+            raise
+        finally:
+            event.total_time = time.perf_counter() - started
+            _soap_event.reset(token)
+            self.metrics.on_soap_call(event)
+
+    async def close(self) -> None:
+        """Закрытие соединений клиента, если транспорт был создан им самим."""
+        if self._own_transport:
+            transport = self._client.transport
+            transport.wsdl_client.close()
+            await transport.aclose()
+
+    async def __aenter__(self):
+        """Использование клиента в качестве асинхронного контекстного менеджера."""
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        """Закрытие соединений при выходе из контекстного менеджера."""
+        await self.close()
+
+
+class AsyncSingleTracker(_AsyncBaseClient, SingleTracker):
+    """
+    Асинхронный клиент для взаимодеействия с API единичной обработки запросов.
+
+    Методы те же, что и у :class:`SingleTracker`, но возвращают корутины.
+    """
+
+
+class AsyncBatchTracker(_AsyncBaseClient, BatchTracker):
+    """
+    Асинхронный клиент для взаимодеействия с API пакетной обработки запросов.
+
+    Методы те же, что и у :class:`BatchTracker`, но возвращают корутины,
+    а :meth:`track_many` является асинхронным генератором.
+    """
+
+    async def get_ticket(self, barcodes: List[str]) -> str:
+        """Получения билета на подготовку информации по списку идентификаторов отправлений.
+
+        См. :meth:`BatchTracker.get_ticket`.
+
+        :param barcodes: Идентификаторы регистрируемых почтовогых отправлений
+        :return: Номер созданного ticket
+        """
+        return await self._call(
+            'getTicket',
+            self._get_value,
+            request=self._build_ticket_request(barcodes),
+            login=self._login,
+            password=self._password,
+            language='RUS',
+        )
+
+    async def get_response_by_ticket(self, ticket: str) -> List[dict]:
+        """Метод используется для получения информации об отправлениях по ранее полученному билету.
+
+        См. :meth:`BatchTracker.get_response_by_ticket`.
+
+        :param ticket: Строка, содержащая номер ticket, полученного ранее при вызове getTicket
+        :return: Результаты пакетной обработки в виде списка словарей
+        """
+        return await self._call(
+            'getResponseByTicket',
+            self._get_items,
+            ticket=ticket,
+            login=self._login,
+            password=self._password,
+        )
+
+    async def track_many(self, barcodes: Iterable[str] = (),
+                         store: Optional[TicketStore] = None,
+                         workers: int = 4):
+        """
+        Пакетное отслеживание произвольного количества отправлений.
+
+        Асинхронный аналог :meth:`BatchTracker.track_many`. Билеты сохраняются
+        между запусками только при передаче постоянного хранилища ``store``.
+
+        :param barcodes: Идентификаторы отправлений
+        :param store: Хранилище билетов (по умолчанию :class:`MemoryTicketStore
+            <pochta.tickets.MemoryTicketStore>`, билеты не сохраняются между запусками)
+        :param workers: Максимальное количество одновременных запросов
+        :return: Асинхронный итератор по завершенным билетам в порядке их готовности:
+            пары (билет, результат :meth:`get_response_by_ticket`)
+        """
+        store = store if store is not None else MemoryTicketStore()
+        chunks = chunked(list(dict.fromkeys(barcodes)), self.MAX_BARCODES)
+        semaphore = asyncio.Semaphore(workers)
+
+        await self._issue_tickets_async(chunks, store, semaphore)
+
+        while True:
+            pending = store.pending()
+            if not pending:
+                return
+
+            now = time.time()
+            due = [ticket for ticket in pending if ticket.next_poll_at <= now]
+            if not due:
+                await asyncio.sleep(min(ticket.next_poll_at for ticket in pending) - now)
+                continue
+
+            tasks = [
+                asyncio.ensure_future(self._poll_ticket_async(ticket, semaphore))
+                for ticket in due
+            ]
+            try:
+                for task in asyncio.as_completed(tasks):
+                    ticket, result = await task
+                    if ticket.state == TicketState.PENDING:
+                        store.update(ticket)
+                        continue
+                    yield ticket, result
+                    store.update(ticket)
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+    async def _issue_tickets_async(self, chunks: List[List[str]], store: TicketStore,
+                                   semaphore: asyncio.Semaphore) -> None:
+        async def issue(chunk: List[str]) -> None:
+            async with semaphore:
+                ticket = await self.get_ticket(chunk)
+            self._add_ticket(store, ticket, chunk)
+
+        results = await asyncio.gather(
+            *(issue(chunk) for chunk in chunks), return_exceptions=True,
+        )
+        # Полученные билеты уже сохранены и будут обработаны при следующем вызове
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    async def _poll_ticket_async(self, ticket: TrackingTicket, semaphore: asyncio.Semaphore,
+                                 ) -> Tuple[TrackingTicket, Optional[List[dict]]]:
+        ticket.attempts += 1
+        try:
+            async with semaphore:
+                result = await self.get_response_by_ticket(ticket.ticket)
+        except Exception as exc:  # pylint: disable=broad-except
+            self._reschedule_ticket(ticket, exc)
+            return ticket, None
+
+        ticket.error = None
+        ticket.state = TicketState.DONE
+        return ticket, result
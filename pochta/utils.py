@@ -1,10 +1,11 @@
 from abc import ABC, abstractmethod
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from typing import List, Union
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, List, Optional, Union
 from uuid import uuid4
 
-from boltons.iterutils import remap
-
 
 class _AutoName(str, Enum):
     # pylint: disable=no-self-argument,unused-argument
@@ -13,6 +14,8 @@ class _AutoName(str, Enum):
 
 
 class _UniqId(ABC):
+    __slots__ = ('id',)
+
     def __init__(self):
         self.id = str(uuid4())
 
@@ -22,17 +25,165 @@ class _UniqId(ABC):
         pass
 
 
+def _clean_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _clean_value(item) for key, item in value.items() if item is not None}
+    if isinstance(value, list):
+        return [_clean_value(item) for item in value if item is not None]
+    if isinstance(value, tuple):
+        return tuple(_clean_value(item) for item in value if item is not None)
+    return value
+
+
 def clean_data(data: Union[List, dict]) -> Union[List, dict]:
     """Метод рекурсивно очищающий словарь или список словарь от ключей со значением None."""
     if isinstance(data, list):
-        data = [clean_data(each_data) for each_data in data]
-    elif isinstance(data, dict):
-        data = remap(data, lambda p, k, v: v is not None)
-    else:
-        data = data
+        return [clean_data(each_data) for each_data in data]
+    if isinstance(data, dict):
+        return _clean_value(data)
     return data
 
 
+def get_in(value: Any, *path: Union[str, int]) -> Any:
+    """
+    Получение вложенного значения из словаря или объекта zeep.
+
+    :param value: Словарь, список или объект zeep
+    :param path: Последовательность ключей
+    :return: Значение, либо None если какой-либо из ключей отсутствует
+    """
+    for key in path:
+        if value is None:
+            return None
+        try:
+            value = value[key]
+        except (KeyError, IndexError, TypeError, AttributeError):
+            return None
+    return value
+
+
+def get_history_records(history: Any) -> list:
+    """
+    Список операций из ответа метода getOperationHistory.
+
+    :param history: Ответ :meth:`SingleTracker.get_history <pochta.tracking.SingleTracker.get_history>`
+    :return: Список элементов historyRecord в хронологическом порядке
+    """
+    if history is None:
+        return []
+    if isinstance(history, list):
+        return history
+    return list(get_in(history, 'historyRecord') or [])
+
+
+def clean_params(params: Optional[dict]) -> Optional[dict]:
+    """
+    Метод подготавливающий параметры запроса для асинхронного клиента.
+
+    Отбрасывает параметры со значением None и заменяет перечисления их значениями,
+    повторяя поведение requests.
+    """
+    if not params:
+        return params
+    return {
+        key: value.value if isinstance(value, Enum) else value
+        for key, value in params.items()
+        if value is not None
+    }
+
+
+def is_async_client(client: Any) -> bool:
+    """Является ли API клиент асинхронным (методы API возвращают корутины)."""
+    return asyncio.iscoroutinefunction(client.request_json)
+
+
+def paginate(fetch_page: Callable[[int], List], page_size: int,
+             concurrency: int = 2,
+             convert: Optional[Callable[[Any], Any]] = None) -> Iterator:
+    """
+    Ленивый обход всех страниц постраничного метода API.
+
+    Одновременно запрашивается до ``concurrency`` страниц вперед, поэтому следующая
+    страница загружается, пока обрабатывается текущая. Обход завершается на первой
+    неполной странице, лишние запрошенные страницы отбрасываются.
+
+    :param fetch_page: Функция получения страницы по ее номеру (0..N)
+    :param page_size: Количество записей на странице
+    :param concurrency: Количество одновременно загружаемых страниц
+    :param convert: Функция преобразования записи (например ``Model.from_raw``)
+    :return: Итератор по записям всех страниц
+    """
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as executor:
+        pending = deque(executor.submit(fetch_page, page) for page in range(max(concurrency, 1)))
+        next_page = len(pending)
+        try:
+            while pending:
+                items = pending.popleft().result()
+                last = len(items) < page_size
+                if not last:
+                    pending.append(executor.submit(fetch_page, next_page))
+                    next_page += 1
+                yield from (map(convert, items) if convert is not None else items)
+                if last:
+                    return
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+async def paginate_async(fetch_page: Callable[[int], Awaitable[List]], page_size: int,
+                         concurrency: int = 2,
+                         convert: Optional[Callable[[Any], Any]] = None) -> AsyncIterator:
+    """
+    Асинхронный аналог :func:`paginate`.
+
+    :param fetch_page: Функция, возвращающая корутину получения страницы по ее номеру (0..N)
+    :param page_size: Количество записей на странице
+    :param concurrency: Количество одновременно загружаемых страниц
+    :param convert: Функция преобразования записи (например ``Model.from_raw``)
+    :return: Асинхронный итератор по записям всех страниц
+    """
+    pending = deque(
+        asyncio.ensure_future(fetch_page(page)) for page in range(max(concurrency, 1))
+    )
+    next_page = len(pending)
+    try:
+        while pending:
+            items = await pending.popleft()
+            last = len(items) < page_size
+            if not last:
+                pending.append(asyncio.ensure_future(fetch_page(next_page)))
+                next_page += 1
+            for item in items:
+                yield convert(item) if convert is not None else item
+            if last:
+                return
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class Endpoint(str):
+    """
+    Эндпоинт API с сохранением шаблона пути.
+
+    Ведет себя как обычная строка с подставленными параметрами, а шаблон
+    (например ``/1.0/batch/{batch_name}/shipment``) используется для группировки
+    запросов в метриках.
+    """
+
+    def __new__(cls, template: str, **params: Any) -> 'Endpoint':
+        """
+        Создание эндпоинта.
+
+        :param template: Шаблон пути в формате str.format
+        :param params: Параметры пути
+        """
+        endpoint = super().__new__(cls, template.format(**params))
+        endpoint.template = template
+        return endpoint
+
+
 class HTTPMethod(str, Enum):
     GET = 'get'
     POST = 'post'
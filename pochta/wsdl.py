@@ -0,0 +1,71 @@
+import hashlib
+import os
+import tempfile
+import time
+from typing import Optional
+
+from zeep.cache import Base
+
+
+class WSDLCache(Base):
+    """
+    Кэш WSDL и XSD документов сервиса отслеживания в директории на диске.
+
+    Каждый документ хранится в отдельном файле, имя которого вычисляется
+    из адреса документа. По умолчанию документы не устаревают, поэтому заполненную
+    директорию можно поставлять вместе с приложением (например в образе контейнера
+    или в тестовых данных): клиенты отслеживания будут создаваться без обращения к сети.
+    Директория может быть доступна только на чтение, ошибки записи игнорируются.
+    """
+
+    def __init__(self, directory: str, timeout: Optional[float] = None) -> None:
+        """
+        Инициализация кэша.
+
+        :param directory: Путь к директории кэша
+        :param timeout: Время жизни документа в секундах (по умолчанию не ограничено)
+        """
+        self.directory = directory
+        self.timeout = timeout
+
+    def get_path(self, url: str) -> str:
+        """
+        Путь к файлу документа.
+
+        :param url: Адрес документа
+        :return: Путь к файлу в директории кэша
+        """
+        name = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f'{name}.xml')
+
+    def add(self, url: str, content: bytes) -> None:
+        """
+        Сохранение документа.
+
+        :param url: Адрес документа
+        :param content: Содержимое документа
+        """
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(suffix='.part', dir=self.directory)
+            with os.fdopen(fd, 'wb') as file:
+                file.write(content)
+            os.replace(tmp_path, self.get_path(url))
+        except OSError:
+            pass
+
+    def get(self, url: str) -> Optional[bytes]:
+        """
+        Получение документа.
+
+        :param url: Адрес документа
+        :return: Содержимое документа, либо None если документ отсутствует или устарел
+        """
+        path = self.get_path(url)
+        try:
+            if self.timeout is not None and os.path.getmtime(path) + self.timeout < time.time():
+                return None
+            with open(path, 'rb') as file:
+                return file.read()
+        except OSError:
+            return None
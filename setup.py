@@ -14,10 +14,13 @@ MAINTAINER = 'fadedDexofan'
 REQUIRES_PYTHON = '>=3.6.0'
 VERSION = None
 
-REQUIRED = ['requests', 'boltons', 'zeep']
+REQUIRED = ['requests', 'boltons', 'zeep>=4']
 
 EXTRAS = {
     'dev': ['isort', 'flake8', 'pylint'],
+    'async': ['httpx'],
+    'orjson': ['orjson'],
+    'otel': ['opentelemetry-api'],
 }
 
 # ------------------------------------------------
@@ -87,7 +90,7 @@ setup(
     maintainer_email=EMAIL,
     python_requires=REQUIRES_PYTHON,
     url=URL,
-    packages=find_packages(exclude=['tests']),
+    packages=find_packages(exclude=['tests', 'benchmarks', 'benchmarks.*']),
     install_requires=REQUIRED,
     extras_require=EXTRAS,
     include_package_data=True,